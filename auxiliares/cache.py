@@ -0,0 +1,130 @@
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# O cache guarda o texto completo dos extratos, por isso fica desligado até que um diretório seja
+# configurado em EXTRATOR_CACHE_DIR. Tamanho máximo e dias de retenção também vêm do ambiente.
+CACHE_DIR = Path(os.environ["EXTRATOR_CACHE_DIR"]) if os.environ.get("EXTRATOR_CACHE_DIR") else None
+CACHE_LIMITE_BYTES = int(os.environ.get("EXTRATOR_CACHE_MB", "512")) * 1024 * 1024
+CACHE_RETENCAO_DIAS = float(os.environ.get("EXTRATOR_CACHE_DIAS", "7"))
+
+def hash_pdf(dados):
+    """Calcula o SHA-256 dos bytes do PDF, usado como endereço do conteúdo no cache."""
+    return hashlib.sha256(dados).hexdigest()
+
+def chave_cache(hash_dados, backend, versao):
+    """Monta a chave de uma entrada: hash do PDF + backend de extração + versão do backend."""
+    return f"{hash_dados}-{backend}-{versao}"
+
+def _caminho(chave):
+    return CACHE_DIR / f"{chave}.json"
+
+def _expirada(info):
+    return time.time() - info.st_mtime > CACHE_RETENCAO_DIAS * 86400
+
+def _ler_entrada(caminho):
+    """Lê o arquivo de uma entrada sem alterar a data de modificação usada pelo LRU."""
+    with open(caminho, encoding="utf-8") as arquivo:
+        entrada = json.load(arquivo)
+    return entrada["total"], {int(indice): texto for indice, texto in entrada["paginas"].items()}
+
+def ler_cache(chave):
+    """
+    Lê uma entrada do cache e retorna (total_paginas, {indice: texto}) ou None se não existir,
+    se tiver passado do prazo de retenção ou se o cache estiver desligado.
+    A leitura atualiza a data de modificação do arquivo, que serve de referência para o LRU.
+    Qualquer falha de leitura é tratada como ausência da entrada.
+    """
+    if CACHE_DIR is None:
+        return None
+    caminho = _caminho(chave)
+    try:
+        if _expirada(caminho.stat()):
+            caminho.unlink()
+            return None
+        entrada = _ler_entrada(caminho)
+        os.utime(caminho)
+        return entrada
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+def gravar_cache(chave, total, paginas):
+    """
+    Grava (ou complementa) uma entrada do cache com o texto das páginas já extraídas.
+    A escrita é feita em arquivo temporário seguido de os.replace, que é atômico,
+    para que vários processos possam compartilhar o mesmo diretório com segurança.
+    O diretório é criado acessível só ao usuário. Não faz nada com o cache desligado.
+    """
+    if CACHE_DIR is None:
+        return
+    try:
+        CACHE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+        try:
+            if not _expirada(_caminho(chave).stat()):
+                paginas = {**_ler_entrada(_caminho(chave))[1], **paginas}
+        except (OSError, ValueError, KeyError, TypeError):
+            pass  # Entrada nova (ou ilegível, e então substituída)
+        conteudo = {"total": total, "paginas": {str(indice): texto for indice, texto in paginas.items()}}
+        descritor, temporario = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        try:
+            with os.fdopen(descritor, "w", encoding="utf-8") as arquivo:
+                json.dump(conteudo, arquivo, ensure_ascii=False)
+            os.replace(temporario, _caminho(chave))
+        except BaseException:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+            raise
+        _aplicar_limite()
+    except OSError:
+        pass  # O cache é apenas uma otimização; falhas de escrita não interrompem o processamento
+
+def _aplicar_limite():
+    """
+    Remove as entradas que passaram do prazo de retenção e, depois, as usadas há mais tempo
+    até o cache voltar ao limite de tamanho.
+    """
+    entradas = []
+    total = 0
+    for caminho in CACHE_DIR.glob("*.json"):
+        try:
+            info = caminho.stat()
+            if _expirada(info):
+                caminho.unlink()
+                continue
+        except FileNotFoundError:
+            continue  # Removida por outro processo
+        entradas.append((info.st_mtime, info.st_size, caminho))
+        total += info.st_size
+
+    entradas.sort()
+    for _, tamanho, caminho in entradas:
+        if total <= CACHE_LIMITE_BYTES:
+            break
+        try:
+            caminho.unlink()
+        except FileNotFoundError:
+            pass
+        total -= tamanho
+
+def limpar_cache():
+    """Apaga todas as entradas do cache (e temporários deixados por escritas interrompidas). Retorna quantas apagou."""
+    if CACHE_DIR is None or not CACHE_DIR.is_dir():
+        return 0
+    apagadas = 0
+    for caminho in list(CACHE_DIR.glob("*.json")) + list(CACHE_DIR.glob("*.tmp")):
+        try:
+            caminho.unlink()
+            apagadas += 1
+        except FileNotFoundError:
+            pass
+    return apagadas
+
+if __name__ == "__main__":
+    # python -m auxiliares.cache limpar
+    if sys.argv[1:] != ["limpar"]:
+        sys.exit("Uso: python -m auxiliares.cache limpar")
+    print(f"{limpar_cache()} entradas removidas do cache")
@@ -0,0 +1,70 @@
+def agrupar_linhas(palavras, tolerancia=3.0):
+    """
+    Agrupa as palavras de uma página, tuplas (x0, y0, x1, y1, texto), em linhas visuais.
+    Palavras cujo topo difere até `tolerancia` pontos do topo da linha corrente ficam na mesma linha.
+    Retorna a lista de linhas de cima para baixo, cada uma com as palavras da esquerda para a direita.
+    """
+    linhas = []
+    topo_atual = None
+    for palavra in sorted(palavras, key=lambda p: (p[1], p[0])):
+        if topo_atual is None or palavra[1] - topo_atual > tolerancia:
+            linhas.append([])
+            topo_atual = palavra[1]
+        linhas[-1].append(palavra)
+    for linha in linhas:
+        linha.sort(key=lambda p: p[0])
+    return linhas
+
+def linhas_do_documento(palavras_por_pagina, tolerancia=3.0):
+    """Percorre as linhas visuais de todas as páginas, em ordem."""
+    for palavras in palavras_por_pagina:
+        yield from agrupar_linhas(palavras, tolerancia)
+
+def texto_da_linha(linha):
+    """Texto da linha visual, com as palavras separadas por espaço."""
+    return " ".join(palavra[4] for palavra in linha)
+
+def limites_pelo_cabecalho(linha, rotulos):
+    """
+    Deriva as colunas de uma tabela a partir da linha de cabeçalho.
+    `rotulos` é a lista, da esquerda para a direita, da primeira palavra do título de cada coluna
+    (ex.: ["data", "descrição", "entradas", "saídas", "saldo"]).
+    Cada coluna vai do meio do vão para a coluna anterior até o meio do vão para a próxima.
+    Retorna uma lista de (nome, x_inicio, x_fim) ou None se a linha não tiver todos os rótulos em ordem.
+    """
+    posicoes = []
+    proximo = 0
+    for indice, palavra in enumerate(linha):
+        if proximo < len(rotulos) and palavra[4].lower() == rotulos[proximo].lower():
+            posicoes.append(indice)
+            proximo += 1
+    if proximo < len(rotulos):
+        return None
+
+    # Extensão horizontal de cada título: do rótulo até a palavra anterior ao próximo rótulo (ex.: "entradas R$")
+    extensoes = []
+    for n, inicio in enumerate(posicoes):
+        fim = posicoes[n + 1] - 1 if n + 1 < len(posicoes) else len(linha) - 1
+        extensoes.append((linha[inicio][0], linha[fim][2]))
+
+    colunas = []
+    for n, nome in enumerate(rotulos):
+        x_inicio = float("-inf") if n == 0 else (extensoes[n - 1][1] + extensoes[n][0]) / 2
+        x_fim = float("inf") if n == len(rotulos) - 1 else (extensoes[n][1] + extensoes[n + 1][0]) / 2
+        colunas.append((nome, x_inicio, x_fim))
+    return colunas
+
+def ler_colunas(linha, colunas):
+    """
+    Distribui as palavras de uma linha visual entre as colunas declaradas, (nome, x_inicio, x_fim),
+    pelo centro horizontal de cada palavra, em uma única passada.
+    Retorna um dicionário {nome: texto}, com texto vazio nas colunas sem palavras.
+    """
+    campos = {nome: [] for nome, _, _ in colunas}
+    for palavra in linha:
+        centro = (palavra[0] + palavra[2]) / 2
+        for nome, x_inicio, x_fim in colunas:
+            if x_inicio <= centro < x_fim:
+                campos[nome].append(palavra[4])
+                break
+    return {nome: " ".join(textos) for nome, textos in campos.items()}
@@ -0,0 +1,51 @@
+import numpy as np
+from auxiliares.dinheiro import Dinheiro
+from auxiliares.lote import MOMENTOS_SALDO
+
+def conciliar(lote):
+    """
+    Confere as transações do lote com os saldos impressos no extrato (LoteTransacoes.registrar_saldo).
+    O saldo calculado em cada ponto é o saldo de referência (o anterior, ou o primeiro registrado) mais a soma
+    acumulada dos créditos menos os débitos desde ele. Retorna a lista de divergências, uma por saldo em que a
+    diferença entre o informado e o calculado muda (o dia em que uma transação foi perdida ou duplicada;
+    os saldos seguintes herdam a mesma diferença e não são repetidos), com Data, Informado, Calculado e Diferença
+    (Dinheiro com sinal). Lista vazia quando tudo confere ou quando o extrato não trouxe saldos.
+    """
+    if not len(lote.saldo_centavos):
+        return []
+
+    movimentos = np.abs(np.frombuffer(lote.centavos, dtype=np.int64))
+    movimentos = np.where(np.frombuffer(lote.tipos, dtype=np.uint8) == ord("D"), -movimentos, movimentos)
+    # acumulado[n] = soma dos n primeiros movimentos
+    acumulado = np.zeros(len(lote) + 1, dtype=np.int64)
+    np.cumsum(movimentos, out=acumulado[1:])
+
+    informados = np.frombuffer(lote.saldo_centavos, dtype=np.int64)
+    posicoes = np.frombuffer(lote.saldo_posicoes, dtype=np.int32)
+    anteriores = np.flatnonzero(np.frombuffer(lote.saldo_momentos, dtype=np.uint8) == MOMENTOS_SALDO["anterior"])
+    referencia = anteriores[0] if len(anteriores) else 0
+
+    calculados = informados[referencia] + acumulado[posicoes] - acumulado[posicoes[referencia]]
+    diferencas = informados - calculados
+    novas = np.flatnonzero(diferencas != np.concatenate(([0], diferencas[:-1])))
+
+    return [
+        {
+            "Data": lote.data_do_saldo(indice),
+            "Informado": Dinheiro(int(informados[indice])),
+            "Calculado": Dinheiro(int(calculados[indice])),
+            "Diferença": Dinheiro(int(diferencas[indice])),
+        }
+        for indice in novas
+    ]
+
+def _com_sinal(valor):
+    return f"-{valor}" if valor.negativo else str(valor)
+
+def resumir(divergencias):
+    """Texto curto das divergências da conciliação, para exibir junto do arquivo processado."""
+    return "Saldos não conferem: " + "; ".join(
+        f"{divergencia['Data'] or 'sem data'} (extrato {_com_sinal(divergencia['Informado'])}, "
+        f"calculado {_com_sinal(divergencia['Calculado'])})"
+        for divergencia in divergencias
+    )
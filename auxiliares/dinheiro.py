@@ -0,0 +1,100 @@
+import re
+from functools import total_ordering
+
+# Valor no formato brasileiro: sinal opcional (antes ou depois), R$ opcional, milhar com ponto opcional
+_VALOR = re.compile(r"^([+-])?\s*(?:R\$\s*)?([+-])?\s*(\d{1,3}(?:\.\d{3})+|\d+),(\d{1,2})\s*(-)?$")
+
+# Como cada banco escreve o valor na saída (sempre sem sinal; o tipo C/D indica a direção):
+#   padrao          - centavos ",00" omitidos; milhar com ponto se o extrato usa ponto (ex.: 1.012,29 e 1.000)
+#   sem_zero_final  - como padrao, e o zero final dos centavos também é omitido (ex.: 123,30 -> 123,3)
+#   inteiro_sem_milhar - como padrao, mas valores inteiros saem sem ponto de milhar (ex.: 1.000,00 -> 1000)
+#   sem_milhar      - como padrao, mas nunca com ponto de milhar (ex.: 5.616,10 -> 5616,10)
+#   milhar_com_centavos - como padrao, mas valores com centavos saem sempre com ponto de milhar, mesmo que
+#                     o extrato não o use (ex.: 1250,50 -> 1.250,50; 1250,00 -> 1250)
+ESTILOS = ("padrao", "sem_zero_final", "inteiro_sem_milhar", "sem_milhar", "milhar_com_centavos")
+
+@total_ordering
+class Dinheiro:
+    """
+    Valor monetário em centavos inteiros com sinal, lido uma única vez na extração.
+    Comparações, somas e hash usam apenas os centavos; o texto só é gerado na saída (str),
+    no estilo do banco e com o agrupamento de milhar do extrato de origem.
+    """
+
+    __slots__ = ("centavos", "estilo", "milhar")
+
+    def __init__(self, centavos, estilo="padrao", milhar=True):
+        if estilo not in ESTILOS:
+            raise ValueError(f"Estilo de valor desconhecido: {estilo}")
+        self.centavos = centavos
+        self.estilo = estilo
+        self.milhar = milhar
+
+    @classmethod
+    def ler(cls, texto, estilo="padrao", centavos_um_digito=False):
+        """
+        Lê um valor no formato brasileiro (ex.: "1.012,29", "-R$ 50,00", "R$ -1,90", "1.000,00-").
+        O sinal de menos, antes ou depois do número, torna o valor negativo. Com `centavos_um_digito`,
+        aceita um único dígito de centavos, que vale dezenas (ex.: "1.250,5" é 1.250,50).
+        """
+        match = _VALOR.match(texto.strip())
+        if not match or (len(match.group(4)) == 1 and not centavos_um_digito):
+            raise ValueError(f"Valor monetário inválido: {texto!r}")
+        sinal_antes, sinal_depois_rs, inteiro, centavos, sinal_final = match.groups()
+        total = int(inteiro.replace(".", "")) * 100 + int(centavos.ljust(2, "0"))
+        if "-" in (sinal_antes, sinal_depois_rs, sinal_final):
+            total = -total
+        return cls(total, estilo, "." in inteiro)
+
+    @property
+    def negativo(self):
+        return self.centavos < 0
+
+    def formatar(self):
+        """Texto do valor absoluto no estilo do banco (ex.: 1.012,29, 1.000, 123,3)."""
+        inteiro, centavos = divmod(abs(self.centavos), 100)
+        milhar = self.milhar or (self.estilo == "milhar_com_centavos" and centavos)
+        if self.estilo == "sem_milhar" or not milhar or (self.estilo == "inteiro_sem_milhar" and not centavos):
+            texto = str(inteiro)
+        else:
+            texto = f"{inteiro:,}".replace(",", ".")
+        if not centavos:
+            return texto
+        if self.estilo == "sem_zero_final" and centavos % 10 == 0:
+            return f"{texto},{centavos // 10}"
+        return f"{texto},{centavos:02d}"
+
+    def __str__(self):
+        return self.formatar()
+
+    def __repr__(self):
+        return f"Dinheiro({'-' if self.negativo else ''}{self.formatar()})"
+
+    def __eq__(self, other):
+        if not isinstance(other, Dinheiro):
+            return NotImplemented
+        return self.centavos == other.centavos
+
+    def __lt__(self, other):
+        if not isinstance(other, Dinheiro):
+            return NotImplemented
+        return self.centavos < other.centavos
+
+    def __hash__(self):
+        return hash(self.centavos)
+
+    def __neg__(self):
+        return Dinheiro(-self.centavos, self.estilo, self.milhar)
+
+    def __abs__(self):
+        return Dinheiro(abs(self.centavos), self.estilo, self.milhar)
+
+    def __add__(self, other):
+        if not isinstance(other, Dinheiro):
+            return NotImplemented
+        return Dinheiro(self.centavos + other.centavos, self.estilo, self.milhar)
+
+    def __sub__(self, other):
+        if not isinstance(other, Dinheiro):
+            return NotImplemented
+        return Dinheiro(self.centavos - other.centavos, self.estilo, self.milhar)
@@ -0,0 +1,329 @@
+import hashlib
+import io
+import json
+import mmap
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+import fitz  # PyMuPDF
+import pdfplumber
+from auxiliares.cache import hash_pdf, chave_cache, ler_cache, gravar_cache
+from auxiliares.identificador import identificar_banco
+from auxiliares.impressao_digital import impressao_digital, INDICE_LAYOUTS
+from auxiliares.moldura import remover_moldura
+from auxiliares.pdf_reader import validate_pdf
+from auxiliares.preflight import verificar_assinatura, verificar_documento
+from auxiliares.texto import TextoPaginado
+from banco import get_extracao
+
+# Extrações com pelo menos esta quantidade de páginas pendentes são divididas entre processos
+PAGINAS_MINIMAS_PARALELO = int(os.environ.get("EXTRATOR_PAGINAS_PARALELO", "32"))
+PROCESSOS_EXTRACAO = int(os.environ.get("EXTRATOR_PROCESSOS", "0")) or os.cpu_count() or 1
+
+def banco_identificado(banco):
+    """Indica se o retorno de identificar_banco corresponde a um banco suportado."""
+    return not (banco.startswith("Erro") or banco == "Banco não identificado")
+
+class PaginasPDF:
+    """
+    Leitura preguiçosa das páginas de um PDF: o texto de cada página só é extraído quando
+    pedido e fica guardado, de modo que a identificação e o parser nunca extraem a mesma página duas vezes.
+    """
+
+    def __init__(self, extrair_pagina, total, paginas=None, extrair_lote=None):
+        self._extrair_pagina = extrair_pagina
+        self._extrair_lote = extrair_lote
+        self._total = total
+        self._paginas = dict(paginas or {})
+        self.novas = False
+
+    def __len__(self):
+        return self._total
+
+    def __getitem__(self, indice):
+        if indice not in self._paginas:
+            self._paginas[indice] = self._extrair_pagina(indice) or ""
+            self.novas = True
+        return self._paginas[indice]
+
+    def __iter__(self):
+        for indice in range(self._total):
+            yield self[indice]
+
+    def texto(self, ate=None):
+        """Retorna as primeiras `ate` páginas (ou todas) como TextoPaginado, que se comporta como o texto contínuo usado pelos parsers."""
+        total = self._total if ate is None else min(ate, self._total)
+        faltantes = [indice for indice in range(total) if indice not in self._paginas]
+        if self._extrair_lote and len(faltantes) >= PAGINAS_MINIMAS_PARALELO:
+            self._paginas.update(self._extrair_lote(faltantes))
+            self.novas = True
+        return TextoPaginado(self[indice] for indice in range(total))
+
+    def extraidas(self):
+        """Retorna um dicionário {indice: texto} com as páginas já extraídas."""
+        return dict(self._paginas)
+
+def _e_caminho(origem):
+    """Indica se a origem do PDF é um caminho em disco (e não bytes ou um buffer em memória)."""
+    return isinstance(origem, (str, os.PathLike))
+
+def _stream_pdfplumber(origem):
+    """O pdfplumber lê caminhos e mmaps diretamente; bytes são apenas envolvidos em BytesIO, sem cópia."""
+    if _e_caminho(origem) or isinstance(origem, mmap.mmap):
+        return origem
+    return io.BytesIO(origem)
+
+# Como abrir o documento, contar páginas e extrair texto, palavras e blocos em cada backend.
+# A origem pode ser um caminho (lido direto do disco pelo backend) ou um buffer com os bytes do PDF.
+# Palavras e blocos são normalizados para tuplas (x0, y0, x1, y1, texto).
+BACKENDS = {
+    "fitz": {
+        "versao": getattr(fitz, "__version__", None) or getattr(fitz, "VersionBind", ""),
+        "abrir": lambda origem: fitz.open(origem) if _e_caminho(origem) else fitz.open(stream=origem, filetype="pdf"),
+        "total": lambda pdf: pdf.page_count,
+        "pagina": lambda pdf, indice, opcoes: pdf[indice].get_text("text", **opcoes),
+        "palavras": lambda pdf, indice: [tuple(palavra[:5]) for palavra in pdf[indice].get_text("words")],
+        "blocos": lambda pdf, indice: [tuple(bloco[:5]) for bloco in pdf[indice].get_text("blocks")],
+    },
+    "pdfplumber": {
+        "versao": getattr(pdfplumber, "__version__", ""),
+        "abrir": lambda origem: pdfplumber.open(_stream_pdfplumber(origem)),
+        "total": lambda pdf: len(pdf.pages),
+        "pagina": lambda pdf, indice, opcoes: pdf.pages[indice].extract_text(**opcoes),
+        "palavras": lambda pdf, indice: [
+            (palavra["x0"], palavra["top"], palavra["x1"], palavra["bottom"], palavra["text"])
+            for palavra in pdf.pages[indice].extract_words()
+        ],
+        "blocos": None,  # O pdfplumber não agrupa o texto em blocos
+    },
+}
+
+# Extração usada para identificar o banco, antes de se saber qual parser vai consumir o texto
+EXTRACAO_IDENTIFICACAO = {"backend": "fitz", "opcoes": {}}
+
+def _extrair_paginas(backend, opcoes, origem, indices):
+    """Executada em um processo do pool: abre o documento e extrai as páginas indicadas."""
+    config = BACKENDS[backend]
+    with config["abrir"](origem) as pdf:
+        return {indice: config["pagina"](pdf, indice, opcoes) or "" for indice in indices}
+
+def _extrair_paginas_paralelo(backend, opcoes, origem, indices):
+    """
+    Divide as páginas entre processos e junta o resultado por índice, de modo que o texto final
+    é idêntico ao da extração sequencial. Se o pool não puder ser usado, extrai sequencialmente.
+    """
+    processos = min(PROCESSOS_EXTRACAO, len(indices))
+    if processos <= 1:
+        return _extrair_paginas(backend, opcoes, origem, indices)
+
+    # Blocos contíguos de páginas por processo
+    tamanho = -(-len(indices) // processos)
+    blocos = [indices[i:i + tamanho] for i in range(0, len(indices), tamanho)]
+    quantidade = len(blocos)
+    paginas = {}
+    try:
+        with ProcessPoolExecutor(max_workers=processos) as executor:
+            for resultado in executor.map(_extrair_paginas, [backend] * quantidade, [opcoes] * quantidade,
+                                          [origem] * quantidade, blocos):
+                paginas.update(resultado)
+    except (OSError, RuntimeError):
+        return _extrair_paginas(backend, opcoes, origem, indices)
+    return paginas
+
+def _variante(backend, opcoes):
+    """Nome que identifica backend + opções de extração (usado no cache e para reaproveitar páginas)."""
+    if not opcoes:
+        return backend
+    return f"{backend}-{hashlib.sha1(json.dumps(opcoes, sort_keys=True).encode()).hexdigest()[:8]}"
+
+class _FontePDF:
+    """
+    Origem de um PDF (caminho em disco, mmap ou bytes de um upload) e os documentos abertos sobre ela.
+    Cada backend abre o documento no máximo uma vez e as páginas de uma mesma variante de extração
+    são compartilhadas entre a identificação e o parser.
+    Caminhos são mapeados em memória apenas para o cálculo do hash; fitz e pdfplumber leem o arquivo
+    diretamente, de modo que o PDF nunca é copiado inteiro para a memória do Python.
+    """
+
+    def __init__(self, origem, pilha):
+        self.origem = origem
+        if _e_caminho(origem):
+            if os.path.getsize(origem) == 0:
+                raise ValueError("O arquivo PDF está vazio")
+            with open(origem, "rb") as arquivo:
+                mapa = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+            self.hash = hash_pdf(mapa)
+            mapa.close()
+            self._origem_processos = os.fspath(origem)
+        else:
+            self.hash = hash_pdf(origem)
+            # Buffers só são gravados em disco se a extração chegar ao pool de processos
+            self._origem_processos = None
+        self._pilha = pilha
+        self._documentos = {}
+        self._paginas = {}
+
+    def cabecalho(self):
+        """Primeiro 1 KB do arquivo, usado na verificação da assinatura %PDF."""
+        if _e_caminho(self.origem):
+            with open(self.origem, "rb") as arquivo:
+                return arquivo.read(1024)
+        return bytes(memoryview(self.origem)[:1024])
+
+    def documento(self, backend):
+        if backend not in self._documentos:
+            self._documentos[backend] = self._pilha.enter_context(BACKENDS[backend]["abrir"](self.origem))
+        return self._documentos[backend]
+
+    def paginas(self, backend, opcoes):
+        """
+        Retorna as páginas preguiçosas de uma variante de extração, partindo do texto já guardado no cache.
+        O documento só é aberto se alguma página ainda não estiver no cache.
+        """
+        variante = _variante(backend, opcoes)
+        if variante not in self._paginas:
+            config = BACKENDS[backend]
+            chave = chave_cache(self.hash, variante, config["versao"])
+            em_cache = ler_cache(chave)
+            if em_cache:
+                total, paginas = em_cache
+            else:
+                total, paginas = config["total"](self.documento(backend)), {}
+
+            paginas_pdf = PaginasPDF(
+                lambda indice: config["pagina"](self.documento(backend), indice, opcoes), total, paginas,
+                extrair_lote=lambda indices: _extrair_paginas_paralelo(backend, opcoes, self._caminho_processos(), indices)
+            )
+            paginas_pdf.chave = chave
+            paginas_pdf.em_cache = bool(em_cache)
+            self._paginas[variante] = paginas_pdf
+        return self._paginas[variante]
+
+    def _caminho_processos(self):
+        """
+        Caminho que os processos do pool abrem. Um PDF em memória é gravado uma única vez em um arquivo
+        temporário (acessível só ao usuário e apagado ao fim da extração), de modo que cada processo
+        recebe só o caminho, e não uma cópia serializada do documento inteiro.
+        """
+        if self._origem_processos is None:
+            descritor, caminho = tempfile.mkstemp(suffix=".pdf")
+            self._pilha.callback(os.remove, caminho)
+            with os.fdopen(descritor, "wb") as arquivo:
+                arquivo.write(self.origem)
+            self._origem_processos = caminho
+        return self._origem_processos
+
+    def extras(self, backend, tipo):
+        """Extrai palavras ou blocos com coordenadas de todas as páginas (apenas quando o parser declara que precisa)."""
+        extrair = BACKENDS[backend][tipo]
+        if extrair is None:
+            raise ValueError(f"O backend {backend} não oferece extração de {tipo}")
+        documento = self.documento(backend)
+        return [extrair(documento, indice) for indice in range(BACKENDS[backend]["total"](documento))]
+
+    def salvar_cache(self):
+        """Grava no cache as páginas extraídas nesta execução."""
+        for paginas in self._paginas.values():
+            if paginas.novas:
+                gravar_cache(paginas.chave, len(paginas), paginas.extraidas())
+
+def identificar_banco_primeira_pagina(paginas):
+    """
+    Identifica o banco só pela primeira página, onde ficam cabeçalho e rodapé com as assinaturas,
+    sem extrair o resto do documento.
+    """
+    return identificar_banco(paginas.texto(1))
+
+def _origem_pdf(file):
+    """
+    Normaliza a entrada de extrair_pdf sem copiar o PDF: caminhos seguem como caminhos,
+    buffers (bytes, mmap, memoryview) seguem como estão e uploads entregam o buffer que já mantêm.
+    """
+    if _e_caminho(file) or isinstance(file, (bytes, bytearray, memoryview, mmap.mmap)):
+        return file
+    if hasattr(file, "getvalue"):
+        return file.getvalue()  # BytesIO (ex.: upload do Streamlit) devolve o próprio buffer, sem cópia
+    file.seek(0)
+    return file.read()
+
+def extrair_pdf(file, usar_impressao=True):
+    """
+    Lê o PDF uma única vez, identifica o banco a partir do texto do PyMuPDF e só executa
+    a extração que o parser do banco identificado declara em EXTRACAO.
+    Aceita um upload, um caminho em disco ou um buffer mapeado em memória (mmap/bytes);
+    caminhos são lidos diretamente pelo fitz e pelo pdfplumber, sem cópia do arquivo em memória.
+    As páginas são extraídas sob demanda: a identificação lê apenas a primeira (pelo PyMuPDF e, se preciso,
+    pelo pdfplumber). Sem assinatura nela, um layout já conhecido (pela impressão digital do documento)
+    decide o banco, marcando texto.pela_impressao; senão o documento é lido uma única vez por completo
+    pelo pdfplumber. Com usar_impressao=False a impressão digital não é consultada.
+    Com o cache em disco ativado (EXTRATOR_CACHE_DIR), um PDF repetido não é extraído de novo.
+    Documentos grandes têm as páginas restantes extraídas em paralelo por um pool de processos.
+    Antes de qualquer extração, arquivos que não são PDF, protegidos por senha, sem páginas ou
+    sem camada de texto são rejeitados com o motivo.
+    Retorna uma tupla com (texto, nome_banco) ou levanta exceção em caso de erro.
+    """
+    # Buffers não têm nome: a extensão só é conferida em uploads e caminhos
+    if not isinstance(file, (bytes, bytearray, memoryview, mmap.mmap)) and not validate_pdf(file):
+        raise ValueError("Arquivo não é um PDF válido")
+    origem = _origem_pdf(file)
+
+    with ExitStack() as pilha:
+        fonte = _FontePDF(origem, pilha)
+        verificar_assinatura(fonte.cabecalho())
+        paginas_identificacao = fonte.paginas(EXTRACAO_IDENTIFICACAO["backend"], EXTRACAO_IDENTIFICACAO["opcoes"])
+
+        # Pré-verificação barata: arquivos já presentes no cache passaram por ela quando foram extraídos
+        impressao = None
+        if not paginas_identificacao.em_cache:
+            verificar_documento(fonte.documento("fitz"))
+            impressao = impressao_digital(fonte.documento("fitz"))
+
+        banco = identificar_banco_primeira_pagina(paginas_identificacao)
+
+        # Algumas assinaturas dependem da ordem de linhas do pdfplumber (ex.: Stone e Banco Inter)
+        if not banco_identificado(banco):
+            paginas_pdfplumber = fonte.paginas("pdfplumber", {})
+            banco = identificar_banco_primeira_pagina(paginas_pdfplumber)
+
+        # As regras de texto têm a palavra final: uma impressão digital que aponte outro banco deixa de valer.
+        # Ela só decide quando a primeira página não tem assinatura, poupando a leitura completa abaixo.
+        pela_impressao = False
+        conhecido = INDICE_LAYOUTS.consultar(impressao) if usar_impressao else None
+        if banco_identificado(banco):
+            if conhecido and conhecido != banco:
+                INDICE_LAYOUTS.descartar(impressao)
+        elif conhecido:
+            banco, pela_impressao = conhecido, True
+
+        # Sem assinatura na primeira página: uma única extração completa pelo pdfplumber, como na leitura
+        # original; o mesmo texto é devolvido se o banco continuar sem identificação
+        if not banco_identificado(banco):
+            texto_pdfplumber = paginas_pdfplumber.texto()
+            banco = identificar_banco(texto_pdfplumber)
+
+        if banco_identificado(banco):
+            extracao = get_extracao(banco)
+            texto = fonte.paginas(extracao["backend"], extracao["opcoes"]).texto()
+            if extracao["moldura"]:
+                opcoes_moldura = extracao["moldura"] if isinstance(extracao["moldura"], dict) else {}
+                texto = remover_moldura(texto, **opcoes_moldura)
+            texto.impressao = impressao
+            texto.pela_impressao = pela_impressao
+            if extracao["palavras"]:
+                texto.palavras = fonte.extras(extracao["backend"], "palavras")
+            if extracao["blocos"]:
+                texto.blocos = fonte.extras(extracao["backend"], "blocos")
+        else:
+            texto = texto_pdfplumber
+            if not texto.strip() and not paginas_identificacao.texto(1).strip():
+                raise ValueError("Nenhum texto extraído do PDF")
+            fonte.salvar_cache()
+            return texto, banco
+
+    fonte.salvar_cache()
+
+    if not texto.strip():
+        raise ValueError("Nenhum texto extraído do PDF")
+
+    return texto, banco
@@ -1,110 +1,120 @@
 import re
 
-def identificar_banco(text):
-    """
-    Identifica o banco a partir do texto extraído do PDF.
-    Retorna o nome do banco ou 'Banco não identificado'.
-    """
-    if not text:
-        return "Erro: Texto vazio ou ilegível"
+# Regras de identificação em ordem de prioridade (a primeira que casar define o banco).
+# Cada regra é (banco, todos, algum, condicao):
+#   todos    - trechos que precisam estar todos no texto
+#   algum    - trechos dos quais pelo menos um precisa estar no texto (vazio = sem exigência)
+#   condicao - função opcional sobre o contexto (primeiras linhas, primeira palavra, trechos encontrados)
+# O banco pode ser uma função do contexto, para bancos com variações de layout.
 
-    linhas = text.splitlines()
-    if not linhas:
-        return "Erro: Texto vazio ou ilegível"
-    palavras = text.split()
-    
-    # Nubank
-    if 'ouvidoria@nubank.com.br' in text:
-        return "Nubank"
-    
-    # Efi
-    if 'Efí S.A.' in text and 'Filtros aplicados' in text:
-        return "Efi1"
+def _banco_do_brasil(contexto):
+    return "Banco do Brasil2" if contexto["primeira_palavra"].lower() == 'extrato' else "Banco do Brasil1"
+
+def _itau(contexto):
+    first_line = contexto["linhas"][0].strip().lower()
+    if re.match(r"^\s*extrato\s+mensal", first_line):
+        return "Itaú3"
+    if 'dados gerais' in first_line and re.search(r"^\s*\d{2}/\d{2}/\d{4}\s*$", contexto["texto"], re.MULTILINE):
+        return "Itaú2"
+    return "Itaú"
 
-    if 'Efí S.A.' in text and 'Filtros do' in text:
-        return "Efi2"
-    
-    # Santander
-    if 'Agência: 3472' in text or 'Agência: 3222' in text:
-        return "Santander1"
+def _linha(contexto, indice):
+    linhas = contexto["linhas"]
+    return linhas[indice] if len(linhas) > indice else None
 
-    if 'EXTRATOCONSOLIDADOINTELIGENTE' in text:
-        return "Santander2"
-    
-    # Caixa
-    if 'Sujeito a alteração até o final do expediente bancário' in text or 'Os lançamentos de extrato não estão disponíveis' in text or 'SAC CAIXA' in text:
-        return "Caixa"
-    
+ASSINATURAS = [
+    ("Nubank", [], ['ouvidoria@nubank.com.br'], None),
+    ("Efi1", ['Efí S.A.', 'Filtros aplicados'], [], None),
+    ("Efi2", ['Efí S.A.', 'Filtros do'], [], None),
+    ("Santander1", [], ['Agência: 3472', 'Agência: 3222'], None),
+    ("Santander2", [], ['EXTRATOCONSOLIDADOINTELIGENTE', 'EXTRATO CONSOLIDADO INTELIGENTE'], None),
+    ("Caixa", [], ['Sujeito a alteração até o final do expediente bancário',
+                   'Os lançamentos de extrato não estão disponíveis', 'SAC CAIXA'], None),
+    ("Stone", [], [], lambda c: _linha(c, 2) is not None and 'Instituição Stone Instituição' in _linha(c, 2).strip()),
+    ("Bradesco", [], ['00632'], None),
+    (_banco_do_brasil, [], ['473-1'], None),
+    ("Sicredi", ['0179', 'Sicredi Fone'], [], None),
+    ("PagBank", [], ['PagSeguro Internet S/A'], None),
+    ("Sicoob3", [], ['SICOOB - Sistema de Cooperativas de Crédito do Brasil',
+                     'SICOOB -Sistema de Cooperativas de Crédito do Brasil'], None),
+    ("Sicoob1", [], [], lambda c: c["primeira_palavra"].lower().startswith('sicoob') or ' SICOOB CREDIMEPI' in c["encontrados"]),
+    ("Sicoob2", ["SISTEMA DE COOPERATIVAS DE CRÉDITO DO BRASIL"], [],
+     lambda c: "Sicoob | Internet Banking" in c["linhas"][0].strip()),
+    ("Banco Inter", [], [], lambda c: _linha(c, 2) is not None and 'Banco Inter' in _linha(c, 2)),
+    (_itau, [], ['8119', '1472', '3116'], None),
+    ("iFood", [], ['Extrato da Conta Digital iFood'], None),
+    ("Asaas", [], ['ASAAS Gestão Financeira Instituição de Pagamento S.A.'], None),
+    ("Cora", [], ['Cora SCFI'], None),
+    ("Safra", [], ['Banco Safra S/A'], None),
+    ("InfinitePay", [], ['ajuda@infinitepay.io'], None),
+    ("Mercado Pago", [], ['www.mercadopago.com.br', 'Mercado Pago'], None),
+]
 
-    # Stone
-    if len(linhas) >= 3 and 'Instituição Stone Instituição' in linhas[2].strip():
-        return "Stone"
+# Trechos usados em condições (não listados em todos/algum) também entram no regex combinado
+_TRECHOS_CONDICOES = [' SICOOB CREDIMEPI']
+
+def _compilar_trechos():
+    """
+    Junta todos os trechos das assinaturas em um único regex combinado (alternância dentro de um lookahead).
+    O re do Python não é um autômato de passada única: em cada posição do texto as alternativas são tentadas
+    uma a uma. O ganho está em percorrer o texto em uma só chamada, em C, em vez de uma busca por trecho.
+    O lookahead não consome texto, então trechos sobrepostos também são encontrados.
+    """
+    trechos = set(_TRECHOS_CONDICOES)
+    for _, todos, algum, _ in ASSINATURAS:
+        trechos.update(todos)
+        trechos.update(algum)
+    alternativas = "|".join(re.escape(trecho) for trecho in sorted(trechos, key=len, reverse=True))
+    return re.compile(f"(?=({alternativas}))")
 
-    # Bradesco
-    if '00632' in text:
-        return "Bradesco"
-    
-    # Banco do Brasil (variações)
-    if '473-1' in text:
-        return "Banco do Brasil2" if text.strip().split()[0].lower() == 'extrato' else "Banco do Brasil1"
-    
-    # Sicredi
-    if '0179' in text and 'Sicredi Fone' in text:
-        return "Sicredi"
-    
-    # PagBank
+_PADRAO_TRECHOS = _compilar_trechos()
 
-    if 'PagSeguro Internet S/A' in text:
-        return "PagBank"
-    
-    # Sicoob (variações)
-    
-    if 'SICOOB - Sistema de Cooperativas de Crédito do Brasil' in text or 'SICOOB -Sistema de Cooperativas de Crédito do Brasil' in text:
-        return "Sicoob3"
-    if palavras and palavras[0].lower().startswith('sicoob') or ' SICOOB CREDIMEPI' in text:
-        return "Sicoob1"
-    if (linhas and "Sicoob | Internet Banking" in linhas[0].strip() and 
-        "SISTEMA DE COOPERATIVAS DE CRÉDITO DO BRASIL" in text):
-        return "Sicoob2"
+def _primeiras_linhas(text, quantidade):
+    """Retorna as primeiras linhas do texto (como em splitlines) sem dividir o documento inteiro."""
+    tamanho = 4096
+    while True:
+        linhas = text[:tamanho].splitlines()
+        if len(linhas) > quantidade or tamanho >= len(text):
+            return linhas[:quantidade]
+        tamanho *= 2
 
-    
-    # Banco Inter 
-    if len(linhas) >= 3 and 'Banco Inter' in linhas[2]:
-        return "Banco Inter"
-    
-    # Itaú (variações)
-    if '8119' in text or '1472' in text or '3116' in text:
-        first_line = linhas[0].strip().lower()
-        if re.match(r"^\s*extrato\s+mensal", first_line):
-            return "Itaú3"
-        if 'dados gerais' in first_line:
-            for linha in linhas:
-                if re.match(r"^\d{2}/\d{2}/\d{4}$", linha.strip()):
-                    return "Itaú2"
-        return "Itaú"
-    
-    # iFood
-    if 'Extrato da Conta Digital iFood' in text:
-        return "iFood"
-    
-    # Asaas
-    if 'ASAAS Gestão Financeira Instituição de Pagamento S.A.' in text:
-        return "Asaas"
-    
-    # Cora
-    if 'Cora SCFI' in text:
-        return "Cora"
-    
-    # Safra
-    if 'Banco Safra S/A' in text:
-        return "Safra"
-    
-    # InfinitePay
-    if 'ajuda@infinitepay.io' in text:
-        return "InfinitePay"
+def identificar_bancos(text):
+    """
+    Avalia todas as assinaturas a partir de uma única busca do regex combinado sobre o texto.
+    Retorna a lista de (prioridade, banco) de todas as regras que casaram, em ordem de prioridade
+    (0 é a mais prioritária). A lista é vazia se nenhuma regra casar.
+    """
+    text = str(text)
+    encontrados = {match.group(1) for match in _PADRAO_TRECHOS.finditer(text)}
+    palavras = text.split(maxsplit=1)
+    contexto = {
+        "texto": text,
+        "linhas": _primeiras_linhas(text, 3),
+        "primeira_palavra": palavras[0] if palavras else "",
+        "encontrados": encontrados,
+    }
+
+    resultados = []
+    for prioridade, (banco, todos, algum, condicao) in enumerate(ASSINATURAS):
+        if not all(trecho in encontrados for trecho in todos):
+            continue
+        if algum and not any(trecho in encontrados for trecho in algum):
+            continue
+        if condicao and not condicao(contexto):
+            continue
+        resultados.append((prioridade, banco(contexto) if callable(banco) else banco))
+    return resultados
+
+def identificar_banco(text):
+    """
+    Identifica o banco a partir do texto extraído do PDF.
+    Retorna o nome do banco ou 'Banco não identificado'.
+    """
+    if not text:
+        return "Erro: Texto vazio ou ilegível"
 
-    # Mercado Pago
-    if 'www.mercadopago.com.br' in text or 'Mercado Pago' in text:
-        return "Mercado Pago"
+    resultados = identificar_bancos(text)
+    if resultados:
+        return resultados[0][1]
 
-    return "Banco não identificado"
\ No newline at end of file
+    return "Banco não identificado"
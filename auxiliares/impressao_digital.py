@@ -0,0 +1,91 @@
+import re
+import threading
+
+# Quantidade de blocos de texto do topo da primeira página que entram na impressão digital
+BLOCOS_CABECALHO = 3
+# Grade (em pontos) usada para arredondar posições, tolerando pequenas variações de renderização
+GRADE_POSICAO = 10
+# Quantidade máxima de layouts guardados no índice
+LAYOUTS_MAXIMOS = 10000
+
+# Fontes embutidas como subconjunto recebem um prefixo aleatório por documento (ex.: "ABCDEF+Arial")
+_PREFIXO_SUBCONJUNTO = re.compile(r"^[A-Z]{6}\+")
+
+def _arredondar(posicao):
+    return int(round(posicao / GRADE_POSICAO)) * GRADE_POSICAO
+
+def impressao_digital(pdf):
+    """
+    Calcula a impressão digital do layout de um documento PyMuPDF já aberto, usando apenas dados baratos
+    que não dependem do tamanho do extrato: producer e creator dos metadados, conjunto de fontes e tamanho
+    da primeira página e a posição dos primeiros blocos de texto do cabeçalho.
+    Retorna uma tupla (usada como chave do índice) ou None se o documento não puder ser lido.
+    """
+    try:
+        metadados = pdf.metadata or {}
+        pagina = pdf[0]
+        fontes = sorted({_PREFIXO_SUBCONJUNTO.sub("", fonte[3]) for fonte in pagina.get_fonts()})
+        # Blocos de imagem (tipo 1) não entram: só o texto do cabeçalho
+        blocos = sorted(
+            (bloco for bloco in pagina.get_text("blocks") if bloco[6] == 0 and bloco[4].strip()),
+            key=lambda bloco: (bloco[1], bloco[0])
+        )
+        return (
+            metadados.get("producer") or "",
+            metadados.get("creator") or "",
+            tuple(fontes),
+            (round(pagina.rect.width), round(pagina.rect.height)),
+            tuple((_arredondar(bloco[0]), _arredondar(bloco[1])) for bloco in blocos[:BLOCOS_CABECALHO]),
+        )
+    except (RuntimeError, ValueError, IndexError):
+        return None
+
+class IndiceLayouts:
+    """
+    Índice em memória de impressão digital -> banco, aprendido com os extratos processados com sucesso.
+    Uma impressão que apareça associada a bancos diferentes (ou cujo banco não encontre transações)
+    passa a ser ambígua e deixa de ser respondida. As regras de texto prevalecem: o índice só é consultado
+    quando elas não reconhecem a primeira página, e uma impressão que as contradiga é descartada.
+    O índice vive só na memória do processo (é perdido quando o aplicativo reinicia) e não é consultado
+    para PDFs cujo texto veio do cache em disco, já que neles o documento não é aberto e a impressão
+    digital não é calculada.
+    """
+
+    def __init__(self, limite=LAYOUTS_MAXIMOS):
+        self._bancos = {}
+        self._limite = limite
+        self._trava = threading.Lock()
+
+    def consultar(self, impressao):
+        """Retorna o banco associado à impressão digital ou None (desconhecida ou ambígua)."""
+        if impressao is None:
+            return None
+        return self._bancos.get(impressao) or None
+
+    def registrar(self, impressao, banco):
+        if impressao is None:
+            return
+        with self._trava:
+            atual = self._bancos.get(impressao)
+            if atual is None:
+                if len(self._bancos) < self._limite:
+                    self._bancos[impressao] = banco
+            elif atual != banco:
+                self._bancos[impressao] = False
+
+    def descartar(self, impressao):
+        """Marca a impressão digital como ambígua."""
+        if impressao is None:
+            return
+        with self._trava:
+            self._bancos[impressao] = False
+
+INDICE_LAYOUTS = IndiceLayouts()
+
+def registrar_layout(texto, banco):
+    """Associa o layout do extrato (quando conhecido) ao banco cujo parser encontrou transações."""
+    INDICE_LAYOUTS.registrar(getattr(texto, "impressao", None), banco)
+
+def descartar_layout(texto):
+    """Retira do índice o layout de um extrato cujo parser não encontrou transações."""
+    INDICE_LAYOUTS.descartar(getattr(texto, "impressao", None))
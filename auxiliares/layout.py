@@ -0,0 +1,134 @@
+import re
+from auxiliares.linhas import ler_linhas
+from auxiliares.dinheiro import Dinheiro
+
+# Especificação declarativa do layout de um extrato. Chaves:
+#   inicio             - regex da linha após a qual começam as transações (só a primeira ocorrência conta;
+#                        se não aparecer, as transações começam na primeira linha)
+#   fim                - regex da linha em que as transações terminam (a primeira após o início)
+#   ignorar            - lista de regex de linhas descartadas antes de qualquer outra regra
+#   data               - regex da data, com os grupos nomeados dia, mes e (opcional) ano
+#   meses              - mapa nome do mês (minúsculo) -> número, quando o mês vem por extenso
+#   mes_padrao         - mês usado quando o nome não está no mapa
+#   contexto           - {"ano": regex}: o grupo 1 da primeira linha do documento que casar fornece o ano
+#                        das datas que não o trazem
+#   ano_padrao         - ano usado quando o contexto não é encontrado
+#   registro           - "linha": cada linha com data e valor é uma transação (descrição entre a data e o valor)
+#                        "data_corrente": a linha de data só define a data das linhas seguintes
+#                        (descrição do início da linha até o valor)
+#   ignorar_lancamento - lista de regex de linhas descartadas depois da verificação da data
+#   valor              - regex do valor; o grupo 1 é o valor e o grupo 2 (opcional) o indicador C/D
+#   tipo               - "sufixo": o tipo é o grupo 2 do valor; "sinal": D se o valor começa com "-", senão C
+#   estilo             - estilo de saída do valor (ver auxiliares.dinheiro.ESTILOS); padrão "padrao"
+
+def _unir(padroes):
+    """Junta uma lista de regex em uma única expressão (ou None se a lista estiver vazia)."""
+    if not padroes:
+        return None
+    return re.compile("|".join(f"(?:{padrao})" for padrao in padroes))
+
+def compilar_layout(spec):
+    """
+    Compila a especificação de um layout em uma função text -> lista de transações
+    (dicionários com Data, Descrição, Valor e Tipo) que percorre as linhas uma única vez.
+    Como o início só é conhecido quando encontrado, as transações lidas antes dele ficam guardadas
+    e são descartadas se o marcador aparecer (e usadas se ele nunca aparecer).
+    """
+    inicio = re.compile(spec["inicio"]) if spec.get("inicio") else None
+    fim = re.compile(spec["fim"]) if spec.get("fim") else None
+    ignorar = _unir(spec.get("ignorar"))
+    ignorar_lancamento = _unir(spec.get("ignorar_lancamento"))
+    data = re.compile(spec["data"])
+    valor = re.compile(spec["valor"])
+    meses = spec.get("meses")
+    mes_padrao = spec.get("mes_padrao")
+    contexto_ano = re.compile(spec["contexto"]["ano"]) if spec.get("contexto", {}).get("ano") else None
+    ano_padrao = spec.get("ano_padrao", "")
+    data_corrente = spec.get("registro", "linha") == "data_corrente"
+    tipo_sufixo = spec.get("tipo", "sinal") == "sufixo"
+    estilo = spec.get("estilo", "padrao")
+
+    def _data(match):
+        dia = match.group("dia").zfill(2)
+        mes = match.group("mes")
+        if meses is not None:
+            mes = meses.get(mes.lower(), mes_padrao or mes)
+        ano = match.groupdict().get("ano")
+        return dia, mes, ano
+
+    def processar(text):
+        registros = []
+        ano_contexto = None
+        iniciado = inicio is None
+        encerrado = False
+        atual = None
+
+        for linha in ler_linhas(text):
+            if contexto_ano is not None and ano_contexto is None:
+                match = contexto_ano.search(linha)
+                if match:
+                    ano_contexto = match.group(1)
+
+            if not iniciado and inicio.search(linha):
+                # Tudo o que foi lido antes do marcador de início era cabeçalho
+                iniciado = True
+                encerrado = False
+                registros = []
+                atual = None
+                continue
+
+            if encerrado:
+                if iniciado and (contexto_ano is None or ano_contexto is not None):
+                    break
+                continue
+
+            if fim is not None and fim.search(linha):
+                encerrado = True
+                continue
+
+            if ignorar is not None and ignorar.search(linha):
+                continue
+
+            match_data = data.search(linha)
+            if data_corrente:
+                if match_data:
+                    atual = _data(match_data)
+                    continue
+            elif not match_data:
+                continue
+
+            if ignorar_lancamento is not None and ignorar_lancamento.search(linha):
+                continue
+
+            match_valor = valor.search(linha)
+            if not match_valor:
+                continue
+
+            if data_corrente:
+                if atual is None:
+                    continue
+                data_registro = atual
+                descricao = linha[:match_valor.start()].strip()
+            else:
+                data_registro = _data(match_data)
+                descricao = linha[match_data.end():match_valor.start()].strip()
+
+            texto_valor = match_valor.group(1)
+            if tipo_sufixo:
+                tipo = match_valor.group(2)
+            else:
+                tipo = "D" if texto_valor.startswith("-") else "C"
+            registros.append((data_registro, descricao, Dinheiro.ler(texto_valor, estilo), tipo))
+
+        ano_documento = ano_contexto or ano_padrao
+        return [
+            {
+                "Data": f"{dia}/{mes}/{ano or ano_documento}",
+                "Descrição": descricao,
+                "Valor": valor_registro,
+                "Tipo": tipo,
+            }
+            for (dia, mes, ano), descricao, valor_registro, tipo in registros
+        ]
+
+    return processar
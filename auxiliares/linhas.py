@@ -0,0 +1,119 @@
+from collections import deque
+from auxiliares.texto import TextoPaginado
+
+# Etapas preguiçosas sobre sequências de linhas (ou de tokens). Cada etapa recebe um iterável e
+# devolve um gerador, de modo que etapas encadeadas processam uma linha por vez, sem montar cópias
+# intermediárias do documento:
+#     linhas = ate(ler_linhas(text), lambda linha: linha.startswith("Total"))
+#     linhas = descartar(linhas, lambda linha: "Saldo" in linha)
+
+def ler_linhas(text):
+    """Linhas do texto sem espaços nas pontas e não vazias, lidas página a página quando possível."""
+    linhas = text.linhas() if isinstance(text, TextoPaginado) else str(text).splitlines()
+    for linha in linhas:
+        linha = linha.strip()
+        if linha:
+            yield linha
+
+def filtrar(linhas, manter):
+    """Mantém apenas as linhas para as quais manter(linha) é verdadeiro."""
+    for linha in linhas:
+        if manter(linha):
+            yield linha
+
+def descartar(linhas, remover):
+    """Descarta as linhas para as quais remover(linha) é verdadeiro."""
+    for linha in linhas:
+        if not remover(linha):
+            yield linha
+
+def dividir(linhas, separar):
+    """Substitui cada linha pelas linhas devolvidas por separar(linha) (zero, uma ou várias)."""
+    for linha in linhas:
+        yield from separar(linha)
+
+def ate(linhas, parar):
+    """Repassa as linhas até a primeira para a qual parar(linha) é verdadeiro (exclusive)."""
+    for linha in linhas:
+        if parar(linha):
+            return
+        yield linha
+
+def apos(linhas, marcador):
+    """
+    Repassa as linhas depois da primeira para a qual marcador(linha) é verdadeiro.
+    Se o marcador nunca aparecer, repassa todas as linhas: até encontrá-lo, as linhas ficam guardadas.
+    """
+    linhas = iter(linhas)
+    guardadas = []
+    for linha in linhas:
+        if marcador(linha):
+            yield from linhas
+            return
+        guardadas.append(linha)
+    yield from guardadas
+
+def pular_blocos(linhas, marcador, tamanho):
+    """Remove cada linha para a qual marcador(linha) é verdadeiro junto com as `tamanho - 1` seguintes."""
+    pular = 0
+    for linha in linhas:
+        if pular:
+            pular -= 1
+        elif marcador(linha):
+            pular = tamanho - 1
+        else:
+            yield linha
+
+def janela(linhas, tamanho):
+    """Gera tuplas com cada linha e as `tamanho - 1` seguintes (None depois do fim), para regras que olham adiante."""
+    atual = deque()
+    for linha in linhas:
+        atual.append(linha)
+        if len(atual) == tamanho:
+            yield tuple(atual)
+            atual.popleft()
+    while atual:
+        yield tuple(atual) + (None,) * (tamanho - len(atual))
+        atual.popleft()
+
+class MontadorRegistros:
+    """
+    Acumula as linhas (ou tokens) de um registro de várias linhas e o finaliza com finalizar(linhas),
+    que recebe a própria lista acumulada e devolve a transação (ou None para descartar o registro).
+    A lista é reaproveitada de um registro para o outro: finalizar não deve guardá-la.
+    O registro em aberto no fim do texto é finalizado uma única vez, por terminar().
+    """
+
+    def __init__(self, finalizar):
+        self._finalizar = finalizar
+        self.linhas = []
+        self.registros = []
+
+    def __len__(self):
+        return len(self.linhas)
+
+    def iniciar(self, linha):
+        """Finaliza o registro em aberto (se houver) e começa outro com a linha."""
+        self.encerrar()
+        self.linhas.append(linha)
+
+    def adicionar(self, linha):
+        """Acrescenta a linha ao registro em aberto."""
+        self.linhas.append(linha)
+
+    def encerrar(self):
+        """Finaliza o registro em aberto, se houver."""
+        if self.linhas:
+            registro = self._finalizar(self.linhas)
+            if registro is not None:
+                self.registros.append(registro)
+            self.linhas.clear()
+
+    def descartar(self):
+        """Descarta o registro em aberto sem finalizá-lo."""
+        self.linhas.clear()
+
+    def terminar(self):
+        """Finaliza o registro em aberto no fim do texto e retorna os registros montados."""
+        self.encerrar()
+        return self.registros
@@ -0,0 +1,146 @@
+import re
+from array import array
+from datetime import date
+import numpy as np
+import pandas as pd
+from auxiliares.dinheiro import Dinheiro
+
+_DATA = re.compile(r"^(\d{1,2})/(\d{1,2})/(\d{4})$")
+
+# Momentos dos saldos informados no extrato
+MOMENTOS_SALDO = {"anterior": ord("A"), "dia": ord("D"), "final": ord("F")}
+
+def _ordinal(texto):
+    """Ordinal (date.toordinal) da data dd/mm/aaaa, ou 0 quando a data não tem ano ou é inválida."""
+    match = _DATA.match(texto)
+    if not match:
+        return 0
+    dia, mes, ano = (int(parte) for parte in match.groups())
+    try:
+        return date(ano, mes, dia).toordinal()
+    except ValueError:
+        return 0
+
+class _Dicionario:
+    """Codifica valores repetidos como inteiros: cada valor distinto é guardado uma única vez."""
+
+    def __init__(self):
+        self.valores = []
+        self._codigos = {}
+
+    def codigo(self, valor):
+        codigo = self._codigos.get(valor)
+        if codigo is None:
+            codigo = self._codigos[valor] = len(self.valores)
+            self.valores.append(valor)
+        return codigo
+
+class LoteTransacoes:
+    """
+    Transações de um extrato em colunas compactas, no lugar de uma lista de dicionários:
+      datas      - código da data no dicionário de datas (o texto original é mantido para a saída;
+                   o ordinal é calculado uma vez por data distinta, ver ordinais())
+      descricoes - código da descrição no dicionário de descrições ("PIX RECEBIDO" é guardado uma vez)
+      centavos   - valor em centavos inteiros, com sinal
+      formatos   - código do (estilo, milhar) usado para escrever o valor na saída
+      tipos      - b"C" ou b"D" por transação
+    Percorrer o lote gera os dicionários com Data, Descrição, Valor (Dinheiro) e Tipo, como os parsers retornam.
+    Os saldos impressos no extrato (anterior, do dia, final) ficam à parte, nas colunas saldo_*, junto com a
+    quantidade de transações lidas até eles (saldo_posicoes), para a conciliação.
+    """
+
+    def __init__(self):
+        self.datas = array("i")
+        self.descricoes = array("i")
+        self.centavos = array("q")
+        self.formatos = bytearray()
+        self.tipos = bytearray()
+        self.saldo_datas = array("i")
+        self.saldo_centavos = array("q")
+        self.saldo_posicoes = array("i")
+        self.saldo_momentos = bytearray()
+        self._datas = _Dicionario()
+        self._descricoes = _Dicionario()
+        self._formatos = _Dicionario()
+
+    @classmethod
+    def de_transacoes(cls, transacoes):
+        """Monta o lote a partir de uma lista de dicionários (um lote recebido é retornado como está)."""
+        if isinstance(transacoes, cls):
+            return transacoes
+        lote = cls()
+        for transacao in transacoes:
+            lote.adicionar(transacao["Data"], transacao["Descrição"], transacao["Valor"], transacao["Tipo"])
+        return lote
+
+    def adicionar(self, data, descricao, valor, tipo):
+        """Acrescenta uma transação. O valor é um Dinheiro (ou texto no formato brasileiro)."""
+        if not isinstance(valor, Dinheiro):
+            valor = Dinheiro.ler(valor)
+        if tipo not in ("C", "D"):
+            raise ValueError(f"Tipo de transação inválido: {tipo!r}")
+        self.datas.append(self._datas.codigo(data))
+        self.descricoes.append(self._descricoes.codigo(descricao))
+        self.centavos.append(valor.centavos)
+        self.formatos.append(self._formatos.codigo((valor.estilo, valor.milhar)))
+        self.tipos.append(ord(tipo))
+
+    def registrar_saldo(self, data, valor, momento="dia", posicao=None):
+        """
+        Guarda um saldo impresso no extrato (Dinheiro com sinal; negativo se devedor).
+        momento é "anterior", "dia" ou "final"; posicao é a quantidade de transações que o saldo já inclui
+        (padrão: as transações adicionadas até agora).
+        """
+        if momento not in MOMENTOS_SALDO:
+            raise ValueError(f"Momento de saldo desconhecido: {momento}")
+        self.saldo_datas.append(self._datas.codigo(data or ""))
+        self.saldo_centavos.append(valor.centavos)
+        self.saldo_posicoes.append(len(self) if posicao is None else posicao)
+        self.saldo_momentos.append(MOMENTOS_SALDO[momento])
+
+    def selecionar(self, indices):
+        """Novo lote só com as transações dos índices dados, na ordem dada (os saldos não são copiados)."""
+        lote = LoteTransacoes()
+        for indice in indices:
+            transacao = self[indice]
+            lote.adicionar(transacao["Data"], transacao["Descrição"], transacao["Valor"], transacao["Tipo"])
+        return lote
+
+    def data_do_saldo(self, indice):
+        return self._datas.valores[self.saldo_datas[indice]]
+
+    def __len__(self):
+        return len(self.centavos)
+
+    def __getitem__(self, indice):
+        estilo, milhar = self._formatos.valores[self.formatos[indice]]
+        return {
+            "Data": self._datas.valores[self.datas[indice]],
+            "Descrição": self._descricoes.valores[self.descricoes[indice]],
+            "Valor": Dinheiro(self.centavos[indice], estilo, milhar),
+            "Tipo": chr(self.tipos[indice]),
+        }
+
+    def __iter__(self):
+        for indice in range(len(self)):
+            yield self[indice]
+
+    def ordinais(self):
+        """Datas como ordinais inteiros (0 para datas sem ano ou inválidas), em um array NumPy."""
+        por_codigo = np.array([_ordinal(texto) for texto in self._datas.valores], dtype=np.int32)
+        return por_codigo[np.frombuffer(self.datas, dtype=np.int32)] if len(self) else np.zeros(0, dtype=np.int32)
+
+    def para_dataframe(self):
+        """
+        DataFrame com Data e Descrição categóricas (os códigos do lote, sem repetir os textos),
+        Ordinal da data, Centavos (int64) e Tipo. As colunas numéricas são vistas da memória do lote, sem cópia.
+        """
+        if not len(self):
+            return pd.DataFrame(columns=["Data", "Ordinal", "Descrição", "Centavos", "Tipo"])
+        return pd.DataFrame({
+            "Data": pd.Categorical.from_codes(np.frombuffer(self.datas, dtype=np.int32), self._datas.valores),
+            "Ordinal": self.ordinais(),
+            "Descrição": pd.Categorical.from_codes(np.frombuffer(self.descricoes, dtype=np.int32), self._descricoes.valores),
+            "Centavos": np.frombuffer(self.centavos, dtype=np.int64),
+            "Tipo": np.frombuffer(self.tipos, dtype="S1"),
+        }, copy=False)
@@ -1,6 +1,5 @@
 import streamlit as st
-from auxiliares.pdf_reader import read_pdf
-from auxiliares.pdf_reader2 import read_pdf2
+from auxiliares.extrator import extrair_pdf, banco_identificado
 
 def display_menu():
     """
@@ -23,19 +22,15 @@ def display_menu():
             try:
                 # Resetar o ponteiro do arquivo para o início
                 uploaded_file.seek(0)
-                # Ler o PDF e identificar o banco (recebemos tupla)
-                text, identified_bank = read_pdf(uploaded_file)
+                # Ler o PDF uma única vez, identificar o banco e extrair o texto do backend adequado
+                text, identified_bank = extrair_pdf(uploaded_file)
                 
-                if identified_bank.startswith("Erro") or identified_bank == "Banco não identificado":
+                if not banco_identificado(identified_bank):
                     st.error(f"{uploaded_file.name}: {identified_bank}")
                     banks.append(None)
                     texts.append(None)
                 else:
                     #st.success(f"{uploaded_file.name}: Banco identificado: **{identified_bank}**")
-                    # Se for um dos bancos que precisam de read_pdf2
-                    if identified_bank in ['Bradesco', 'Sicoob1', 'Sicoob2', 'Sicoob3', 'Stone', 'Banco do Brasil1', 'Safra', 'Santander2', 'Efi1', 'Efi2', 'Mercado Pago']:
-                        uploaded_file.seek(0)  # Resetar o ponteiro novamente
-                        text = read_pdf2(uploaded_file)  # read_pdf2 retorna apenas o texto
                     banks.append(identified_bank)
                     texts.append(text)
                 
@@ -45,9 +40,3 @@ def display_menu():
                 texts.append(None)
 
     return banks, uploaded_files, texts
-
-def display_results(csv_data, file_name):
-    """
-    Função mantida para compatibilidade, mas não será usada diretamente.
-    """
-    pass  # Não precisamos mais exibir botões individuais
\ No newline at end of file
@@ -0,0 +1,95 @@
+import math
+import re
+from collections import Counter
+from auxiliares.texto import TextoPaginado
+
+# Quantidade de linhas examinadas no topo e na base de cada página
+LINHAS_BORDA = 20
+# Fração mínima das páginas em que a linha precisa se repetir na mesma posição
+FRACAO_PAGINAS = 0.8
+
+_DIGITOS = re.compile(r"\d")
+_LETRA = re.compile(r"[^\W\d_]")
+
+def _chave(linha):
+    """
+    Forma de comparação da linha entre páginas, ou None se a linha nunca é moldura. Em linhas com letras
+    os dígitos são ignorados, para que "Página 2 de 5" e "Página 3 de 5" contem como a mesma linha.
+    Linhas só com números (datas, valores) nunca são moldura: em um extrato de um único dia, ou com o
+    mesmo valor em várias páginas, a primeira transação de cada página começa pela mesma data.
+    """
+    if _LETRA.search(linha):
+        return _DIGITOS.sub("#", linha)
+    return None if _DIGITOS.search(linha) else linha
+
+def _limite_cabecalho(linhas, borda, cabecalho_tabela):
+    """
+    Até onde o cabeçalho da página pode ir: a linha do cabeçalho da tabela, inclusive (0 se ele não
+    aparece entre as primeiras linhas), ou a borda inteira quando o parser não informa o cabeçalho.
+    """
+    limite = min(borda, len(linhas))
+    if cabecalho_tabela is None:
+        return limite
+    for indice in range(limite):
+        if cabecalho_tabela in linhas[indice]:
+            return indice + 1
+    return 0
+
+def remover_moldura(texto, manter_cabecalho_inicial=False, cabecalho_tabela=None, fracao=FRACAO_PAGINAS,
+                    borda=LINHAS_BORDA):
+    """
+    Remove cabeçalhos e rodapés repetidos (a "moldura" das páginas) de um TextoPaginado.
+    Uma linha é moldura quando aparece na mesma posição, contada a partir do topo ou da base da página,
+    em pelo menos `fracao` das páginas com texto (e no mínimo em duas); só saem as sequências de moldura
+    coladas às bordas, em uma passada por página, e cada sequência para na primeira linha só com data
+    ou valor (ver _chave). Com uma única página nada é removido.
+    Com `manter_cabecalho_inicial`, o cabeçalho da primeira página é mantido (ex.: quando o parser lê
+    o período ou o início da tabela dali); o rodapé dela é removido normalmente.
+    Com `cabecalho_tabela` (trecho da linha de títulos da tabela), o cabeçalho removido de cada página
+    vai no máximo até essa linha: as linhas da tabela abaixo dela nunca saem pelo topo.
+    Retorna um novo TextoPaginado com as linhas de cada página sem espaços nas pontas e não vazias.
+    """
+    paginas = texto.linhas_por_pagina()
+    com_texto = [indice for indice, linhas in enumerate(paginas) if linhas]
+    if len(com_texto) < 2:
+        return texto
+
+    chaves_paginas = []
+    contagem = Counter()
+    for linhas in paginas:
+        total = len(linhas)
+        chaves = [_chave(linha) if indice < borda or indice >= total - borda else None
+                  for indice, linha in enumerate(linhas)]
+        chaves_paginas.append(chaves)
+        presentes = {("topo", indice, chaves[indice]) for indice in range(min(borda, total))
+                     if chaves[indice] is not None}
+        presentes.update(("base", total - 1 - indice, chaves[indice]) for indice in range(max(0, total - borda), total)
+                         if chaves[indice] is not None)
+        contagem.update(presentes)
+
+    minimo = max(2, math.ceil(fracao * len(com_texto)))
+    moldura = {chave for chave, paginas_com_chave in contagem.items() if paginas_com_chave >= minimo}
+    if not moldura:
+        return texto
+
+    novas = []
+    for indice_pagina, (linhas, chaves) in enumerate(zip(paginas, chaves_paginas)):
+        total = len(linhas)
+        # Cabeçalho e rodapé são as sequências de linhas de moldura coladas ao topo e à base da página;
+        # linhas do corpo que por acaso se repitam na mesma posição em outras páginas não são removidas
+        inicio = 0
+        if not (manter_cabecalho_inicial and indice_pagina == com_texto[0]):
+            limite = _limite_cabecalho(linhas, borda, cabecalho_tabela)
+            while inicio < limite and ("topo", inicio, chaves[inicio]) in moldura:
+                inicio += 1
+        fim = total
+        while fim > max(inicio, total - borda) and ("base", total - fim, chaves[fim - 1]) in moldura:
+            fim -= 1
+        novas.append("\n".join(linhas[inicio:fim]))
+
+    resultado = TextoPaginado(novas)
+    resultado.palavras = texto.palavras
+    resultado.blocos = texto.blocos
+    resultado.impressao = texto.impressao
+    resultado.pela_impressao = texto.pela_impressao
+    return resultado
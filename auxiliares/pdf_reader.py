@@ -1,6 +1,7 @@
 from pathlib import Path
 import pdfplumber
 from auxiliares.identificador import identificar_banco
+from auxiliares.texto import TextoPaginado
 
 def validate_pdf(file):
     """Valida se o arquivo é um PDF válido."""
@@ -12,17 +13,14 @@ def validate_pdf(file):
 def read_pdf(file):
     """
     Extrai texto de um PDF e identifica o banco.
-    Retorna uma tupla com (texto, nome_banco) ou levanta exceção em caso de erro.
+    Retorna uma tupla com (texto, nome_banco), onde o texto é um TextoPaginado,
+    ou levanta exceção em caso de erro.
     """
     if not validate_pdf(file):
         raise ValueError("Arquivo não é um PDF válido")
     
-    text = ""
     with pdfplumber.open(file) as pdf:
-        for page in pdf.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text += page_text + "\n"
+        text = TextoPaginado(page.extract_text() or "" for page in pdf.pages)
     
     if not text.strip():
         raise ValueError("Nenhum texto extraído do PDF")
@@ -1,5 +1,7 @@
+import os
 from pathlib import Path
 import fitz  # PyMuPDF
+from auxiliares.texto import TextoPaginado
 
 def validate_pdf(file):
     """
@@ -12,19 +14,20 @@ def validate_pdf(file):
 
 def read_pdf2(file):
     """
-    Lê um arquivo PDF e extrai o texto de todas as páginas como um fluxo contínuo.
-    Retorna o texto extraído ou levanta uma exceção se o arquivo for inválido.
+    Lê um arquivo PDF (upload ou caminho em disco) e extrai o texto de todas as páginas como um fluxo contínuo.
+    Retorna o texto extraído (TextoPaginado) ou levanta uma exceção se o arquivo for inválido.
     """
     if not validate_pdf(file):
         raise ValueError("O arquivo fornecido não é um PDF válido.")
     
-    text = ""
     try:
-        with fitz.open(stream=file.read(), filetype="pdf") as pdf:
-            for page in pdf:
-                page_text = page.get_text()
-                if page_text:
-                    text += page_text + "\n"
+        # Caminhos são lidos direto do disco; uploads entregam o buffer que já mantêm, sem cópia
+        if isinstance(file, (str, os.PathLike)):
+            documento = fitz.open(file)
+        else:
+            documento = fitz.open(stream=file.getvalue() if hasattr(file, "getvalue") else file.read(), filetype="pdf")
+        with documento as pdf:
+            text = TextoPaginado(page.get_text() for page in pdf)
         if not text.strip():
             raise ValueError("Nenhum texto foi extraído do PDF.")
         return text
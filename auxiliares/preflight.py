@@ -0,0 +1,33 @@
+import os
+
+# Limite de páginas aceito antes de ocupar um worker com a extração
+PAGINAS_MAXIMAS = int(os.environ.get("EXTRATOR_PAGINAS_MAXIMAS", "5000"))
+
+def verificar_assinatura(cabecalho):
+    """
+    Confere se os primeiros bytes do arquivo contêm a assinatura %PDF (a especificação
+    permite que ela apareça em qualquer ponto do primeiro 1 KB). Levanta ValueError se não contiver.
+    """
+    if not cabecalho:
+        raise ValueError("O arquivo está vazio.")
+    if b"%PDF" not in cabecalho[:1024]:
+        raise ValueError("O arquivo não é um PDF (assinatura %PDF ausente).")
+
+def verificar_documento(pdf):
+    """
+    Verificações baratas sobre um documento PyMuPDF já aberto, feitas antes de qualquer extração de texto:
+    senha, quantidade de páginas e presença de camada de texto (fontes) em alguma página.
+    Levanta ValueError com o motivo da rejeição.
+    """
+    if pdf.needs_pass:
+        raise ValueError("O PDF está protegido por senha.")
+
+    total = pdf.page_count
+    if total == 0:
+        raise ValueError("O PDF não tem páginas.")
+    if total > PAGINAS_MAXIMAS:
+        raise ValueError(f"O PDF tem {total} páginas; o limite é {PAGINAS_MAXIMAS}.")
+
+    # Páginas sem nenhuma fonte não têm texto selecionável (ex.: extrato escaneado)
+    if not any(pagina.get_fonts() for pagina in pdf):
+        raise ValueError("O PDF não tem camada de texto (parece ser uma imagem escaneada).")
@@ -0,0 +1,139 @@
+import re
+import unicodedata
+from collections import Counter
+from auxiliares.linhas import ler_linhas
+from banco import get_variantes
+
+# Número da conta no cabeçalho do extrato (ex.: "Conta: 12345-6", "CONTA CORRENTE Nº 0012345-X")
+_CONTA = re.compile(r"\bconta(?:\s+corrente)?\s*(?:n[º°o]\.?\s*)?:?\s*(\d[\d.]*-[\dxX])\b", re.IGNORECASE)
+# O número da conta é procurado só no início do documento
+LINHAS_CABECALHO = 60
+
+_NAO_ALFANUMERICO = re.compile(r"[^A-Z0-9]+")
+
+def familia_do_banco(banco):
+    """Nome comum às variantes de layout de um banco (o próprio banco, se ele não tiver variantes)."""
+    return min([banco] + get_variantes(banco))
+
+def identificar_conta(text, banco):
+    """
+    Conta de um extrato: (banco, número da conta ou None). Variantes de layout do mesmo banco contam como
+    o mesmo banco. Sem número no cabeçalho a conta é desconhecida: os extratos do banco são conferidos
+    entre si, mas as transações repetidas são apenas sinalizadas (podem ser de contas diferentes).
+    """
+    familia = familia_do_banco(banco)
+    for numero, linha in enumerate(ler_linhas(text)):
+        if numero >= LINHAS_CABECALHO:
+            break
+        match = _CONTA.search(linha)
+        if match:
+            return familia, re.sub(r"[^\dX]", "", match.group(1).upper())
+    return familia, None
+
+def normalizar_descricao(descricao):
+    """Descrição sem acentos, em maiúsculas e sem pontuação, com um espaço entre as palavras."""
+    sem_acentos = unicodedata.normalize("NFKD", descricao).encode("ascii", "ignore").decode("ascii")
+    return _NAO_ALFANUMERICO.sub(" ", sem_acentos.upper()).strip()
+
+def _periodo(ordinais):
+    """(primeira, última) data do lote como ordinais, ignorando datas sem ano; None se nenhuma tem ano."""
+    datados = ordinais[ordinais > 0]
+    return (int(datados.min()), int(datados.max())) if len(datados) else None
+
+def _na_sobreposicao(ordinal, periodo, outro):
+    """Indica se a data está no intervalo comum aos períodos dos dois arquivos."""
+    if not ordinal or periodo is None or outro is None:
+        return False
+    return max(periodo[0], outro[0]) <= ordinal <= min(periodo[1], outro[1])
+
+class LivroRazao:
+    """
+    Transações já vistas nos arquivos de um mesmo envio, por conta, para achar extratos que se sobrepõem
+    (ex.: extrato mensal e exportação dos "últimos 30 dias", ou o mesmo arquivo enviado duas vezes).
+    Cada conta tem um índice (data, valor, tipo, descrição normalizada) -> arquivo de cada ocorrência.
+    Transações iguais dentro do mesmo arquivo são legítimas (ex.: dois Pix de mesmo valor no dia): só são
+    repetidas as ocorrências que excedem as já vistas em outros arquivos.
+    Uma repetida só sai do lote quando a conta é conhecida (número lido do cabeçalho) e a data, com ano, está
+    no período comum aos dois arquivos; as demais são apenas sinalizadas. Com remover=False nada sai do lote.
+    """
+
+    def __init__(self, remover=True):
+        self.remover = remover
+        self._contas = {}
+        self._periodos = {}
+
+    def registrar(self, nome, conta, lote):
+        """
+        Registra as transações do arquivo e retorna (lote, removidas, sinalizadas): o lote sem as transações
+        removidas (o próprio lote se nada foi removido) e, para as removidas e para as repetidas mantidas,
+        {arquivo onde já estavam: quantidade}.
+        """
+        indice = self._contas.setdefault(conta, {})
+        periodos = self._periodos.setdefault(conta, {})
+        remover = self.remover and conta[1] is not None
+        ordinais = lote.ordinais()
+        periodo = _periodo(ordinais)
+        neste_arquivo = Counter()
+        manter = []
+        removidas = Counter()
+        sinalizadas = Counter()
+        for posicao, transacao in enumerate(lote):
+            chave = (transacao["Data"], abs(transacao["Valor"].centavos), transacao["Tipo"],
+                     normalizar_descricao(transacao["Descrição"]))
+            neste_arquivo[chave] += 1
+            origens = indice.setdefault(chave, [])
+            if neste_arquivo[chave] > len(origens):
+                origens.append(nome)
+                manter.append(posicao)
+                continue
+            origem = origens[neste_arquivo[chave] - 1]
+            if remover and _na_sobreposicao(int(ordinais[posicao]), periodo, periodos.get(origem)):
+                removidas[origem] += 1
+            else:
+                sinalizadas[origem] += 1
+                manter.append(posicao)
+        periodos[nome] = periodo
+
+        if removidas:
+            lote = lote.selecionar(manter)
+        return lote, dict(removidas), dict(sinalizadas)
+
+    def conferir(self, arquivos):
+        """
+        Registra uma lista de (nome, conta, lote), do maior lote para o menor (o extrato completo prevalece
+        sobre exportações parciais do mesmo período; no empate, vale a ordem de envio), e retorna os
+        (lote, removidas, sinalizadas) de cada arquivo na ordem recebida.
+        """
+        conferidos = [None] * len(arquivos)
+        for posicao in sorted(range(len(arquivos)), key=lambda posicao: -len(arquivos[posicao][2])):
+            conferidos[posicao] = self.registrar(*arquivos[posicao])
+        return conferidos
+
+class PendentesPorGrupo:
+    """
+    Acompanha a conclusão dos arquivos para liberar cada grupo para o ZIP assim que possível: um arquivo
+    de conta conhecida espera só os outros arquivos da mesma conta; os arquivos sem número de conta esperam
+    toda a família do banco (podem ser de qualquer conta dela). Arquivos sem grupo saem logo.
+    """
+
+    def __init__(self, grupos):
+        self._grupos = grupos
+        self._faltam_grupo = Counter(grupo for grupo in grupos if grupo is not None)
+        self._faltam_familia = Counter(grupo[0] for grupo in grupos if grupo is not None)
+        self._concluidos = {}
+
+    def concluir(self, posicao):
+        """Marca o arquivo como concluído e retorna as listas de posições (em ordem) liberadas para o ZIP."""
+        grupo = self._grupos[posicao]
+        if grupo is None:
+            return [[posicao]]
+        self._concluidos.setdefault(grupo, []).append(posicao)
+        self._faltam_grupo[grupo] -= 1
+        self._faltam_familia[grupo[0]] -= 1
+        liberados = []
+        if grupo[1] is not None and not self._faltam_grupo[grupo]:
+            liberados.append(sorted(self._concluidos.pop(grupo)))
+        sem_conta = (grupo[0], None)
+        if not self._faltam_familia[grupo[0]] and sem_conta in self._concluidos:
+            liberados.append(sorted(self._concluidos.pop(sem_conta)))
+        return liberados
@@ -0,0 +1,83 @@
+from bisect import bisect_right
+
+class TextoPaginado:
+    """
+    Texto de um extrato organizado por páginas.
+    Guarda a lista de páginas e só monta o texto contínuo (cada página não vazia seguida de "\n",
+    como os leitores sempre fizeram) quando algum código pede o texto completo.
+    Métodos de str não definidos aqui (splitlines, split, strip, lower...) são repassados ao texto
+    completo, de modo que as funções process(text) existentes continuam funcionando sem alteração.
+    Funções do módulo re exigem str: nesses casos use str(texto).
+    Quando o parser declara que precisa, `palavras` e `blocos` trazem, por página, as tuplas
+    (x0, y0, x1, y1, texto) extraídas com coordenadas. `impressao` guarda a impressão digital
+    do layout do PDF de origem, quando calculada, e `pela_impressao` indica que o banco foi
+    identificado só por ela, sem assinatura no texto.
+    """
+
+    def __init__(self, paginas):
+        self.paginas = list(paginas)
+        self.palavras = None
+        self.blocos = None
+        self.impressao = None
+        self.pela_impressao = False
+        self._texto = None
+        self._inicios = None
+
+    @property
+    def texto(self):
+        """Texto contínuo do documento, montado uma única vez."""
+        if self._texto is None:
+            self._texto = "".join(pagina + "\n" for pagina in self.paginas if pagina)
+        return self._texto
+
+    def __str__(self):
+        return self.texto
+
+    def __repr__(self):
+        return f"TextoPaginado({len(self.paginas)} páginas)"
+
+    def __len__(self):
+        return len(self.texto)
+
+    def __contains__(self, trecho):
+        return trecho in self.texto
+
+    def __getitem__(self, indice):
+        return self.texto[indice]
+
+    def __eq__(self, outro):
+        return self.texto == str(outro)
+
+    def __hash__(self):
+        return hash(self.texto)
+
+    def __getattr__(self, nome):
+        # Só chega aqui o que não existe na instância. Nomes privados e especiais não são repassados: copy e
+        # pickle procuram __deepcopy__, __setstate__... antes de __init__ rodar, sem _texto, e repassar
+        # a busca de _texto a self.texto entraria em recursão infinita
+        if nome.startswith("_"):
+            raise AttributeError(nome)
+        return getattr(self.texto, nome)
+
+    def linhas(self):
+        """Percorre as linhas do documento página a página, sem montar o texto completo."""
+        for pagina in self.paginas:
+            if pagina:
+                yield from (pagina + "\n").splitlines()
+
+    def linhas_por_pagina(self):
+        """Retorna, para cada página, a lista das suas linhas sem espaços nas pontas e não vazias."""
+        return [[linha.strip() for linha in pagina.splitlines() if linha.strip()] for pagina in self.paginas]
+
+    def pagina_da_posicao(self, posicao):
+        """Retorna o índice (a partir de 0) da página que contém o caractere na posição indicada do texto contínuo."""
+        if self._inicios is None:
+            self._inicios = []
+            inicio = 0
+            for indice, pagina in enumerate(self.paginas):
+                if pagina:
+                    self._inicios.append((inicio, indice))
+                    inicio += len(pagina) + 1
+        if posicao < 0 or posicao >= len(self.texto):
+            raise IndexError("Posição fora do texto")
+        return self._inicios[bisect_right(self._inicios, (posicao, float("inf"))) - 1][1]
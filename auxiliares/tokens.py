@@ -0,0 +1,146 @@
+import re
+from collections import namedtuple
+from auxiliares.linhas import ler_linhas, janela
+from auxiliares.dinheiro import Dinheiro
+
+MESES_ABREVIADOS = {
+    "jan": "01", "fev": "02", "mar": "03", "abr": "04", "mai": "05", "jun": "06",
+    "jul": "07", "ago": "08", "set": "09", "out": "10", "nov": "11", "dez": "12"
+}
+
+MESES_EXTENSO = {
+    "janeiro": "01", "fevereiro": "02", "março": "03", "abril": "04", "maio": "05", "junho": "06",
+    "julho": "07", "agosto": "08", "setembro": "09", "outubro": "10", "novembro": "11", "dezembro": "12"
+}
+
+# Formatos de data reconhecidos no início da linha, do mais específico para o menos específico.
+# Ficam em uma única regex; o grupo nomeado que casou indica o formato.
+_FORMATOS_DATA = [
+    ("dd/mm/aaaa", r"(\d{2})/(\d{2})/(\d{4})", None),
+    ("dd/mm", r"(\d{2})/(\d{2})(?!\d|/\d)()", None),
+    ("dd/mes", r"(\d{2})\s*/\s*(jan|fev|mar|abr|mai|jun|jul|ago|set|out|nov|dez)(?![a-zç])()", MESES_ABREVIADOS),
+    ("extenso", r"(\d{1,2}) de (janeiro|fevereiro|março|abril|maio|junho|julho|agosto|setembro|outubro|novembro|dezembro) de (\d{4})",
+     MESES_EXTENSO),
+]
+_DATA = re.compile(
+    "|".join(f"(?P<f{n}>{padrao})" for n, (_, padrao, _) in enumerate(_FORMATOS_DATA)),
+    re.IGNORECASE
+)
+# Índice do primeiro grupo (dia) de cada formato dentro da regex única
+_GRUPOS_DATA = {}
+_grupo = 1
+for _n, (_formato, _padrao, _meses) in enumerate(_FORMATOS_DATA):
+    _GRUPOS_DATA[f"f{_n}"] = (_formato, _grupo + 1, _meses)
+    _grupo += 4
+
+# Valor no início da linha: sinal opcional, R$ opcional, número no formato brasileiro e C/D opcional.
+# É mais tolerante que os padrões que cada parser usava antes e, por isso, lê valores que eles perdiam:
+#   - milhares com ou sem ponto ("1.234,56" e "1234,56"), inclusive milhões ("1.234.567,89"), que o Bradesco
+#     não reconhecia (o valor virava descrição e as transações seguintes se perdiam);
+#   - C/D colado ou separado por espaço ("1.234,56C" e "1.234,56 C"), que o Sicoob descartava.
+# Números com ponto fora do lugar ("1234.567,89") não são valores.
+_VALOR = re.compile(r"([+-])?\s*(?:R\$\s*)?((?:\d{1,3}(?:\.\d{3})+|\d+),\d{2})(?:\s*([CD])\b)?")
+_INICIO_VALOR = frozenset("0123456789+-R")
+
+_CAMPOS_TOKEN = ("linha", "texto", "marcadores", "ruido", "data", "formato_data", "so_data",
+                 "valor", "sinal", "cd", "so_valor")
+
+class Token(namedtuple("Token", _CAMPOS_TOKEN)):
+    """
+    Uma linha do extrato classificada uma única vez, com os dados já interpretados:
+      linha         - linha sem espaços nas pontas, depois das normalizações
+      texto         - linha depois da limpeza de prefixos (ex.: nome da empresa e CNPJ)
+      marcadores    - {nome: match} dos marcadores encontrados na linha
+      ruido         - se o texto é cabeçalho/rodapé (ou ficou vazio depois da limpeza)
+      data          - (dia, mes, ano) da data no início do texto (ano None quando ausente) ou None
+      formato_data  - "dd/mm/aaaa", "dd/mm", "dd/mes" ou "extenso"
+      so_data       - se o texto é apenas a data
+      valor         - Dinheiro (com o sinal) do valor no início do texto ou None
+      sinal, cd     - sinal ("+", "-" ou None) e indicador C/D (ou None) desse valor
+      so_valor      - se o texto é apenas o valor
+    """
+
+    __slots__ = ()
+
+    @property
+    def tipo(self):
+        """Classificação principal da linha: ruido, data, valor ou texto."""
+        if self.ruido:
+            return "ruido"
+        if self.data is not None:
+            return "data"
+        if self.so_valor:
+            return "valor"
+        return "texto"
+
+    def __repr__(self):
+        return f"Token({self.tipo}, {self.texto!r})"
+
+def _unir(padroes):
+    if not padroes:
+        return None
+    return re.compile("|".join(f"(?:{padrao})" for padrao in padroes))
+
+class Tokenizador:
+    """
+    Classificador de linhas configurado por banco, compilado uma vez:
+      normalizar - lista de (regex, substituição) aplicadas a toda linha (ex.: espaços repetidos)
+      limpar     - regex de um prefixo removido do texto da linha (ex.: "EMPRESA | CNPJ: ...")
+      ruido      - lista de regex de cabeçalho/rodapé, procuradas no texto limpo
+      marcadores - {nome: regex} procuradas na linha normalizada (ex.: início, fim, saldo, total)
+      estilo     - estilo de saída dos valores (ver auxiliares.dinheiro.ESTILOS)
+    """
+
+    def __init__(self, normalizar=(), limpar=None, ruido=(), marcadores=None, estilo="padrao"):
+        self._normalizar = [(re.compile(padrao), substituicao) for padrao, substituicao in normalizar]
+        self._limpar = re.compile(limpar) if limpar else None
+        self._ruido = _unir(ruido)
+        self._marcadores = [(nome, re.compile(padrao)) for nome, padrao in (marcadores or {}).items()]
+        # Uma única busca descarta de uma vez as linhas sem nenhum marcador (a maioria)
+        self._algum_marcador = _unir([padrao for padrao in (marcadores or {}).values()])
+        self._estilo = estilo
+
+    def token(self, linha):
+        """Classifica uma linha (já sem espaços nas pontas e não vazia)."""
+        for padrao, substituicao in self._normalizar:
+            linha = padrao.sub(substituicao, linha)
+        linha = linha.strip()
+
+        texto = self._limpar.sub("", linha, count=1).strip() if self._limpar else linha
+        marcadores = {}
+        if self._algum_marcador is not None and self._algum_marcador.search(linha):
+            for nome, padrao in self._marcadores:
+                match = padrao.search(linha)
+                if match:
+                    marcadores[nome] = match
+        ruido = not texto or bool(self._ruido and self._ruido.search(texto))
+
+        data = formato_data = valor = sinal = cd = None
+        so_data = so_valor = False
+        inicial = texto[:1]
+        if inicial.isdigit():
+            match = _DATA.match(texto)
+            if match:
+                formato_data, grupo, meses = _GRUPOS_DATA[match.lastgroup]
+                dia, mes, ano = match.group(grupo, grupo + 1, grupo + 2)
+                data = (dia.zfill(2), meses[mes.lower()] if meses else mes, ano or None)
+                so_data = match.end() == len(texto)
+
+        # Data e valor não podem começar na mesma posição ("dd/" x "d,dd"/"d.ddd")
+        if data is None and inicial and inicial in _INICIO_VALOR:
+            match = _VALOR.match(texto)
+            if match:
+                sinal, numero, cd = match.groups()
+                valor = Dinheiro.ler(f"{sinal or ''}{numero}", self._estilo)
+                so_valor = match.end() == len(texto)
+
+        return Token(linha, texto, marcadores, ruido, data, formato_data, so_data, valor, sinal, cd, so_valor)
+
+    def tokens(self, text):
+        """Percorre o texto uma única vez (página a página quando possível), gerando um Token por linha não vazia."""
+        for linha in ler_linhas(text):
+            yield self.token(linha)
+
+def com_proximo(tokens):
+    """Gera pares (token, próximo token ou None), para regras que olham a linha seguinte."""
+    return janela(tokens, 2)
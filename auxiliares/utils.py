@@ -1,49 +1,71 @@
-from io import BytesIO
-from xml.etree.ElementTree import Element, SubElement, tostring
-from xml.dom import minidom
+import csv
+import os
+import re
+from io import BytesIO, TextIOWrapper
+from xml.sax.saxutils import escape
+from auxiliares.lote import LoteTransacoes
+from auxiliares.conciliacao import conciliar
 
-def create_xml(data):
+# Caracteres que não podem aparecer em um documento XML 1.0
+_INVALIDO_XML = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]")
+
+def _elemento_xml(nome, texto):
+    """Elemento de um campo da transação, indentado e escapado como o minidom.toprettyxml escreve."""
+    if not texto:
+        return f"    <{nome}/>\n"
+    if _INVALIDO_XML.search(texto):
+        raise ValueError(f"Caractere inválido para XML em {nome}: {texto!r}")
+    texto = escape(texto.replace("\r\n", "\n").replace("\r", "\n"), {'"': "&quot;"})
+    return f"    <{nome}>{texto}</{nome}>\n"
+
+def write_xml(data, output):
     """
-    Cria um arquivo XML a partir dos dados extraídos e retorna o XML como BytesIO.
+    Escreve o XML das transações (lista de transações ou LoteTransacoes) em um destino binário
+    (arquivo aberto em "wb", BytesIO...), uma transação por vez, sem montar o documento em memória.
+    A estrutura, a indentação e o escape são os do ElementTree formatado com minidom.toprettyxml(indent="  ")
+    que create_xml sempre gerou.
     """
-    root = Element("Transactions")
-    
+    output.write(b'<?xml version="1.0" ?>\n')
+    vazio = True
     for transaction in data:
-        trans_elem = SubElement(root, "Transaction")
-        
-        date_elem = SubElement(trans_elem, "Data")
-        date_elem.text = transaction["Data"]
-        
-        desc_elem = SubElement(trans_elem, "Descrição")
-        desc_elem.text = transaction["Descrição"]
-        
-        value_elem = SubElement(trans_elem, "Valor")
-        value_elem.text = transaction["Valor"]
-        
-        type_elem = SubElement(trans_elem, "Tipo")
-        type_elem.text = transaction["Tipo"]
-    
-    rough_string = tostring(root, 'utf-8')
-    reparsed = minidom.parseString(rough_string)
-    pretty_xml = reparsed.toprettyxml(indent="  ")
-    
+        if vazio:
+            output.write(b"<Transactions>\n")
+            vazio = False
+        output.write((
+            "  <Transaction>\n"
+            + _elemento_xml("Data", transaction["Data"])
+            + _elemento_xml("Descrição", transaction["Descrição"])
+            + _elemento_xml("Valor", str(transaction["Valor"]))  # Dinheiro é formatado só aqui, no estilo do banco
+            + _elemento_xml("Tipo", transaction["Tipo"])
+            + "  </Transaction>\n"
+        ).encode("utf-8"))
+    output.write(b"<Transactions/>\n" if vazio else b"</Transactions>\n")
+
+def create_xml(data):
+    """
+    Cria um arquivo XML a partir dos dados extraídos (lista de transações ou LoteTransacoes)
+    e retorna o XML como BytesIO.
+    """
     output = BytesIO()
-    output.write(pretty_xml.encode('utf-8'))
+    write_xml(data, output)
     output.seek(0)
     
     return output
 
 def create_txt(data):
     """
-    Cria um arquivo TXT a partir dos dados extraídos e retorna o TXT como BytesIO.
+    Cria um arquivo TXT a partir dos dados extraídos (lista de transações ou LoteTransacoes)
+    e retorna o TXT como BytesIO.
     """
-    txt_content = ""
-    for transaction in data:
-        txt_content += f"Data: {transaction['Data']}\n"
-        txt_content += f"Descrição: {transaction['Descrição']}\n"
-        txt_content += f"Valor: {transaction['Valor']}\n"
-        txt_content += f"Tipo: {transaction['Tipo']}\n"
-        txt_content += "-" * 50 + "\n"
+    separador = "-" * 50
+    txt_content = "".join(
+        f"Data: {transaction['Data']}\n"
+        f"Descrição: {transaction['Descrição']}\n"
+        f"Valor: {transaction['Valor']}\n"
+        f"Tipo: {transaction['Tipo']}\n"
+        f"{separador}\n"
+        for transaction in data
+    )
     
     output = BytesIO()
     output.write(txt_content.encode('utf-8'))
@@ -51,20 +73,89 @@ def create_txt(data):
     
     return output
 
+class ResultadoExtrato:
+    """
+    Saídas do processamento de um extrato: o lote de transações, as divergências da conciliação com os
+    saldos do extrato (auxiliares.conciliacao) e os formatos CSV, XML e TXT. Cada formato só é gerado
+    quando pedido pela primeira vez; o conteúdo fica guardado e cada acesso recebe um BytesIO novo,
+    posicionado no início. Desempacota como (xml_data, txt_data).
+    """
+
+    def __init__(self, transacoes):
+        self.lote = LoteTransacoes.de_transacoes(transacoes)
+        self.divergencias = conciliar(self.lote)
+        self._saidas = {}
+
+    def _saida(self, formato, criar):
+        conteudo = self._saidas.get(formato)
+        if conteudo is None:
+            conteudo = self._saidas[formato] = criar(self.lote).getvalue()
+        return BytesIO(conteudo)
+
+    @property
+    def csv_data(self):
+        return self._saida("csv", create_csv)
+
+    @property
+    def xml_data(self):
+        return self._saida("xml", create_xml)
+
+    @property
+    def txt_data(self):
+        return self._saida("txt", create_txt)
+
+    def __iter__(self):
+        return iter((self.xml_data, self.txt_data))
+
+def _texto_lido_do_xml(texto):
+    """Texto como volta de uma leitura de XML, que converte \r\n e \r em \n."""
+    return texto.replace("\r\n", "\n").replace("\r", "\n")
+
+def create_csv(data):
+    """
+    Cria o CSV das transações (lista de transações ou LoteTransacoes) diretamente, uma linha por transação,
+    e retorna o CSV como BytesIO. O conteúdo é o mesmo de xml_to_csv(create_xml(data)): sem cabeçalho,
+    separado por ponto e vírgula, em utf-8 com BOM, com os campos sem espaços nas pontas e as quebras de
+    linha da descrição trocadas por espaço.
+    """
+    output = BytesIO()
+    texto = TextIOWrapper(output, encoding="utf-8-sig", newline="")
+    # Mesmas opções do DataFrame.to_csv usado em xml_to_csv
+    writer = csv.writer(texto, delimiter=";", quoting=csv.QUOTE_MINIMAL, lineterminator=os.linesep)
+    for transaction in data:
+        writer.writerow((
+            _texto_lido_do_xml(transaction["Data"]).strip(),
+            _texto_lido_do_xml(transaction["Descrição"]).replace("\n", " ").strip(),
+            _texto_lido_do_xml(str(transaction["Valor"])).strip(),
+            _texto_lido_do_xml(transaction["Tipo"]).strip(),
+        ))
+    texto.flush()
+    texto.detach()
+    output.seek(0)
+    return output
+
+def extrair_dados(text, preprocess_func, extract_func):
+    """
+    Executa o pré-processamento e a extração de um parser e retorna a lista de transações
+    (dicionários com Data, Descrição, Valor e Tipo, com o valor como auxiliares.dinheiro.Dinheiro),
+    sem gerar os arquivos de saída.
+    """
+    transactions = preprocess_func(text)
+    return extract_func(transactions)
+
 def process_transactions(text, preprocess_func, extract_func):
     """
-    Processa o texto extraído de um extrato bancário e retorna XML e TXT.
+    Processa o texto extraído de um extrato bancário e retorna as saídas (CSV, XML e TXT) e as transações.
+    As transações do parser (lista de dicionários ou um LoteTransacoes já montado, com os saldos do extrato)
+    passam por um LoteTransacoes e são conferidas com os saldos antes de gerar as saídas.
     Args:
         text (str): Texto extraído do extrato.
         preprocess_func (callable): Função de pré-processamento específica do banco.
         extract_func (callable): Função de extração de transações específica do banco.
     Returns:
-        tuple: (xml_data, txt_data) ou (None, None, None) se não houver transações.
+        ResultadoExtrato: desempacota como (xml_data, txt_data); (None, None) se não houver transações.
     """
-    transactions = preprocess_func(text)
-    data = extract_func(transactions)
+    data = extrair_dados(text, preprocess_func, extract_func)
     if not data:
         return None, None
-    xml_data = create_xml(data)
-    txt_data = create_txt(data)
-    return xml_data, txt_data
\ No newline at end of file
+    return ResultadoExtrato(data)
@@ -0,0 +1,59 @@
+import re
+from auxiliares.utils import extrair_dados, ResultadoExtrato
+from banco import BANK_MODULES, get_variantes
+
+_DATA = re.compile(r"^\d{2}/\d{2}(?:/\d{2,4})?$")
+_VALOR = re.compile(r"^\d[\d.]*(?:,\d{1,2})?$")
+
+def transacao_completa(transacao):
+    """Indica se a transação tem data, descrição, valor e tipo preenchidos em formato válido."""
+    return bool(
+        _DATA.match(str(transacao.get("Data") or "").strip())
+        and str(transacao.get("Descrição") or "").strip()
+        and _VALOR.match(str(transacao.get("Valor") or "").strip())
+        and transacao.get("Tipo") in ("C", "D")
+    )
+
+def pontuar(dados, divergencias=()):
+    """
+    Pontuação de um resultado: (transações completas menos divergências de saldo, menos divergências,
+    total de transações). Maior é melhor. Cada divergência da conciliação indica pelo menos uma transação
+    perdida ou lida errada, então um parser que lê mais linhas mas não fecha os saldos perde para o que fecha.
+    """
+    completas = sum(1 for transacao in dados if transacao_completa(transacao))
+    return completas - len(divergencias), -len(divergencias), len(dados)
+
+def _executar_variante(banco, text):
+    """
+    Executa o parser de uma variante sobre o texto já extraído e retorna (transações, ResultadoExtrato).
+    Falhas contam como nenhuma transação: (None, None).
+    """
+    module = BANK_MODULES[banco]
+    try:
+        dados = extrair_dados(text, module.preprocess_text, module.extract_transactions)
+        return (dados, ResultadoExtrato(dados)) if dados else (None, None)
+    except Exception:
+        # Um parser aplicado ao layout de outra variante pode falhar de qualquer forma
+        return None, None
+
+def tentar_variantes(bank, text):
+    """
+    Executa as outras variantes da família do banco sobre o mesmo texto, sem nova extração.
+    Variantes que declaram outro backend recebem o texto do backend usado para o banco identificado.
+    Os parsers são CPU-bound e seguram o GIL, então rodam em sequência: threads não os acelerariam.
+    Vence a variante com a melhor pontuação (transações completas, descontadas as divergências com os
+    saldos do extrato; no empate, mais transações; depois a ordem da família).
+    Retorna (banco, ResultadoExtrato) ou None se nenhuma variante encontrar transações.
+    """
+    melhor = None
+    for variante in get_variantes(bank):
+        dados, resultado = _executar_variante(variante, text)
+        if resultado is None:
+            continue
+        pontuacao = pontuar(dados, resultado.divergencias)
+        if melhor is None or pontuacao > melhor[0]:
+            melhor = (pontuacao, variante, resultado)
+
+    if melhor is None:
+        return None
+    return melhor[1], melhor[2]
@@ -0,0 +1,50 @@
+import io
+import zipfile
+from tempfile import SpooledTemporaryFile
+
+# Acima deste tamanho o ZIP em montagem sai da memória para um arquivo temporário
+LIMITE_MEMORIA_ZIP = 32 * 1024 * 1024
+
+class ZipCSVs:
+    """
+    ZIP dos CSVs montado à medida que cada arquivo fica pronto: cada CSV é comprimido assim que é
+    adicionado e pode ser descartado em seguida. O ZIP fica em memória até LIMITE_MEMORIA_ZIP e,
+    acima disso, em um arquivo temporário, fora da memória enquanto os demais extratos são processados.
+    """
+
+    def __init__(self, limite=LIMITE_MEMORIA_ZIP):
+        self._arquivo = SpooledTemporaryFile(max_size=limite)
+        self._zip = zipfile.ZipFile(self._arquivo, "w", zipfile.ZIP_DEFLATED)
+        self.membros = 0
+
+    def adicionar(self, file_name, csv_data):
+        """Comprime o CSV do PDF file_name (BytesIO, StringIO, bytes ou str) como extrato_<nome>.csv."""
+        # Gera o nome do arquivo CSV baseado no nome do PDF
+        csv_file_name = f"extrato_{file_name.rsplit('.', 1)[0]}.csv"
+        # Converte csv_data para bytes
+        if isinstance(csv_data, io.StringIO):
+            data = csv_data.getvalue().encode('utf-8')  # Converte string para bytes
+        elif isinstance(csv_data, io.BytesIO):
+            data = csv_data.getvalue()  # Obtém bytes diretamente
+        else:
+            data = csv_data  # Assume que já é bytes ou string
+            if isinstance(data, str):
+                data = data.encode('utf-8')
+        self._zip.writestr(csv_file_name, data)
+        self.membros += 1
+
+    def conteudo(self):
+        """
+        Fecha o ZIP e retorna um leitor (BufferedReader, aceito pelo st.download_button) do arquivo
+        temporário, posicionado no início, sem copiar o ZIP para a memória aqui. Pedir o descritor grava
+        no disco o ZIP que ainda estava em memória. O leitor vale até fechar().
+        """
+        self._zip.close()
+        leitor = open(self._arquivo.fileno(), "rb", closefd=False)
+        leitor.seek(0)
+        return leitor
+
+    def fechar(self):
+        """Fecha o ZIP, se ainda aberto, e remove o arquivo temporário."""
+        self._zip.close()
+        self._arquivo.close()
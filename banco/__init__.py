@@ -1,60 +1,72 @@
-from .sicoob import process as process_sicoob
-from .sicoob2 import process as process_sicoob2
-from .sicoob3 import process as process_sicoob3
-from .itau import process as process_itau
-from .itau2 import process as process_itau2
-from .itau3 import process as process_itau3
-from .caixa import process as process_caixa
-from .inter import process as process_inter
-from .nubank import process as process_nubank
-from .bradesco import process as process_bradesco
-from .santander1 import process as process_santander1
-from .santander2 import process as process_santander2
-from .sicredi import process as process_sicredi
-from .pagbank import process as process_pagbank
-from .stone import process as process_stone
-from .bancobrasil1 import process as process_bancobrasil1
-from .bancobrasil2 import process as process_bancobrasil2
-from .ifood import process as process_ifood
-from .asaas import process as process_asaas
-from .cora import process as process_cora
-from .safra import process as process_safra
-from .infinitepay import process as process_infinitepay
-from .efi1 import process as process_efi1
-from .efi2 import process as process_efi2
-from .mercadopago import process as process_mercadopago
-
-BANK_PROCESSORS = {
-    "Sicoob1": process_sicoob,
-    "Sicoob2": process_sicoob2,
-    "Sicoob3": process_sicoob3,
-    "Itaú": process_itau,
-    "Itaú2": process_itau2,
-    "Itaú3": process_itau3,
-    "Caixa": process_caixa,
-    "Banco Inter": process_inter,
-    "Nubank": process_nubank,
-    "Bradesco": process_bradesco,
-    "Santander1": process_santander1,
-    "Santander2": process_santander2,
-    "Sicredi": process_sicredi,
-    "PagBank": process_pagbank,
-    "Stone": process_stone,
-    "Banco do Brasil1": process_bancobrasil1,
-    "Banco do Brasil2": process_bancobrasil2,
-    "iFood": process_ifood,
-    "Asaas": process_asaas,
-    "Cora": process_cora,
-    "Safra": process_safra,
-    "InfinitePay": process_infinitepay,
-    "Efi1": process_efi1,
-    "Efi2": process_efi2,
-    "Mercado Pago": process_mercadopago
+from . import (
+    sicoob, sicoob2, sicoob3, itau, itau2, itau3, caixa, inter, nubank, bradesco,
+    santander1, santander2, sicredi, pagbank, stone, bancobrasil1, bancobrasil2,
+    ifood, asaas, cora, safra, infinitepay, efi1, efi2, mercadopago
+)
+
+BANK_MODULES = {
+    "Sicoob1": sicoob,
+    "Sicoob2": sicoob2,
+    "Sicoob3": sicoob3,
+    "Itaú": itau,
+    "Itaú2": itau2,
+    "Itaú3": itau3,
+    "Caixa": caixa,
+    "Banco Inter": inter,
+    "Nubank": nubank,
+    "Bradesco": bradesco,
+    "Santander1": santander1,
+    "Santander2": santander2,
+    "Sicredi": sicredi,
+    "PagBank": pagbank,
+    "Stone": stone,
+    "Banco do Brasil1": bancobrasil1,
+    "Banco do Brasil2": bancobrasil2,
+    "iFood": ifood,
+    "Asaas": asaas,
+    "Cora": cora,
+    "Safra": safra,
+    "InfinitePay": infinitepay,
+    "Efi1": efi1,
+    "Efi2": efi2,
+    "Mercado Pago": mercadopago
 }
 
+BANK_PROCESSORS = {bank: module.process for bank, module in BANK_MODULES.items()}
+
+# Variantes de layout de um mesmo banco, que a identificação às vezes confunde entre si
+FAMILIAS = [
+    ["Itaú", "Itaú2", "Itaú3"],
+    ["Sicoob1", "Sicoob2", "Sicoob3"],
+    ["Banco do Brasil1", "Banco do Brasil2"],
+    ["Efi1", "Efi2"],
+    ["Santander1", "Santander2"],
+]
+
+# Requisitos de extração assumidos quando um módulo não declara EXTRACAO:
+# backend ("fitz" ou "pdfplumber"), opções repassadas à extração de texto da página
+# (ex.: {"flags": ..., "sort": True} no PyMuPDF), se o parser precisa das palavras ou blocos com coordenadas
+# e se cabeçalhos/rodapés repetidos nas páginas devem ser removidos antes do parser
+# (True ou um dicionário de opções de auxiliares.moldura.remover_moldura).
+EXTRACAO_PADRAO = {"backend": "pdfplumber", "opcoes": {}, "palavras": False, "blocos": False, "moldura": False}
+
 def get_processor(bank):
-    
+
     processor = BANK_PROCESSORS.get(bank)
     if not processor:
         raise ValueError(f"Banco não suportado: {bank}")
-    return processor
\ No newline at end of file
+    return processor
+
+def get_extracao(bank):
+    """Retorna os requisitos de extração declarados pelo módulo do banco, completados com os valores padrão."""
+    module = BANK_MODULES.get(bank)
+    if not module:
+        raise ValueError(f"Banco não suportado: {bank}")
+    return {**EXTRACAO_PADRAO, **getattr(module, "EXTRACAO", {})}
+
+def get_variantes(bank):
+    """Retorna as outras variantes da família do banco (lista vazia se o banco não tiver variantes)."""
+    for familia in FAMILIAS:
+        if bank in familia:
+            return [variante for variante in familia if variante != bank]
+    return []
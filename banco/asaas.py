@@ -1,5 +1,9 @@
 import re
-from auxiliares.utils import process_transactions 
+from auxiliares.utils import process_transactions
+from auxiliares.dinheiro import Dinheiro
+
+# Requisitos de extração do texto que este parser espera
+EXTRACAO = {"backend": "pdfplumber"}
 
 def preprocess_text(text):
     """
@@ -58,16 +62,13 @@ def preprocess_text(text):
             valor_match = value_pattern.search(transacao_unificada)
             valor_str = valor_match.group(0)
             tipo = 'D' if 'R$ -' in valor_str else 'C'
-            valor = valor_str.replace('R$', '').replace('-', '').strip()
-            if valor.endswith(",00"):
-                valor = valor[:-3]
-            elif valor.endswith("0"):
-                valor = valor[:-1]
+            # Valor sem ",00" nem zero final nos centavos (ex.: 1.234,50 -> 1.234,5)
+            valor = Dinheiro.ler(valor_str, "sem_zero_final")
             
             transacao_sem_data = ' '.join(partes[1:])
             descricao = transacao_sem_data.replace(valor_str, '').strip()
             
-            if descricao and valor:
+            if descricao:
                 transactions.append({
                     "Data": data,
                     "Descrição": descricao,
@@ -1,5 +1,9 @@
 import re
-from auxiliares.utils import process_transactions 
+from auxiliares.utils import process_transactions
+from auxiliares.dinheiro import Dinheiro
+
+# Requisitos de extração do texto que este parser espera
+EXTRACAO = {"backend": "fitz"}
 
 def preprocess_text(text):
     """
@@ -11,6 +15,7 @@ def preprocess_text(text):
     # Dividir o texto em transações com base no padrão de data (DD/MM/YYYY)
     date_pattern = re.compile(r'\d{2}/\d{2}/\d{4}')
     transactions = []
+    text = str(text)  # re exige str (o texto pode chegar como TextoPaginado)
 
     # Dividir o texto em partes com base nas datas
     parts = date_pattern.split(text)
@@ -34,8 +39,9 @@ def preprocess_text(text):
         tipo = None
         idx_valor = -1
         for i, parte in enumerate(partes):
-            if value_pattern.match(parte):
-                valor = parte
+            valor_match = value_pattern.match(parte)
+            if valor_match:
+                valor = Dinheiro.ler(valor_match.group(0))
                 idx_valor = i
                 if i + 1 < len(partes):
                     tipo = partes[i + 1]
@@ -56,10 +62,6 @@ def preprocess_text(text):
         desc_final = ' '.join(partes[idx_fim:]).strip()
         descricao = f"{desc_inicial} {desc_final}".strip() if desc_final else desc_inicial
         
-        # Ajustar valor: remover ",00" se for um número inteiro
-        if valor.endswith(",00"):
-            valor = valor[:-3]
-        
         transactions.append({
             "Data": date,
             "Descrição": descricao,
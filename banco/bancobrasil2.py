@@ -1,5 +1,9 @@
 import re
-from auxiliares.utils import process_transactions  
+from auxiliares.utils import process_transactions
+from auxiliares.dinheiro import Dinheiro
+
+# Requisitos de extração do texto que este parser espera
+EXTRACAO = {"backend": "pdfplumber"}
 
 def preprocess_text(text):
     """
@@ -100,8 +104,10 @@ def extrair_dicionario(transacao):
     tipo = None
     idx_valor = -1
     for i, parte in enumerate(partes):
-        if value_pattern.match(parte):
-            valor = parte
+        valor_match = value_pattern.match(parte)
+        if valor_match:
+            # Valor sem ",00" para inteiros e sem zero à direita nos centavos (ex.: 123,30 -> 123,3)
+            valor = Dinheiro.ler(valor_match.group(0), "sem_zero_final")
             idx_valor = i
             if i + 1 < len(partes):
                 tipo = partes[i + 1]
@@ -122,12 +128,6 @@ def extrair_dicionario(transacao):
     desc_final = ' '.join(partes[idx_valor + 2:]).strip() if idx_valor + 2 < len(partes) else ''
     descricao = f"{desc_inicial} {desc_final}".strip() if desc_final else desc_inicial
     
-    # Ajustar valor: remover ",00" para inteiros e zero à direita para centavos (ex.: 123,30 -> 123,3)
-    if valor.endswith(",00"):
-        valor = valor[:-3]
-    elif valor.endswith("0"):
-        valor = valor[:-1]
-    
     return {
         "Data": data,
         "Descrição": descricao,
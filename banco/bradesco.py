@@ -1,139 +1,146 @@
 import re
-from auxiliares.utils import process_transactions 
+from auxiliares.tokens import Tokenizador, com_proximo
+from auxiliares.linhas import MontadorRegistros
+from auxiliares.dinheiro import Dinheiro
+from auxiliares.lote import LoteTransacoes
+from auxiliares.utils import process_transactions
+
+# Requisitos de extração do texto que este parser espera
+EXTRACAO = {"backend": "fitz"}
+
+TOKENIZADOR = Tokenizador(
+    # Informações de empresa/CNPJ no início da linha (ex.: "NOME DA EMPRESA | CNPJ: ...")
+    limpar=r'^.*?CNPJ:\s*\d{2}\.\d{3}\.\d{3}/\d{4}-\d{2}\s*\|?\s*',
+    # Cabeçalhos/rodapés genéricos
+    ruido=[
+        r'CNPJ:\s*\d{2}\.\d{3}\.\d{3}/\d{4}-\d{2}',  # CNPJ
+        r'AGENCIA:\s*\d{4}-\d',                       # Agência
+        r'CONTA:\s*\d+-\d',                           # Conta
+        r'\d{2}/\d{2}/\d{4}\s*-\s*\d{2}/\d{2}/\d{4}' # Período (ex.: 01/04/2025 - 30/04/2025)
+    ],
+    marcadores={
+        # Palavras-chave de linhas irrelevantes
+        "ignorar": r'Folha|Nome do usuário|Data da operação|Saldos Invest Fácil|Os dados acima',
+        "extrato_mensal": r'Extrato Mensal',
+        "total": r'^Total',
+        "saldo_anterior": r'SALDO ANTERIOR',
+    },
+)
+
+_DOCUMENTO = re.compile(r'^\d+$')
+
+def _valor_monetario(token):
+    """Linha composta apenas por um valor (crédito, débito ou saldo), como o Bradesco imprime."""
+    return token.so_valor and token.sinal != "+" and token.cd is None
+
+def _montar_transacao(transacao, data):
+    descricao = f"{transacao[0]} {transacao[1]}"  # Combinar documento e descrição
+    try:
+        valor = Dinheiro.ler(transacao[2])
+    except ValueError:
+        return None  # Texto de descrição grudado na posição do valor: registro mal formado
+    tipo = "D" if transacao[2].startswith("-") else "C"  # Determinar tipo (C ou D)
+    return {
+        "Data": data,
+        "Descrição": descricao,
+        "Valor": valor,
+        "Tipo": tipo
+    }
 
 def preprocess_text(text):
     """
     Pré-processa o texto do extrato do Bradesco para dividir transações, ignorando cabeçalho e rodapé.
     Combina número do documento e descrição em uma única coluna Descrição.
     Mantém valores no formato brasileiro (ex.: 1.012,29).
+    Retorna um LoteTransacoes com o saldo anterior e o saldo de cada lançamento, para a conciliação.
     """
-    lines = [line.strip() for line in text.splitlines() if line.strip()]
-    
-    # Palavras-chave para filtrar linhas irrelevantes
-    palavras_ignorar = [
-        'Folha', 'Nome do usuário',
-        'Data da operação', 'Saldos Invest Fácil', 'Os dados acima'
-    ]
-    
-    # Padrões regex para identificar cabeçalhos/rodapés genéricos
-    padroes_ignorar = [
-        r'CNPJ:\s*\d{2}\.\d{3}\.\d{3}/\d{4}-\d{2}',  # CNPJ
-        r'AGENCIA:\s*\d{4}-\d',                       # Agência
-        r'CONTA:\s*\d+-\d',                           # Conta
-        r'\d{2}/\d{2}/\d{4}\s*-\s*\d{2}/\d{2}/\d{4}' # Período (ex.: 01/04/2025 - 30/04/2025)
-    ]
-    
-    # Padrão para limpar informações de empresa/CNPJ no início da linha
-    padrao_limpeza_cabecalho = r'^.*?CNPJ:\s*\d{2}\.\d{3}\.\d{3}/\d{4}-\d{2}\s*\|?\s*'
-    
-    # Padrão para valores monetários
-    padrao_valor_monetario = r'^-?\d+\.\d{3},\d{2}$|^-?\d+,\d{2}$'
-    
-    transactions = []
-    i = 0
     found_saldo_anterior = False
-    current_transacao = []
     current_data = None
+    pular = 0
+    saldos = []  # (transações já lidas, data, saldo, momento)
     
-    while i < len(lines):
-        linha = lines[i].strip()
+    def _finalizar(transacao):
+        # Uma transação completa tem descrição, documento, crédito/débito e saldo
+        if len(transacao) < 4 or not current_data:
+            return None
+        registro = _montar_transacao(transacao, current_data)
+        if registro is not None:
+            try:
+                # O saldo inclui esta transação, que o montador acrescenta logo após o retorno
+                saldos.append((len(montador.registros) + 1, current_data, Dinheiro.ler(transacao[3]), "dia"))
+            except ValueError:
+                pass
+        return registro
+    
+    montador = MontadorRegistros(_finalizar)
+    
+    for token, proximo in com_proximo(TOKENIZADOR.tokens(text)):
+        if pular:
+            pular -= 1
+            continue
         
-        # Ignorar linhas vazias ou que contenham palavras-chave irrelevantes
-        if not linha or any(palavra in linha for palavra in palavras_ignorar):
-            i += 1
+        # Ignorar linhas que contenham palavras-chave irrelevantes
+        if "ignorar" in token.marcadores:
             continue
         
         # Regra especial: se encontrar "Extrato Mensal", pular a linha atual e a próxima
-        if 'Extrato Mensal' in linha:
-            i += 2
+        if "extrato_mensal" in token.marcadores:
+            pular = 1
             continue
         
         # Verificar se a linha contém "Total" seguido de um valor monetário
-        if linha.startswith('Total') and i + 1 < len(lines):
-            proxima_linha = lines[i + 1].strip()
-            if re.match(padrao_valor_monetario, proxima_linha):
-                break  # Parar, excluindo "Total" e tudo abaixo
+        if "total" in token.marcadores and proximo is not None and _valor_monetario(proximo):
+            break  # Parar, excluindo "Total" e tudo abaixo
         
-        # Limpar informações de cabeçalho (ex.: "NOME DA EMPRESA | CNPJ: ...")
-        linha_limpa = re.sub(padrao_limpeza_cabecalho, '', linha).strip()
-        if not linha_limpa or any(re.search(padrao, linha_limpa) for padrao in padroes_ignorar):
-            i += 1
+        # Linhas de cabeçalho (ou vazias depois da limpeza do prefixo de empresa/CNPJ)
+        if token.ruido:
             continue
         
         # Verificar se a linha contém "SALDO ANTERIOR"
-        if "SALDO ANTERIOR" in linha:
+        if "saldo_anterior" in token.marcadores:
+            if proximo is not None and _valor_monetario(proximo):
+                momento = "dia" if found_saldo_anterior else "anterior"
+                saldos.append((len(montador.registros), current_data, proximo.valor, momento))
             found_saldo_anterior = True
-            i += 2  # Pular "SALDO ANTERIOR" e a linha seguinte (valor)
+            pular = 1  # Pular "SALDO ANTERIOR" e a linha seguinte (valor)
             continue
         
         # Após encontrar "SALDO ANTERIOR", processar as linhas
         if found_saldo_anterior:
+            linha_limpa = token.texto
             # Verificar se a linha é uma data (formato DD/MM/YYYY)
-            if re.match(r'\d{2}/\d{2}/\d{4}', linha_limpa):
-                # Se já existe uma transação acumulada, formatá-la e adicionar
-                if current_transacao and len(current_transacao) >= 4:
-                    descricao = f"{current_transacao[0]} {current_transacao[1]}"  # Combinar documento e descrição
-                    valor = current_transacao[2].replace("-", "").strip()  # Remover sinal de menos
-                    if valor.endswith(",00"):
-                        valor = valor[:-3]  # Remover ",00" se for inteiro
-                    tipo = "D" if current_transacao[2].startswith("-") else "C"  # Determinar tipo (C ou D)
-                    transactions.append({
-                        "Data": current_data,
-                        "Descrição": descricao,
-                        "Valor": valor,
-                        "Tipo": tipo
-                    })
-                    current_transacao = []
+            if token.formato_data == "dd/mm/aaaa":
+                # Se já existe uma transação completa acumulada, formatá-la e adicionar
+                if len(montador) >= 4:
+                    montador.encerrar()
                 current_data = linha_limpa
             elif current_data:  # Linhas de transação
                 # Verificar se a linha é um valor numérico (crédito, débito ou saldo)
-                if re.match(padrao_valor_monetario, linha_limpa):
-                    current_transacao.append(linha_limpa)
+                if _valor_monetario(token):
+                    montador.adicionar(linha_limpa)
                     # Se já temos descrição, documento, crédito/débito e saldo, processar
-                    if len(current_transacao) >= 4:
-                        descricao = f"{current_transacao[0]} {current_transacao[1]}"  # Combinar documento e descrição
-                        valor = current_transacao[2].replace("-", "").strip()  # Remover sinal de menos
-                        if valor.endswith(",00"):
-                            valor = valor[:-3]  # Remover ",00" se for inteiro
-                        tipo = "D" if current_transacao[2].startswith("-") else "C"  # Determinar tipo (C ou D)
-                        transactions.append({
-                            "Data": current_data,
-                            "Descrição": descricao,
-                            "Valor": valor,
-                            "Tipo": tipo
-                        })
-                        current_transacao = []
+                    if len(montador) >= 4:
+                        montador.encerrar()
                 else:
                     # Tratar número de documento ou descrição
-                    if re.match(r'^\d+$', linha_limpa):  # Se for apenas número (documento)
-                        if len(current_transacao) == 1:  # Já temos uma descrição
-                            current_transacao.append(linha_limpa)  # Adicionar como documento
+                    if _DOCUMENTO.match(linha_limpa):  # Se for apenas número (documento)
+                        if len(montador) == 1:  # Já temos uma descrição
+                            montador.adicionar(linha_limpa)  # Adicionar como documento
                         else:
-                            current_transacao = [linha_limpa]  # Iniciar nova transação com documento
+                            montador.descartar()  # Iniciar nova transação com documento
+                            montador.adicionar(linha_limpa)
                     else:
                         # Se for uma descrição, concatenar com a anterior, se houver
-                        if current_transacao and not re.match(r'^\d+$', current_transacao[-1]):
-                            current_transacao[-1] = current_transacao[-1] + ' ' + linha_limpa
+                        if montador and not _DOCUMENTO.match(montador.linhas[-1]):
+                            montador.linhas[-1] = montador.linhas[-1] + ' ' + linha_limpa
                         else:
-                            current_transacao.append(linha_limpa)
-        
-        i += 1
+                            montador.adicionar(linha_limpa)
     
     # Adicionar a última transação, se houver
-    if current_transacao and len(current_transacao) >= 4 and current_data:
-        descricao = f"{current_transacao[0]} {current_transacao[1]}"  # Combinar documento e descrição
-        valor = current_transacao[2].replace("-", "").strip()  # Remover sinal de menos
-        if valor.endswith(",00"):
-            valor = valor[:-3]  # Remover ",00" se for inteiro
-        tipo = "D" if current_transacao[2].startswith("-") else "C"  # Determinar tipo (C ou D)
-        transactions.append({
-            "Data": current_data,
-            "Descrição": descricao,
-            "Valor": valor,
-            "Tipo": tipo
-        })
-    
-    return transactions
+    lote = LoteTransacoes.de_transacoes(montador.terminar())
+    for posicao, data, saldo, momento in saldos:
+        lote.registrar_saldo(data, saldo, momento, posicao)
+    return lote
 
 def extract_transactions(transactions):
     """
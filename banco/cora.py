@@ -1,5 +1,9 @@
 import re
-from auxiliares.utils import process_transactions  
+from auxiliares.utils import process_transactions
+from auxiliares.dinheiro import Dinheiro
+
+# Requisitos de extração do texto que este parser espera
+EXTRACAO = {"backend": "pdfplumber"}
 
 def preprocess_text(text):
     """
@@ -42,12 +46,8 @@ def preprocess_text(text):
             valor_str = valor_match.group(0)
             # Determinar tipo
             tipo = 'C' if '+ R$' in valor_str else 'D'
-            # Formatando valor
-            valor = valor_str.replace('+ R$', '').replace('- R$', '').strip()
-            if valor.endswith(",00"):
-                valor = valor[:-3]
-            elif valor.endswith("0"):
-                valor = valor[:-1]
+            # Valor sem ",00" nem zero final nos centavos (ex.: 1.234,50 -> 1.234,5)
+            valor = Dinheiro.ler(valor_str, "sem_zero_final")
             # Extrair descrição
             descricao = linha.replace(valor_str, '').strip()
             # Adicionar transação
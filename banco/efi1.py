@@ -1,5 +1,10 @@
 import re
 from auxiliares.utils import process_transactions
+from auxiliares.dinheiro import Dinheiro
+
+# Requisitos de extração do texto que este parser espera
+# Cabeçalhos e rodapés repetidos saem antes do parser; o cabeçalho da primeira página é mantido
+EXTRACAO = {"backend": "fitz", "moldura": {"manter_cabecalho_inicial": True}}
 
 def preprocess_text(text):
     # Divide o texto em linhas
@@ -47,10 +52,7 @@ def preprocess_text(text):
         # Se for um valor, finaliza a transação
         valor_match = valor_pattern.match(linha)
         if valor_match:
-            valor = valor_match.group(1)
-            valor_formatado = valor.replace('-', '').replace('+', '')
-            if valor_formatado.endswith(",00"):
-                valor_formatado = valor_formatado[:-3]
+            valor = Dinheiro.ler(valor_match.group(1))
                 
             # Verifica se transacao_atual e data_atual existem antes de processar
             if transacao_atual and data_atual:
@@ -64,7 +66,7 @@ def preprocess_text(text):
                 transacoes.append({
                     "Data": data_atual,
                     "Descrição": descricao,
-                    "Valor": valor_formatado,
+                    "Valor": valor,
                     "Tipo": tipo
                 })
             transacao_atual = []
@@ -1,5 +1,9 @@
 import re
 from auxiliares.utils import process_transactions
+from auxiliares.dinheiro import Dinheiro
+
+# Requisitos de extração do texto que este parser espera
+EXTRACAO = {"backend": "fitz"}
 
 def preprocess_text(text):
     # Divide o texto em linhas
@@ -50,19 +54,14 @@ def preprocess_text(text):
         if valor_match:
             valor = valor_match.group(1)
             tipo = 'D' if '-' in valor else 'C'
-            valor_formatado = valor.replace('-', '').replace('+', '')
             
             if transacao_atual and data_atual:
                 descricao = ' '.join(transacao_atual).strip()
                 
-                # Remove ",00" se for um valor inteiro
-                if valor_formatado.endswith(",00"):
-                    valor_formatado = valor_formatado[:-3]
-                
                 transacoes.append({
                     "Data": data_atual,
                     "Descrição": descricao,
-                    "Valor": valor_formatado,
+                    "Valor": Dinheiro.ler(valor),
                     "Tipo": tipo
                 })
             
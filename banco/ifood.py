@@ -1,40 +1,84 @@
 import re
+from auxiliares.tokens import Tokenizador
+from auxiliares.linhas import MontadorRegistros
+from auxiliares.dinheiro import Dinheiro
 from auxiliares.utils import process_transactions
 
+# Requisitos de extração do texto que este parser espera
+EXTRACAO = {"backend": "pdfplumber"}
+
+TOKENIZADOR = Tokenizador(
+    normalizar=[
+        # Corrigir tabulações nos valores (ex.: 1.055\t00 -> 1.055,00)
+        (r'(\d)\t(\d)', r'\1,\2'),
+        # Normalizar espaços
+        (r'\s+', ' '),
+    ],
+    # Cabeçalhos, rodapés, saldos e linhas com "Conta" seguido de número com hífen
+    ruido=[re.escape(phrase) for phrase in [
+        "Extrato da Conta Digital iFood",
+        "Solicitado em",
+        "CNPJ",
+        "Período selecionado",
+        "Saldo disponível",
+        "IFOOD.COM AGENCIA",
+        "Em caso de dúvida",
+        "Saldo do dia",
+        "segunda a sexta",
+    ]] + [r'Conta\s+\d+-\d'],
+    marcadores={"inicio": r"Data Movimentação Descrição da movimentação Valor"},
+)
+
+_DATA = re.compile(r'^\d{2}/\d{2}/\d{4}')  # DD/MM/YYYY
+_VALOR = re.compile(r'(-?R\$\s*\d{1,3}(?:\.\d{3})*,\d{2})')  # R$ ou -R$ seguido de valor
+
+def _montar_transacao(linhas):
+    """Monta a transação a partir das linhas acumuladas (a primeira começa pela data)."""
+    transacao_unificada = ' '.join(linhas)
+    
+    # Extrair data
+    partes = transacao_unificada.split()
+    if not partes or not _DATA.match(partes[0]):
+        return None
+    data = partes[0]
+    
+    # Extrair valor
+    valor_match = _VALOR.search(transacao_unificada)
+    if not valor_match:
+        return None
+    valor_str = valor_match.group(1)
+    
+    # Determinar tipo
+    tipo = 'D' if valor_str.startswith('-R$') else 'C'
+    
+    # Valor sem ",00" nem zero final nos centavos (ex.: 1.234,50 -> 1.234,5)
+    valor = Dinheiro.ler(valor_str, "sem_zero_final")
+    
+    # Extrair descrição
+    transacao_sem_data = ' '.join(partes[1:])
+    descricao = transacao_sem_data.replace(valor_str, '').strip()
+    
+    if not descricao:
+        return None
+    return {
+        "Data": data,
+        "Descrição": descricao,
+        "Valor": valor,
+        "Tipo": tipo
+    }
+
 def preprocess_text(text):
     """
     Pré-processa o texto do extrato iFood, extraindo e formatando todas as transações.
     Retorna uma lista de dicionários com Data, Descrição, Valor e Tipo.
     Ignora cabeçalhos, rodapés, saldos e linhas mal formatadas.
     """
-    # Dividir o texto em linhas
-    linhas = text.splitlines()
-    transactions = []
-    transacao_atual = []
+    montador = MontadorRegistros(_montar_transacao)
     encontrou_marcador_inicio = False
-    ignorar_ate_data = False
-    date_pattern = re.compile(r'^\d{2}/\d{2}/\d{4}')  # DD/MM/YYYY
-    value_pattern = re.compile(r'(-?R\$\s*\d{1,3}(?:\.\d{3})*,\d{2})')  # R$ ou -R$ seguido de valor
     
-    for linha in linhas:
-        linha = linha.strip()
-        if not linha:
-            continue
-        
-        # Corrigir tabulações nos valores (ex.: 1.055\t00 -> 1.055,00)
-        linha = re.sub(r'(\d)\t(\d)', r'\1,\2', linha)
-        # Normalizar espaços
-        linha = re.sub(r'\s+', ' ', linha).strip()
-        
-        # Verificar se está ignorando até encontrar uma data
-        if ignorar_ate_data:
-            if date_pattern.match(linha):
-                ignorar_ate_data = False
-            else:
-                continue
-        
+    for token in TOKENIZADOR.tokens(text):
         # Identificar a linha "Data Movimentação Descrição da movimentação Valor"
-        if "Data Movimentação Descrição da movimentação Valor" in linha:
+        if "inicio" in token.marcadores:
             encontrou_marcador_inicio = True
             continue
         
@@ -42,107 +86,17 @@ def preprocess_text(text):
         if not encontrou_marcador_inicio:
             continue
         
-        # Ignorar cabeçalhos, rodapés, saldos e linhas com "Conta" seguido de número com hífen
-        if any(phrase in linha for phrase in [
-            "Extrato da Conta Digital iFood",
-            "Solicitado em",
-            "CNPJ",
-            "Período selecionado",
-            "Saldo disponível",
-            "IFOOD.COM AGENCIA",
-            "Em caso de dúvida",
-            "Saldo do dia",
-            "segunda a sexta",
-        ]) or re.search(r'Conta\s+\d+-\d', linha):
+        # Ignorar cabeçalhos, rodapés e saldos
+        if token.ruido:
             continue
             
-        # Verificar se a linha começa com uma data
-        if date_pattern.match(linha):
-            # Processar a transação acumulada, se existir
-            if transacao_atual:
-                transacao_unificada = ' '.join(transacao_atual)
-                
-                # Extrair data
-                partes = transacao_unificada.split()
-                if not partes or not date_pattern.match(partes[0]):
-                    transacao_atual = [linha]
-                    continue
-                data = partes[0]
-                
-                # Extrair valor
-                valor_match = value_pattern.search(transacao_unificada)
-                if not valor_match:
-                    transacao_atual = [linha]
-                    continue
-                valor_str = valor_match.group(1)
-                
-                # Determinar tipo
-                tipo = 'D' if valor_str.startswith('-R$') else 'C'
-                
-                # Formatando valor
-                valor = valor_str.replace('R$', '').replace('-', '').strip()
-                if valor.endswith(",00"):
-                    valor = valor[:-3]
-                elif valor.endswith("0"):
-                    valor = valor[:-1]
-                
-                # Extrair descrição
-                transacao_sem_data = ' '.join(partes[1:])
-                descricao = transacao_sem_data.replace(valor_str, '').strip()
-                
-                # Criar dicionário da transação
-                if descricao and valor:
-                    transactions.append({
-                        "Data": data,
-                        "Descrição": descricao,
-                        "Valor": valor,
-                        "Tipo": tipo
-                    })
-            
-            transacao_atual = [linha]
+        # Uma linha que começa com data inicia uma nova transação
+        if token.formato_data == "dd/mm/aaaa":
+            montador.iniciar(token.linha)
         else:
-            transacao_atual.append(linha)
+            montador.adicionar(token.linha)
     
-    # Processar a última transação
-    if transacao_atual:
-        transacao_unificada = ' '.join(transacao_atual)
-        
-        # Extrair data
-        partes = transacao_unificada.split()
-        if not partes or not date_pattern.match(partes[0]):
-            return transactions
-        data = partes[0]
-        
-        # Extrair valor
-        valor_match = value_pattern.search(transacao_unificada)
-        if not valor_match:
-            return transactions
-        valor_str = valor_match.group(1)
-        
-        # Determinar tipo
-        tipo = 'D' if valor_str.startswith('-R$') else 'C'
-        
-        # Formatando valor
-        valor = valor_str.replace('R$', '').replace('-', '').strip()
-        if valor.endswith(",00"):
-            valor = valor[:-3]
-        elif valor.endswith("0"):
-            valor = valor[:-1]
-        
-        # Extrair descrição
-        transacao_sem_data = ' '.join(partes[1:])
-        descricao = transacao_sem_data.replace(valor_str, '').strip()
-        
-        # Criar dicionário da transação
-        if descricao and valor:
-            transactions.append({
-                "Data": data,
-                "Descrição": descricao,
-                "Valor": valor,
-                "Tipo": tipo
-            })
-    
-    return transactions
+    return montador.terminar()
 
 def extract_transactions(transactions):
     """
@@ -1,66 +1,33 @@
-import pdfplumber
-import re
+from auxiliares.layout import compilar_layout
 from auxiliares.utils import process_transactions
 
+# Requisitos de extração do texto que este parser espera
+EXTRACAO = {"backend": "pdfplumber"}
+
+# A linha "30/04/2025 Saldo do dia 158,07" define a data das transações seguintes,
+# cada uma em uma linha terminada pelo valor com sinal (ex.: "Pix De Fulano +99,75")
+LAYOUT = {
+    "ignorar": [
+        r"^Relatório de movimentações$",
+        r"^Data Tipo de transação Detalhe Valor \(R\$\) Saldo \(R\$\)$",
+        r"^Período de",
+        r"^Nossa equipe de atendimento",
+    ],
+    "data": r"^(?P<dia>\d{2})/(?P<mes>\d{2})/(?P<ano>\d{4})\s+Saldo do dia\s+[\d,]+$",
+    "registro": "data_corrente",
+    "valor": r"\s+([+-](?:\d{1,3}(?:\.\d{3})+|\d+),\d{2})$",
+    "tipo": "sinal",
+}
+
+_processar = compilar_layout(LAYOUT)
+
 def preprocess_text(text):
     """
-    Pré-processa o texto do extrato da Caixa para dividir transações, ignorando cabeçalho e rodapé.
-    Combina NR. DOC. e HISTÓRICO em uma única coluna Descrição.
+    Pré-processa o texto do extrato da InfinitePay para dividir transações, ignorando cabeçalho e rodapé.
+    Cada transação recebe a data da última linha de saldo do dia.
     Mantém valores no formato brasileiro (ex.: 1.012,29).
     """
-    lines = [line.strip() for line in text.splitlines() if line.strip()]
-    
-    # Lista de linhas a serem removidas
-    linhas_a_remover = [
-        "Relatório de movimentações",
-        "Data Tipo de transação Detalhe Valor (R$) Saldo (R$)",
-    ]
-    
-    # Regex para identificar linhas com data e saldo (ex.: "30/04/2025 Saldo do dia 158,07")
-    data_saldo_pattern = re.compile(r'^(\d{2}/\d{2}/\d{4})\s+Saldo do dia\s+[\d,]+$')
-    
-    # Regex para capturar descrição e valor da transação (ex.: "Pix De Implantare Odontologia Especializada Ltda +99,75")
-    transacao_pattern = re.compile(r'^(.*?)\s+([+-][\d,.]+)$')
-    
-    transactions = []
-    data_atual = None
-    
-    for line in lines:
-        # Ignora linhas vazias ou na lista de exclusão
-        if not line.strip() or line in linhas_a_remover or line.startswith("Período de") or line.startswith("Nossa equipe de atendimento"):
-            continue
-        
-        # Verifica se a linha contém uma data e saldo
-        match_data_saldo = data_saldo_pattern.match(line)
-        if match_data_saldo:
-            data_atual = match_data_saldo.group(1)  # Captura a data (ex.: "30/04/2025")
-            continue  # Não inclui a linha de saldo
-        
-        # Verifica se a linha é uma transação válida
-        match_transacao = transacao_pattern.match(line)
-        if match_transacao and data_atual:
-            descricao = match_transacao.group(1).strip()  # Captura a descrição
-            valor = match_transacao.group(2)  # Captura o valor com sinal
-            # Determina o tipo (C para positivo, D para negativo)
-            tipo = 'C' if valor.startswith('+') else 'D'
-            # Remove o sinal do valor
-            valor_sem_sinal = valor[1:]  # Remove o '+' ou '-'
-            # Remove ",00" se for um número inteiro
-            if valor_sem_sinal.endswith(",00"):
-                valor_sem_sinal = valor_sem_sinal[:-3]
-            
-            # Combina NR. DOC. e HISTÓRICO em Descrição (NR. DOC. é opcional)
-            # Como não há NR. DOC. explícito no exemplo, usamos a descrição inteira
-            description = descricao
-            
-            transactions.append({
-                "Data": data_atual,
-                "Descrição": description,
-                "Valor": valor_sem_sinal,
-                "Tipo": tipo
-            })
-    
-    return transactions
+    return _processar(text)
 
 def extract_transactions(transactions):
     # Extrai os dados das transações (usado para compatibilidade com a estrutura).
@@ -1,5 +1,9 @@
 import re
-from auxiliares.utils import process_transactions 
+from auxiliares.utils import process_transactions
+from auxiliares.dinheiro import Dinheiro
+
+# Requisitos de extração do texto que este parser espera
+EXTRACAO = {"backend": "pdfplumber"}
  
 def preprocess_text(text):
     """
@@ -36,11 +40,7 @@ def preprocess_text(text):
         if value_match and current_date:
             value = value_match.group(1).strip()
             tipo = "D" if "-" in value else "C"
-            valor = value.replace("-", "").replace("R$", "").replace(" ", "").strip()
-            
-            # Ajustar valor: remover ",00" se for um número inteiro
-            if valor.endswith(",00"):
-                valor = valor[:-3]
+            valor = Dinheiro.ler(value)
             
             # Extrair descrição (remover ícones e valor)
             description = re.sub(r"[]", "", line).replace(value, "").strip()
@@ -1,7 +1,116 @@
 import re
-from auxiliares.utils import process_transactions  
+from auxiliares.colunas import linhas_do_documento, texto_da_linha, limites_pelo_cabecalho, ler_colunas
+from auxiliares.utils import process_transactions
+from auxiliares.dinheiro import Dinheiro
+from auxiliares.lote import LoteTransacoes
+
+# Requisitos de extração do texto que este parser espera.
+# As palavras com coordenadas permitem ler a tabela pelas colunas do cabeçalho, cujos títulos estão em "colunas".
+EXTRACAO = {
+    "backend": "pdfplumber",
+    "palavras": True,
+    "colunas": ["data", "descrição", "entradas", "saídas", "saldo"],
+}
 
 def preprocess_text(text):
+    """
+    Pré-processa o extrato do Itaú3 (AM AUTO PECAS ACESS LTDA ME).
+    Quando as palavras com coordenadas estão disponíveis, lê a tabela pelas colunas;
+    se não estiverem (ou a leitura por colunas não encontrar transações), usa o texto corrido.
+    """
+    if getattr(text, "palavras", None):
+        transactions = _preprocess_colunas(text)
+        if transactions:
+            return transactions
+    return _preprocess_linhas(text)
+
+def _preprocess_colunas(text):
+    """
+    Lê a tabela de movimentações pelas colunas derivadas da linha de cabeçalho, em uma única passada.
+    O tipo vem da coluna em que o valor está (entradas = C, saídas = D). Os valores da coluna de saldo
+    (saldo anterior, saldos do dia e saldo final) são guardados no LoteTransacoes retornado, para a conciliação.
+    """
+    year_pattern = re.compile(r"extrato mensal.*?(\d{4})\s+\d{3}\|\d{3}", re.IGNORECASE)
+    header_pattern = re.compile(r"data\s+descrição\s+entradas\s+R\$\s+saídas\s+R\$\s+saldo\s+R\$", re.IGNORECASE)
+    stop_pattern = re.compile(r"Saldo final|Saldo em C/C", re.IGNORECASE)
+    saldo_aplic_pattern = re.compile(r"SALDO APLIC AUT MAIS", re.IGNORECASE)
+    prefix_pattern = re.compile(r"^(.*?=\s*poupança automática\s+)(.*?)$", re.IGNORECASE)
+    date_pattern = re.compile(r"^\d{2}/\d{2}$")
+    monetary_pattern = re.compile(r"\d{1,3}(?:\.\d{3})*(?:,\d{2})")
+    saldo_pattern = re.compile(r"^-?\d{1,3}(?:\.\d{3})*,\d{2}-?$")
+
+    year = None
+    for line in text.splitlines():
+        year_match = year_pattern.search(line)
+        if year_match:
+            year = year_match.group(1)
+            break
+
+    transactions = LoteTransacoes()
+    colunas = None
+    current_date = None
+
+    def _data():
+        return f"{current_date}/{year}" if year and current_date else current_date
+
+    def _registrar_saldo(campos, momento):
+        saldo = campos["saldo"].strip()
+        if saldo_pattern.match(saldo):
+            transactions.registrar_saldo(_data(), Dinheiro.ler(saldo), momento)
+
+    for linha in linhas_do_documento(text.palavras):
+        conteudo = texto_da_linha(linha)
+
+        # Fim da seção de movimentações (saldos finais, notas explicativas ou rodapé)
+        if stop_pattern.search(conteudo) or "Notas explicativas" in conteudo or "242025 B001A" in conteudo:
+            if colunas is not None and stop_pattern.search(conteudo):
+                _registrar_saldo(ler_colunas(linha, colunas), "final")
+            colunas = None
+            continue
+
+        # Cabeçalho da tabela: define as colunas a partir da posição dos títulos
+        if header_pattern.search(conteudo):
+            colunas = limites_pelo_cabecalho(linha, EXTRACAO["colunas"])
+            continue
+
+        if colunas is None or saldo_aplic_pattern.search(conteudo):
+            continue
+
+        campos = ler_colunas(linha, colunas)
+        if date_pattern.match(campos["data"]):
+            current_date = campos["data"]
+        if not current_date:
+            continue
+
+        transacao = _transacao_da_linha(campos, monetary_pattern, prefix_pattern)
+        if transacao:
+            description, value, tipo = transacao
+            transactions.adicionar(_data(), description, value, tipo)
+        # O saldo da linha já inclui a transação dela
+        _registrar_saldo(campos, "anterior" if "SALDO ANTERIOR" in campos["descrição"].upper() else "dia")
+
+    return transactions
+
+def _transacao_da_linha(campos, monetary_pattern, prefix_pattern):
+    """(descrição, valor, tipo) da linha da tabela, ou None se ela não tiver valor ou descrição."""
+    value_match = monetary_pattern.search(campos["entradas"])
+    tipo = "C"
+    if not value_match:
+        value_match = monetary_pattern.search(campos["saídas"])
+        tipo = "D"
+    if not value_match:
+        return None
+
+    description = campos["descrição"].strip()
+    prefix_match = prefix_pattern.search(description)
+    if prefix_match:
+        description = prefix_match.group(2).strip()
+    if not description:
+        return None
+
+    return description, Dinheiro.ler(value_match.group(0)), tipo
+
+def _preprocess_linhas(text):
     """
     Pré-processa o texto do extrato do Itaú3 (AM AUTO PECAS ACESS LTDA ME) para extrair transações.
     Ignora cabeçalho, rodapé, saldos, notas explicativas e totalizadores.
@@ -74,17 +183,13 @@ def preprocess_text(text):
                 # Extrair o primeiro valor monetário
                 value_match = monetary_pattern.search(formatted_line)
                 if value_match:
-                    value = value_match.group(1)
+                    value = Dinheiro.ler(value_match.group(1))
                     # Determinar tipo (C ou D)
                     tipo = "D" if formatted_line.endswith("-") else "C"
                     # Remover o valor e o sufixo "-" da descrição
                     description = re.sub(monetary_pattern, "", line[5:]).replace("-", "").strip()
                     # Remover segundo valor monetário, se presente
                     description = re.sub(monetary_pattern, "", description).strip()
-                    # Ajustar valor: remover ",00" se for número inteiro
-                    if value.endswith(",00"):
-                        value = value[:-3]
-                    
                     # Ignorar descrições vazias
                     if not description:
                         continue
@@ -100,17 +205,13 @@ def preprocess_text(text):
                 # Extrair o primeiro valor monetário
                 value_match = monetary_pattern.search(cleaned_line)
                 if value_match:
-                    value = value_match.group(1)
+                    value = Dinheiro.ler(value_match.group(1))
                     # Determinar tipo (C ou D)
                     tipo = "D" if cleaned_line.endswith("-") else "C"
                     # Remover o valor e o sufixo "-" da descrição
                     description = re.sub(monetary_pattern, "", cleaned_line).replace("-", "").strip()
                     # Remover segundo valor monetário, se presente
                     description = re.sub(monetary_pattern, "", description).strip()
-                    # Ajustar valor: remover ",00" se for número inteiro
-                    if value.endswith(",00"):
-                        value = value[:-3]
-                    
                     # Ignorar descrições vazias
                     if not description:
                         continue
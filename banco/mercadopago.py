@@ -1,6 +1,10 @@
 import fitz  # PyMuPDF
 import re
 from auxiliares.utils import process_transactions
+from auxiliares.dinheiro import Dinheiro
+
+# Requisitos de extração do texto que este parser espera
+EXTRACAO = {"backend": "fitz"}
 
 def preprocess_text(text):
     """
@@ -59,7 +63,7 @@ def preprocess_text(text):
     lista_transacoes = []
     
     # Padrão para identificar valores monetários (R$ seguido de número, com ou sem -)
-    padrao_valor = re.compile(r'R\$ -?[\d,.]+')
+    padrao_valor = re.compile(r'R\$ -?(?:\d{1,3}(?:\.\d{3})+|\d+),\d{2}')
     
     for transacao in transacoes:
         # Divide a transação em partes
@@ -77,11 +81,7 @@ def preprocess_text(text):
         # Determina o tipo (D para débito, C para crédito)
         tipo = 'D' if valor.startswith('R$ -') else 'C'
         
-        # Limpa o valor, removendo R$, - e mantendo formato brasileiro
-        valor_limpo = valor.replace('R$ -', '').replace('R$', '').strip()
-        # Remove ",00" para números inteiros
-        if valor_limpo.endswith(',00'):
-            valor_limpo = valor_limpo[:-3]
+        valor_limpo = Dinheiro.ler(valor)
         
         # A descrição é tudo entre a data e o primeiro valor
         indice_valor = transacao.find(valores[0])
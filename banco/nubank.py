@@ -1,25 +1,23 @@
 import re
 from auxiliares.utils import process_transactions
+from auxiliares.linhas import ler_linhas, dividir, descartar, filtrar
+from auxiliares.dinheiro import Dinheiro
 
-def preprocess_text(text):
-    """
-    Processa o texto completo do extrato extraído do PDF,
-    aplica filtros, extrai data, descrição, valor e tipo da transação.
-    Retorna uma lista de dicionários com as transações.
-    """
+# Requisitos de extração do texto que este parser espera
+EXTRACAO = {"backend": "pdfplumber"}
+
+_DATA_NA_LINHA = re.compile(r'(\d{2} (?:JAN|FEV|MAR|ABR|MAI|JUN|JUL|AGO|SET|OUT|NOV|DEZ) \d{4})', re.IGNORECASE)
+_DATA_LINHA = re.compile(r'^\d{2} (?:JAN|FEV|MAR|ABR|MAI|JUN|JUL|AGO|SET|OUT|NOV|DEZ) \d{4}$', re.IGNORECASE)
+_TEM_VALOR = re.compile(r'\d+[\.,]\d{2}')
+_LINHAS_IGNORADAS = ("saldo do dia", "total de entradas", "crédito em conta", "total de saídas", "total de saidas")
 
-    # --- FILTRAGEM PARA MANTER APENAS MOVIMENTAÇÕES ---
-    linhas = text.splitlines()
-    filtrado = []
+def _movimentacoes(linhas):
+    """Repassa apenas as linhas da seção de movimentações, pulando os rodapés de página."""
     dentro_movimentacoes = False
     ignorar_rodape = False
     contador_rodape = 0
 
     for linha in linhas:
-        linha = linha.strip()
-        if not linha:
-            continue
-
         if linha.startswith("O saldo líquido"):
             break
 
@@ -43,59 +41,29 @@ def preprocess_text(text):
             continue
 
         if dentro_movimentacoes:
-            filtrado.append(linha)
-
-    texto_filtrado = '\n'.join(filtrado)
+            yield linha
 
-    # --- SEPARAR DATA EM LINHA PRÓPRIA ---
-    padrao_data = re.compile(r'(\d{2} (?:JAN|FEV|MAR|ABR|MAI|JUN|JUL|AGO|SET|OUT|NOV|DEZ) \d{4})', re.IGNORECASE)
-    linhas = texto_filtrado.splitlines()
-    resultado = []
-
-    for linha in linhas:
-        linha = linha.strip()
-        if not linha:
-            continue
-        match = padrao_data.search(linha)
-        if match:
-            data = match.group(1)
-            conteudo = linha.replace(data, '').strip()
-            resultado.append(data)
-            if conteudo:
-                resultado.append(conteudo)
-        else:
-            resultado.append(linha)
-    texto_formatado = '\n'.join(resultado)
+def _separar_data(linha):
+    """Coloca a data (ex.: 05 JAN 2024) em uma linha própria, antes do restante do conteúdo."""
+    match = _DATA_NA_LINHA.search(linha)
+    if not match:
+        return (linha,)
+    data = match.group(1)
+    conteudo = linha.replace(data, '').strip()
+    return (data, conteudo) if conteudo else (data,)
 
-    # --- REMOVER LINHAS INDESJADAS ---
-    linhas = texto_formatado.splitlines()
-    resultado = []
-    for linha in linhas:
-        linha = linha.strip()
-        if not linha:
-            continue
-        if linha.lower().startswith("saldo do dia"):
-            continue
-        if linha.lower().startswith("total de entradas"):
-            continue
-        if linha.lower().startswith("crédito em conta"):
-            continue
-        if linha.lower().startswith("total de saídas") or linha.lower().startswith("total de saidas"):
-            continue
-        resultado.append(linha)
-    texto_limpo = '\n'.join(resultado)
-
-    # --- MANTER APENAS DATAS E LINHAS COM VALORES ---
-    linhas = texto_limpo.splitlines()
-    linhas_filtradas = []
-
-    padrao_data_linha = re.compile(r'^\d{2} (?:JAN|FEV|MAR|ABR|MAI|JUN|JUL|AGO|SET|OUT|NOV|DEZ) \d{4}$', re.IGNORECASE)
-    padrao_valor = re.compile(r'\d+[\.,]\d{2}')
+def preprocess_text(text):
+    """
+    Processa o texto completo do extrato extraído do PDF,
+    aplica filtros, extrai data, descrição, valor e tipo da transação.
+    Retorna uma lista de dicionários com as transações.
+    """
 
-    for linha in linhas:
-        if padrao_data_linha.match(linha) or padrao_valor.search(linha):
-            linhas_filtradas.append(linha)
-    texto_final_bruto = '\n'.join(linhas_filtradas)
+    # Etapas encadeadas: cada linha passa por todas antes da próxima ser lida, sem textos intermediários
+    linhas = _movimentacoes(ler_linhas(text))
+    linhas = dividir(linhas, _separar_data)
+    linhas = descartar(linhas, lambda linha: linha.lower().startswith(_LINHAS_IGNORADAS))
+    linhas = filtrar(linhas, lambda linha: _DATA_LINHA.match(linha) or _TEM_VALOR.search(linha))
 
     # --- PADRONIZAR TRANSACOES COM DATA (data no formato dd/mm/aaaa) ---
     meses = {
@@ -105,7 +73,6 @@ def preprocess_text(text):
     }
     padrao_data = re.compile(r'^(\d{2}) ([A-Z]{3}) (\d{4})$', re.IGNORECASE)
 
-    linhas = texto_final_bruto.splitlines()
     data_atual = None
     transacoes = []
 
@@ -128,11 +95,8 @@ def preprocess_text(text):
                 if m_valor:
                     valor_str = m_valor.group()
 
-                    # Ajustar valor: se terminar com ',00' remover os centavos e pontos de milhar
-                    if valor_str.endswith(",00"):
-                        valor_formatado = valor_str[:-3].replace('.', '')
-                    else:
-                        valor_formatado = valor_str
+                    # Valores inteiros saem sem os centavos e sem pontos de milhar (ex.: 1.000,00 -> 1000)
+                    valor_formatado = Dinheiro.ler(valor_str, "inteiro_sem_milhar")
                 else:
                     valor_formatado = None
 
@@ -1,5 +1,9 @@
 import re
-from auxiliares.utils import process_transactions 
+from auxiliares.utils import process_transactions
+from auxiliares.dinheiro import Dinheiro
+
+# Requisitos de extração do texto que este parser espera
+EXTRACAO = {"backend": "pdfplumber"}
 
 def preprocess_text(text):
     """
@@ -25,7 +29,7 @@ def preprocess_text(text):
         resto = line[len(data):].strip()
 
         # Padrão para capturar valores (débito ou crédito)
-        valor_match = re.search(r"(-\s*)?R\$\s*([\d.,]+)", resto)
+        valor_match = re.search(r"(-\s*)?R\$\s*((?:\d{1,3}(?:\.\d{3})+|\d+),\d{2})", resto)
         if not valor_match:
             continue
 
@@ -33,11 +37,8 @@ def preprocess_text(text):
         tipo = "D" if valor_match.group(1) else "C"
         valor_bruto = valor_match.group(2)
 
-        # Remove pontos de milhar e trata centavos
-        valor_sem_milhar = valor_bruto.replace(".", "")
-        
-        # Remove ',00' apenas se for valor redondo (ex: 100,00 → 100)
-        valor_formatado = valor_sem_milhar.replace(",00", "") if valor_sem_milhar.endswith(",00") else valor_sem_milhar
+        # Sem pontos de milhar e sem ',00' nos valores redondos (ex: 5.616,00 → 5616)
+        valor_formatado = Dinheiro.ler(valor_bruto, "sem_milhar")
 
         # Descrição (garante não vazia)
         descricao = resto[:valor_match.start()].strip() or "Transação sem descrição"
@@ -1,5 +1,9 @@
 import re
 from auxiliares.utils import process_transactions
+from auxiliares.dinheiro import Dinheiro
+
+# Requisitos de extração do texto que este parser espera
+EXTRACAO = {"backend": "fitz"}
 
 def preprocess_text(text):
   
@@ -47,24 +51,8 @@ def preprocess_text(text):
         data = f"{transacao[0]}/{ano}" if ano else transacao[0]
         valor = value_match.group(0)
         tipo = 'D' if '-' in valor else 'C'
-        # Remove o sinal de menos e formata o valor
-        valor_formatado = valor.replace('-', '')
-        if valor_formatado.endswith(',00'):
-            valor_formatado = valor_formatado[:-3]
-        else:
-            try:
-                num = float(valor_formatado.replace(',', '.'))
-                partes = f"{num:.2f}".split('.')
-                inteiro = partes[0]
-                decimal = partes[1]
-                inteiro_formatado = ""
-                for j, digito in enumerate(reversed(inteiro)):
-                    if j > 0 and j % 3 == 0:
-                        inteiro_formatado = '.' + inteiro_formatado
-                    inteiro_formatado = digito + inteiro_formatado
-                valor_formatado = f"{inteiro_formatado},{decimal}"
-            except ValueError:
-                pass  # Mantém valor_formatado como está
+        # Centavos com um dígito (ex.: 1,5) valem 1,50; valores não inteiros saem sempre com ponto de milhar
+        valor_formatado = abs(Dinheiro.ler(valor, "milhar_com_centavos", centavos_um_digito=True))
         # Descrição é tudo entre data e valor
         descricao = ' '.join(transacao[1:-1]) if len(transacao) > 2 else (transacao[1] if len(transacao) == 2 else '')
         # Filtra transações com descrição 'conta corrente'
@@ -1,5 +1,9 @@
 import re
-from auxiliares.utils import process_transactions 
+from auxiliares.utils import process_transactions
+from auxiliares.dinheiro import Dinheiro
+
+# Requisitos de extração do texto que este parser espera
+EXTRACAO = {"backend": "pdfplumber"}
 
 def preprocess_text(text):
     """
@@ -28,11 +32,7 @@ def preprocess_text(text):
             data, historico, documento, valor = match.groups()[:4]
             # Determinar o tipo de transação (D para negativo, C para positivo)
             tipo = "D" if valor.startswith("-") else "C"
-            # Remover o sinal de menos e formatar o valor
-            valor = valor.replace("-", "").strip()
-            # Ajustar valor: remover ",00" se for um número inteiro
-            if valor.endswith(",00"):
-                valor = valor[:-3]
+            valor = Dinheiro.ler(valor)
             # Combinar histórico e documento na coluna Descrição
             description = f"{historico} {documento}".strip()
             
@@ -1,6 +1,12 @@
 import re
 import fitz  # PyMuPDF
 from auxiliares.utils import process_transactions
+from auxiliares.linhas import pular_blocos
+from auxiliares.dinheiro import Dinheiro
+
+# Requisitos de extração do texto que este parser espera
+# Cabeçalhos e rodapés repetidos saem antes do parser; o cabeçalho da primeira página é mantido
+EXTRACAO = {"backend": "fitz", "moldura": {"manter_cabecalho_inicial": True}}
 
 def preprocess_text(text):
     """
@@ -22,20 +28,10 @@ def preprocess_text(text):
             return []
     
     # Primeiro filtro: Remover "EXTRATO CONSOLIDADO INTELIGENTE" e as 11 linhas seguintes
-    i = 0
-    while i < len(linhas):
-        if 'extrato consolidado inteligente' in linhas[i].lower():
-            del linhas[i:i+12]  # Remove a linha atual e as 11 seguintes
-        else:
-            i += 1
-    
     # Segundo filtro: Remover "Extrato_PJ_A4_Inteligente" e as 9 linhas seguintes
-    i = 0
-    while i < len(linhas):
-        if 'extrato_pj_a4_inteligente' in linhas[i].lower():
-            del linhas[i:i+10]  # Remove a linha atual e as 9 seguintes
-        else:
-            i += 1
+    # (normalmente já removidos junto com a moldura das páginas; continuam valendo para extratos de uma página)
+    linhas = pular_blocos(linhas, lambda linha: 'extrato consolidado inteligente' in linha.lower(), 12)
+    linhas = list(pular_blocos(linhas, lambda linha: 'extrato_pj_a4_inteligente' in linha.lower(), 10))
     
     # Terceiro filtro: Encontrar as posições das ocorrências de "saldo em"
     primeira_ocorrencia = -1
@@ -103,11 +99,7 @@ def preprocess_text(text):
                 descricao = ' '.join(transacao).strip()
                 # Determinar o tipo (C ou D) com base no sinal do valor
                 tipo = 'D' if valor.endswith('-') else 'C'
-                # Remover o sinal de menos do final, se presente
-                valor = valor.rstrip('-')
-                # Remover ",00" se for um número inteiro
-                if valor.endswith(",00"):
-                    valor = valor[:-3]
+                valor = Dinheiro.ler(valor)
                 
                 transactions.append({
                     "Data": data_atual,
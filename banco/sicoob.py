@@ -1,135 +1,103 @@
-import re
+from auxiliares.tokens import Tokenizador
+from auxiliares.linhas import MontadorRegistros
 from auxiliares.utils import process_transactions
 
+# Requisitos de extração do texto que este parser espera
+EXTRACAO = {"backend": "fitz"}
+
+TOKENIZADOR = Tokenizador(marcadores={
+    # Período do extrato, de onde vem o ano (ex.: PERÍODO: 01/04/2025 - 30/04/2025)
+    "periodo": r"PERÍODO:\s*\d{2}/\d{2}/(\d{4})\s*-\s*\d{2}/\d{2}/\d{4}",
+    "inicio": r"DATA  HISTÓRICO  VALOR",
+    "fim": r"RESUMO|SALDO EM C\.CORRENTE",
+    "doc": r"DOC\.:",
+    "saldo": r"SALDO DO DIA|SALDO ANTERIOR|SALDO BLOQ",
+})
+
 def preprocess_text(text):
     """
     Pré-processa o texto do Sicoob no formato estruturado do PyMuPDF.
     Extrai todas as informações necessárias e retorna os dados no formato final.
     """
-    lines = [line.strip() for line in text.splitlines() if line.strip()]
-    
-    # Extrair o ano do período (ex.: PERÍODO: 01/04/2025 - 30/04/2025)
+    # Extrair o ano do período e identificar início e fim das transações em uma única leitura,
+    # que termina no fim das transações quando o ano já é conhecido
+    tokens = []
     year = None
-    period_pattern = r"PERÍODO:\s*\d{2}/\d{2}/(\d{4})\s*-\s*\d{2}/\d{2}/\d{4}"
-    for line in lines:
-        match = re.search(period_pattern, line)
-        if match:
-            year = match.group(1)
-            break
-    
-    # Identificar início e fim das transações
-    start_index = 0
-    for i, line in enumerate(lines):
-        if "DATA  HISTÓRICO  VALOR" in line:
-            start_index = i + 1
-            break
-    
-    end_index = len(lines)
-    for i, line in enumerate(lines[start_index:], start=start_index):
-        if "RESUMO" in line or "SALDO EM C.CORRENTE" in line:
-            end_index = i
+    start_index = None
+    end_index = None
+    for token in TOKENIZADOR.tokens(text):
+        if year is None and "periodo" in token.marcadores:
+            year = token.marcadores["periodo"].group(1)
+        if start_index is None and "inicio" in token.marcadores:
+            start_index = len(tokens) + 1
+        elif start_index is not None and end_index is None and "fim" in token.marcadores:
+            end_index = len(tokens)
+        tokens.append(token)
+        if end_index is not None and year is not None:
             break
     
-    transaction_lines = lines[start_index:end_index]
-    
-    # Processar as transações
-    data = []
-    date_pattern = r"^(\d{2}/\d{2})\s*$"
-    value_pattern = r"(\d{1,3}(?:\.\d{3})*,\d{2})([CD])?"
-    type_pattern = r"^[CD]$"
-    doc_pattern = r"DOC\.:"
-    
-    current_transaction = []
-    in_transaction = False
-    
-    for line in transaction_lines:
-        if re.match(date_pattern, line):
-            # Processar transação anterior se existir
-            if in_transaction and current_transaction:
-                transaction_text = "\n".join(current_transaction)
-                processed = _process_single_transaction(transaction_text, year, date_pattern, 
-                                                      value_pattern, type_pattern, doc_pattern)
-                if processed:
-                    data.append(processed)
-            
-            # Começar nova transação
-            current_transaction = [line]
-            in_transaction = True
-        elif in_transaction:
-            current_transaction.append(line)
-            if "DOC.:" in line or "SALDO DO DIA" in line or "SALDO ANTERIOR" in line or "SALDO BLOQ" in line:
-                # Finalizar transação atual
-                transaction_text = "\n".join(current_transaction)
-                processed = _process_single_transaction(transaction_text, year, date_pattern,
-                                                       value_pattern, type_pattern, doc_pattern)
-                if processed:
-                    data.append(processed)
-                in_transaction = False
-                current_transaction = []
-    
-    # Processar última transação se existir
-    if in_transaction and current_transaction:
-        transaction_text = "\n".join(current_transaction)
-        processed = _process_single_transaction(transaction_text, year, date_pattern,
-                                              value_pattern, type_pattern, doc_pattern)
-        if processed:
-            data.append(processed)
-    
-    return data
+    # Sem o cabeçalho da tabela, as transações vão do começo até o primeiro marcador de fim
+    if start_index is None:
+        start_index = 0
+        end_index = next((i for i, token in enumerate(tokens) if "fim" in token.marcadores), None)
+    if end_index is None:
+        end_index = len(tokens)
+    
+    # Processar as transações: cada uma começa na linha só com a data e termina no DOC.: ou no saldo
+    montador = MontadorRegistros(lambda transacao: _process_single_transaction(transacao, year))
+    for token in tokens[start_index:end_index]:
+        if token.formato_data == "dd/mm" and token.so_data:
+            montador.iniciar(token)
+        elif montador:
+            montador.adicionar(token)
+            if "doc" in token.marcadores or "saldo" in token.marcadores:
+                montador.encerrar()
+    
+    return montador.terminar()
 
-def _process_single_transaction(transaction, year, date_pattern, value_pattern, type_pattern, doc_pattern):
-    """Função auxiliar para processar uma única transação"""
-    lines = transaction.split("\n")
-    
+def _process_single_transaction(tokens, year):
+    """Função auxiliar para processar uma única transação (lista de tokens começando pela data)"""
     # Ignorar transações de saldo
-    if any(s in transaction for s in ["SALDO DO DIA", "SALDO ANTERIOR", "SALDO BLOQ"]):
+    if any("saldo" in token.marcadores for token in tokens):
         return None
     
     # Extrair data
-    date_match = re.match(date_pattern, lines[0])
-    if not date_match:
-        return None
-    date = date_match.group(1)
+    dia, mes, _ = tokens[0].data
+    date = f"{dia}/{mes}"
     if year:
         date = f"{date}/{year}"
     
-    # Extrair valor e tipo
+    # Extrair valor e tipo (o tipo vem grudado no valor ou na linha seguinte)
     value = None
     transaction_type = None
     value_line_index = None
     type_line_index = None
     
-    for i, line in enumerate(lines[1:], start=1):
-        value_match = re.match(value_pattern, line.strip())
-        if value_match:
-            value = value_match.group(1)
+    for i, token in enumerate(tokens[1:], start=1):
+        if token.valor is not None and token.sinal is None:
+            value = token.valor
             value_line_index = i
-            transaction_type = value_match.group(2)
-            if not transaction_type and i + 1 < len(lines) and re.match(type_pattern, lines[i + 1].strip()):
-                transaction_type = lines[i + 1].strip()
+            transaction_type = token.cd
+            if not transaction_type and i + 1 < len(tokens) and tokens[i + 1].texto in ("C", "D"):
+                transaction_type = tokens[i + 1].texto
                 type_line_index = i + 1
             break
     
     if not value or not transaction_type:
         return None
     
-    if value.endswith(",00"):
-        value = value[:-3]
-    
     # Extrair descrição até o DOC.:
-    doc_match = re.search(doc_pattern, transaction)
-    if not doc_match:
+    if not any("doc" in token.marcadores for token in tokens):
         return None
     
     # Construir descrição, excluindo linhas de valor e tipo
     description_lines = []
-    for i, line in enumerate(lines[1:], start=1):
+    for i, token in enumerate(tokens[1:], start=1):
         if i == value_line_index or i == type_line_index:
             continue
-        if "DOC.:" in line:
-            description_lines.append(line)
+        description_lines.append(token.texto)
+        if "doc" in token.marcadores:
             break
-        description_lines.append(line)
     
     description = " ".join(description_lines).strip()
     
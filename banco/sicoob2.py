@@ -1,5 +1,13 @@
 import re
 from auxiliares.utils import process_transactions
+from auxiliares.linhas import MontadorRegistros
+from auxiliares.dinheiro import Dinheiro
+
+# Requisitos de extração do texto que este parser espera
+EXTRACAO = {"backend": "fitz"}
+
+SALDO_KEYWORDS = ["SALDO DO DIA", "SALDO ANTERIOR", "SALDO BLOQUEADO"]
+VALUE_PATTERN = r"R\$\s*(\d{1,3}(?:\.\d{3})*,\d{2})([CD])"
 
 def preprocess_text(text):
     """
@@ -46,69 +54,55 @@ def preprocess_text(text):
         raise ValueError("Não foi possível extrair o ano do texto.")
     
     # Identificar blocos de transações por data
-    raw_transactions = []
-    current_transaction = []
+    montador = MontadorRegistros(lambda transacao: _process_single_transaction(transacao, year))
     date_pattern = r"^\d{2}/\d{2}$"
-    saldo_keywords = ["SALDO DO DIA", "SALDO ANTERIOR", "SALDO BLOQUEADO"]
     
     for line in lines:
         if re.match(date_pattern, line):
-            if current_transaction:
-                raw_transactions.append({"raw": "\n".join(current_transaction)})
-            current_transaction = [line]
-        elif any(keyword in line for keyword in saldo_keywords):
-            if current_transaction:
-                if len(current_transaction) > 1:
-                    raw_transactions.append({"raw": "\n".join(current_transaction)})
-            current_transaction = [line]
-        elif current_transaction:
-            current_transaction.append(line)
+            montador.iniciar(line)
+        elif any(keyword in line for keyword in SALDO_KEYWORDS):
+            # Blocos de uma única linha são descartados
+            if len(montador) <= 1:
+                montador.descartar()
+            montador.iniciar(line)
+        elif montador:
+            montador.adicionar(line)
+    
+    return montador.terminar()
+
+def _process_single_transaction(lines, year):
+    """Função auxiliar para processar uma única transação (linhas começando pela data)"""
+    # Ignorar blocos que são apenas de saldo
+    if any(s in line for line in lines for s in SALDO_KEYWORDS):
+        return None
     
-    if current_transaction:
-        raw_transactions.append({"raw": "\n".join(current_transaction)})
+    # Extrair data
+    date = lines[0]
+    if year:
+        date = f"{date}/{year}"  # Formata como DD/MM/YYYY
     
-    # Processar as transações brutas para extrair os dados formatados
-    data = []
-    value_pattern = r"R\$\s*(\d{1,3}(?:\.\d{3})*,\d{2})([CD])"
+    # Processar o bloco de transação
+    description = []
+    value = None
+    transaction_type = None
     
-    for transaction_dict in raw_transactions:
-        transaction = transaction_dict["raw"]
-        lines = transaction.split("\n")
-        
-        # Ignorar blocos que são apenas de saldo
-        if any(s in transaction for s in ["SALDO DO DIA", "SALDO ANTERIOR", "SALDO BLOQUEADO"]):
-            continue
-        
-        # Extrair data
-        date = lines[0]
-        if year:
-            date = f"{date}/{year}"  # Formata como DD/MM/YYYY
-        
-        # Processar o bloco de transação
-        description = []
-        value = None
-        transaction_type = None
-        
-        for line in lines[1:]:
-            value_match = re.search(value_pattern, line)
-            if value_match:
-                value = value_match.group(1)
-                transaction_type = value_match.group(2)
-                if value.endswith(",00"):
-                    value = value[:-3]
-            elif line and not line.startswith("Data") and not line.startswith("Periodo:") and not line.startswith("Sicoob"):
-                description.append(line.strip())
-        
-        if value and transaction_type:
-            description_text = " ".join(description).strip()
-            data.append({
-                "Data": date,
-                "Descrição": description_text,
-                "Valor": value,
-                "Tipo": transaction_type
-            })
+    for line in lines[1:]:
+        value_match = re.search(VALUE_PATTERN, line)
+        if value_match:
+            value = Dinheiro.ler(value_match.group(1))
+            transaction_type = value_match.group(2)
+        elif line and not line.startswith("Data") and not line.startswith("Periodo:") and not line.startswith("Sicoob"):
+            description.append(line.strip())
     
-    return data
+    if value and transaction_type:
+        description_text = " ".join(description).strip()
+        return {
+            "Data": date,
+            "Descrição": description_text,
+            "Valor": value,
+            "Tipo": transaction_type
+        }
+    return None
 
 def extract_transactions(transactions):
     return transactions
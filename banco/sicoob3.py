@@ -2,11 +2,18 @@ import re
 import pandas as pd
 from io import BytesIO
 from auxiliares.utils import process_transactions
+from auxiliares.linhas import MontadorRegistros
+from auxiliares.dinheiro import Dinheiro
+from auxiliares.lote import LoteTransacoes
+
+# Requisitos de extração do texto que este parser espera
+EXTRACAO = {"backend": "fitz"}
 
 def preprocess_text(text):
     """
     Pré-processa o texto do extrato Sicoob no formato fornecido.
-    Extrai todas as informações necessárias e retorna os dados no formato final.
+    Extrai todas as informações necessárias e retorna os dados no formato final
+    (LoteTransacoes com o saldo anterior e os saldos do dia, para a conciliação).
     """
     lines = [line.strip() for line in text.splitlines() if line.strip()]
     
@@ -26,57 +33,52 @@ def preprocess_text(text):
     transaction_lines = lines[start_index:end_index]
     
     # Processar as transações
-    data = []
     date_pattern = r"^(\d{2}/\d{2}/\d{4})\s*$"
     value_pattern = r"(\d{1,3}(?:\.\d{3})*,\d{2})([CD])"
     doc_pattern = r"^\d+$|Pix"  # Documento pode ser número ou "Pix"
     
-    current_transaction = []
-    current_date = None
+    montador = MontadorRegistros(
+        lambda transacao: _process_single_transaction(transacao, date_pattern, value_pattern, doc_pattern)
+    )
     
-    for i, line in enumerate(transaction_lines):
+    saldos = []  # (transações já lidas, data, saldo, momento)
+    current_date = None
+    momento_saldo = None
+    
+    for line in transaction_lines:
+        # O valor do saldo vem na linha seguinte a "SALDO ANTERIOR" / "SALDO DO DIA" (D = devedor)
+        if momento_saldo:
+            saldo_match = re.match(value_pattern, line)
+            if saldo_match:
+                saldo = Dinheiro.ler(saldo_match.group(1))
+                saldos.append((len(montador.registros), current_date,
+                               -saldo if saldo_match.group(2) == "D" else saldo, momento_saldo))
+            momento_saldo = None
+        
         # Nova data indica início de uma nova transação ou grupo de transações
-        date_match = re.match(date_pattern, line)
-        if date_match:
-            # Processar transação anterior
-            if current_transaction:
-                transaction_text = "\n".join(current_transaction)
-                processed = _process_single_transaction(transaction_text, date_pattern, value_pattern, doc_pattern)
-                if processed:
-                    data.append(processed)
-                current_transaction = []
+        if re.match(date_pattern, line):
+            montador.iniciar(line)
+            current_date = line
+        elif montador:
+            montador.adicionar(line)
             
-            current_date = date_match.group(1)
-            current_transaction.append(line)
-        elif current_date:
-            current_transaction.append(line)
+            if "SALDO ANTERIOR" in line:
+                momento_saldo = "anterior"
             
-            # Verificar se é "SALDO DO DIA" para finalizar a transação atual
+            # "SALDO DO DIA" finaliza a transação atual
             if "SALDO DO DIA" in line:
-                if current_transaction:
-                    transaction_text = "\n".join(current_transaction)
-                    processed = _process_single_transaction(transaction_text, date_pattern, value_pattern, doc_pattern)
-                    if processed:
-                        data.append(processed)
-                current_transaction = []
-                current_date = None
-                continue  # Pular para a próxima linha (ignorando a linha de saldo)
-    
-    # Processar última transação, se houver
-    if current_transaction and current_date:
-        transaction_text = "\n".join(current_transaction)
-        processed = _process_single_transaction(transaction_text, date_pattern, value_pattern, doc_pattern)
-        if processed:
-            data.append(processed)
-    
-    return data
-
-def _process_single_transaction(transaction, date_pattern, value_pattern, doc_pattern):
-    """Função auxiliar para processar uma única transação"""
-    lines = transaction.split("\n")
+                montador.encerrar()
+                momento_saldo = "dia"
     
+    lote = LoteTransacoes.de_transacoes(montador.terminar())
+    for posicao, data, saldo, momento in saldos:
+        lote.registrar_saldo(data, saldo, momento, posicao)
+    return lote
+
+def _process_single_transaction(lines, date_pattern, value_pattern, doc_pattern):
+    """Função auxiliar para processar uma única transação (linhas começando pela data)"""
     # Ignorar transações que são apenas saldos
-    if any(s in transaction for s in ["SALDO ANTERIOR", "SALDO BLOQUEADO"]):
+    if any(s in line for line in lines for s in ["SALDO ANTERIOR", "SALDO BLOQUEADO"]):
         return None
     
     # Remover "SALDO DO DIA ===== >" e a linha seguinte, se presentes
@@ -108,7 +110,7 @@ def _process_single_transaction(transaction, date_pattern, value_pattern, doc_pa
     for i, line in enumerate(cleaned_lines[1:], start=1):
         value_match = re.match(value_pattern, line.strip())
         if value_match:
-            value = value_match.group(1)
+            value = Dinheiro.ler(value_match.group(1))
             transaction_type = value_match.group(2)
             value_line_index = i
             break
@@ -116,10 +118,6 @@ def _process_single_transaction(transaction, date_pattern, value_pattern, doc_pa
     if not value or not transaction_type:
         return None
     
-    # Remover ",00" do valor, se aplicável
-    if value.endswith(",00"):
-        value = value[:-3]
-    
     # Extrair documento e descrição
     description_lines = []
     doc_number = None
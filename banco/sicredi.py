@@ -1,5 +1,9 @@
 import re
 from auxiliares.utils import process_transactions
+from auxiliares.dinheiro import Dinheiro
+
+# Requisitos de extração do texto que este parser espera
+EXTRACAO = {"backend": "pdfplumber"}
 
 def preprocess_text(text):
     """
@@ -34,11 +38,7 @@ def preprocess_text(text):
         valor_bruto = valores[0]  # o primeiro é o valor da transação
         tipo = "D" if valor_bruto.startswith("-") else "C"
 
-        # Remove o sinal para armazenar o valor
-        valor_sem_sinal = valor_bruto.lstrip("-")
-        
-        # Remove ,00 se for inteiro (ex: 1.000,00 → 1.000)
-        valor_formatado = re.sub(r",00$", "", valor_sem_sinal)
+        valor_formatado = Dinheiro.ler(valor_bruto)
 
         # Remove o valor do texto para capturar a descrição
         descricao = re.split(value_pattern, resto, maxsplit=1)[0].strip()
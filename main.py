@@ -1,59 +1,118 @@
 import streamlit as st
 from auxiliares.pdf_reader import validate_pdf
 from banco import get_processor
-from auxiliares.xml_to_csv import xml_to_csv
-from auxiliares.menu import display_menu, display_results
+from auxiliares.menu import display_menu
+from auxiliares.extrator import extrair_pdf, banco_identificado
+from auxiliares.impressao_digital import registrar_layout, descartar_layout
+from auxiliares.variantes import tentar_variantes
+from auxiliares.conciliacao import resumir
+from auxiliares.razao import LivroRazao, PendentesPorGrupo, identificar_conta
+from auxiliares.utils import create_csv, ResultadoExtrato
+from auxiliares.zip_csvs import ZipCSVs
 import concurrent.futures
-import io
-import zipfile
+
+# Transações repetidas entre arquivos da mesma conta, no período comum a eles, saem do CSV (False: apenas avisa)
+REMOVER_DUPLICADAS = True
 
 def process_single_pdf(uploaded_file, bank, text):
     """
-    Processa um único PDF e retorna o nome do arquivo, CSV gerado e mensagem de erro (se houver).
+    Processa um único PDF e retorna o nome do arquivo, o lote de transações (o CSV é gerado só na hora
+    de entrar no ZIP), mensagem de erro (se houver), aviso de saldos que não conferem (se houver; o CSV é
+    gerado mesmo assim) e, para a conferência entre arquivos, a conta do extrato.
     """
     try:
         if not validate_pdf(uploaded_file) or uploaded_file.size == 0:
-            return uploaded_file.name, None, "❌ O arquivo PDF está vazio ou inválido."
+            return uploaded_file.name, None, "❌ O arquivo PDF está vazio ou inválido.", None, None
 
         with st.spinner(f"Processando {uploaded_file.name}..."):
             processor = get_processor(bank)
             result = processor(text)
             
-            xml_data, txt_data = result
-            
-            if xml_data is None or txt_data is None:
-                return uploaded_file.name, None, "Nenhuma transação encontrada no arquivo."
+            if not isinstance(result, ResultadoExtrato):  # (None, None): nenhuma transação
+                # O identificador pode ter escolhido a variante errada do banco: tenta as demais no mesmo texto
+                alternativa = tentar_variantes(bank, text)
+                if alternativa is None:
+                    descartar_layout(text)
+                    if getattr(text, "pela_impressao", False):
+                        # O layout conhecido indicou o parser errado: identifica de novo só pelas regras de texto
+                        uploaded_file.seek(0)
+                        text, bank = extrair_pdf(uploaded_file, usar_impressao=False)
+                        if not banco_identificado(bank):
+                            return uploaded_file.name, None, bank, None, None
+                        return process_single_pdf(uploaded_file, bank, text)
+                    return uploaded_file.name, None, "Nenhuma transação encontrada no arquivo.", None, None
+                bank, result = alternativa
+
+            registrar_layout(text, bank)
             
-            xml_data.seek(0)
-            csv_data = xml_to_csv(xml_data)
-            return uploaded_file.name, csv_data, None
+            divergencias = result.divergencias
+            avisos = []
+            if getattr(text, "pela_impressao", False):
+                avisos.append(f"⚠️ Banco ({bank}) reconhecido pelo layout de arquivos anteriores, sem assinatura "
+                              "no texto: confira as transações.")
+            if divergencias:
+                avisos.append(f"⚠️ {resumir(divergencias)}")
+            aviso = " ".join(avisos) or None
+            return uploaded_file.name, result.lote, None, aviso, identificar_conta(text, bank)
 
     except Exception as e:
-        return uploaded_file.name, None, f"❌ Erro no processamento: {str(e)}"
+        return uploaded_file.name, None, f"❌ Erro no processamento: {str(e)}", None, None
+
+def _origens(repetidas):
+    return ", ".join(f"{quantidade} de {nome}" for nome, quantidade in repetidas.items())
+
+def remove_duplicates_across_files(results):
+    """
+    Confere as transações dos arquivos processados com sucesso entre si (auxiliares.razao.LivroRazao),
+    troca o lote dos arquivos com transações removidas (mesma conta, período comum aos dois arquivos) e
+    acrescenta o aviso das removidas e das repetidas apenas sinalizadas.
+    """
+    processados = [posicao for posicao, result in enumerate(results) if result[1] is not None]
+    livro = LivroRazao(remover=REMOVER_DUPLICADAS)
+    conferidos = livro.conferir([(results[posicao][0], results[posicao][4], results[posicao][1]) for posicao in processados])
 
-def create_zip_from_csvs(results):
+    for posicao, (lote, removidas, sinalizadas) in zip(processados, conferidos):
+        if not removidas and not sinalizadas:
+            continue
+        file_name, _, error, aviso, conta = results[posicao]
+        avisos = [aviso] if aviso else []
+        if removidas:
+            origem = _origens(removidas)
+            if len(lote):
+                avisos.append(f"⚠️ Transações já presentes em outro arquivo da mesma conta removidas ({origem}).")
+            else:
+                lote, error = None, f"Todas as transações já estão em outro arquivo da mesma conta ({origem})."
+        if sinalizadas:
+            avisos.append(f"⚠️ Transações repetidas de outro arquivo, mantidas no CSV ({_origens(sinalizadas)}).")
+        results[posicao] = (file_name, lote, error, " ".join(avisos) or None, conta)
+
+def grupo_de_conferencia(bank, text):
     """
-    Cria um arquivo ZIP contendo todos os CSVs gerário.
+    Grupo de um arquivo para a conferência entre arquivos, calculado antes do processamento:
+    (família do banco, número da conta) quando o cabeçalho traz a conta, ou (família, None) quando não
+    traz. None para arquivos sem banco identificado (display_menu), que não esperam nenhum outro.
     """
-    zip_buffer = io.BytesIO()
-    with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
-        for file_name, csv_data, _ in results:
-            if csv_data:
-                # Gera o nome do arquivo CSV baseado no nome do PDF
-                csv_file_name = f"extrato_{file_name.rsplit('.', 1)[0]}.csv"
-                # Converte csv_data para bytes
-                if isinstance(csv_data, io.StringIO):
-                    data = csv_data.getvalue().encode('utf-8')  # Converte string para bytes
-                elif isinstance(csv_data, io.BytesIO):
-                    data = csv_data.getvalue()  # Obtém bytes diretamente
-                else:
-                    data = csv_data  # Assume que já é bytes ou string
-                    if isinstance(data, str):
-                        data = data.encode('utf-8')
-                # Adiciona o CSV ao ZIP
-                zip_file.writestr(csv_file_name, data)
-    zip_buffer.seek(0)
-    return zip_buffer
+    if bank is None:
+        return None
+    return identificar_conta(text, bank)
+
+def write_completed_files(results, posicoes, zip_csvs):
+    """
+    Confere entre si os arquivos de um grupo já concluído (PendentesPorGrupo: a mesma conta, ou os arquivos
+    sem número de conta de uma família de bancos) quanto a transações repetidas, gera e comprime os CSVs
+    no ZIP um a um e libera os lotes da memória.
+    Enquanto o grupo espera os demais arquivos, só os lotes compactos ficam guardados, não os CSVs.
+    """
+    grupo = [results[posicao] for posicao in posicoes]
+    if len(grupo) > 1:
+        try:
+            remove_duplicates_across_files(grupo)
+        except Exception as e:
+            st.error(f"❌ Erro na conferência de transações repetidas entre arquivos: {str(e)}")
+    for posicao, (file_name, lote, error, aviso, conta) in zip(posicoes, grupo):
+        if lote is not None:
+            zip_csvs.adicionar(file_name, create_csv(lote))
+        results[posicao] = (file_name, None, error, aviso, conta)
 
 def run_app():
     """
@@ -62,41 +121,51 @@ def run_app():
     banks, uploaded_files, texts = display_menu()
 
     if uploaded_files and banks and texts:
-        results = []
+        # Resultados na ordem de envio, para a conferência entre arquivos não depender da ordem de conclusão
+        results = [None] * len(uploaded_files)
+        grupos = [grupo_de_conferencia(bank, text) for bank, text in zip(banks, texts)]
+        zip_csvs = ZipCSVs()
         with st.spinner("Processando arquivos..."):
             with concurrent.futures.ThreadPoolExecutor() as executor:
                 # Cria tarefas para processar cada PDF em paralelo
                 future_to_file = {
-                    executor.submit(process_single_pdf, uploaded_file, bank, text): uploaded_file
-                    for uploaded_file, bank, text in zip(uploaded_files, banks, texts)
+                    executor.submit(process_single_pdf, uploaded_file, bank, text): (posicao, uploaded_file)
+                    for posicao, (uploaded_file, bank, text) in enumerate(zip(uploaded_files, banks, texts))
                 }
-                
+                # Cada arquivo vai para o ZIP quando os arquivos que podem repetir suas transações terminam
+                pendentes = PendentesPorGrupo(grupos)
+
                 for future in concurrent.futures.as_completed(future_to_file):
-                    uploaded_file = future_to_file[future]
+                    posicao, uploaded_file = future_to_file[future]
                     try:
-                        file_name, csv_data, error = future.result()
-                        results.append((file_name, csv_data, error))
+                        results[posicao] = future.result()
                     except Exception as e:
-                        results.append((uploaded_file.name, None, f"❌ Erro inesperado: {str(e)}"))
+                        results[posicao] = (uploaded_file.name, None, f"❌ Erro inesperado: {str(e)}", None, None)
+
+                    for posicoes in pendentes.concluir(posicao):
+                        write_completed_files(results, posicoes, zip_csvs)
+            results = [result for result in results if result is not None]
 
         # Exibe os resultados e erros
         has_success = False
-        for file_name, csv_data, error in results:
+        for file_name, _, error, aviso, _ in results:
             if error:
                 st.error(f"{file_name}: {error}")
             else:
                 #st.success(f"{file_name}: ✅ Dados extraídos com sucesso!")
                 has_success = True
+                if aviso:
+                    st.warning(f"{file_name}: {aviso}")
 
         # Se houver pelo menos um CSV gerado, oferece o download do ZIP
         if has_success:
-            zip_buffer = create_zip_from_csvs(results)
             st.download_button(
                 label="Baixar todos os CSVs (ZIP)",
-                data=zip_buffer,
+                data=zip_csvs.conteudo(),
                 file_name="extratos.zip",
                 mime="application/zip",
                 help="Download de todos os CSVs gerados em um arquivo ZIP"
             )
+        zip_csvs.fechar()
 
 run_app()
\ No newline at end of file
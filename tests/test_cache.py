@@ -0,0 +1,46 @@
+import os
+import time
+import pytest
+from auxiliares import cache
+
+@pytest.fixture
+def diretorio(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_DIR", tmp_path / "cache")
+    return tmp_path / "cache"
+
+def test_cache_desligado_sem_diretorio(monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_DIR", None)
+    cache.gravar_cache("chave", 1, {0: "texto"})
+    assert cache.ler_cache("chave") is None
+    assert cache.limpar_cache() == 0
+
+def test_grava_complementa_e_le(diretorio):
+    cache.gravar_cache("chave", 2, {0: "primeira"})
+    cache.gravar_cache("chave", 2, {1: "segunda"})
+    assert cache.ler_cache("chave") == (2, {0: "primeira", 1: "segunda"})
+    assert diretorio.stat().st_mode & 0o777 == 0o700
+
+def test_limite_remove_as_usadas_ha_mais_tempo(diretorio, monkeypatch):
+    cache.gravar_cache("lida", 1, {0: "a" * 100})
+    cache.gravar_cache("esquecida", 1, {0: "b" * 100})
+    uma_hora = time.time() - 3600
+    for chave in ("lida", "esquecida"):
+        os.utime(cache._caminho(chave), (uma_hora, uma_hora))
+    assert cache.ler_cache("lida")
+    monkeypatch.setattr(cache, "CACHE_LIMITE_BYTES", cache._caminho("lida").stat().st_size * 2)
+    cache.gravar_cache("nova", 1, {0: "c" * 100})
+    assert cache.ler_cache("lida") and cache.ler_cache("nova")
+    assert cache.ler_cache("esquecida") is None
+
+def test_entrada_expirada_e_descartada(diretorio):
+    cache.gravar_cache("chave", 1, {0: "texto"})
+    vencida = time.time() - (cache.CACHE_RETENCAO_DIAS + 1) * 86400
+    os.utime(cache._caminho("chave"), (vencida, vencida))
+    assert cache.ler_cache("chave") is None
+    assert not cache._caminho("chave").exists()
+
+def test_limpar_cache(diretorio):
+    cache.gravar_cache("um", 1, {0: "a"})
+    cache.gravar_cache("dois", 1, {0: "b"})
+    assert cache.limpar_cache() == 2
+    assert cache.ler_cache("um") is None
@@ -0,0 +1,41 @@
+from auxiliares.conciliacao import conciliar, resumir
+from banco import bradesco, sicoob3
+
+def _bradesco(saldo_final):
+    """Extrato do Bradesco em que cada lançamento traz o próprio saldo (quarto valor da transação)."""
+    return "\n".join(["SALDO ANTERIOR", "1.000,00",
+                      "01/04/2025", "PIX RECEBIDO", "123", "500,00", "1.500,00",
+                      "TARIFA", "124", "-10,00", "1.490,00",
+                      "02/04/2025", "PIX ENVIADO", "125", "-90,00", saldo_final])
+
+def _sicoob3(saldo_segundo_dia):
+    """Extrato do Sicoob que começa devedor: saldos com sufixo D são negativos."""
+    return "\n".join(["DATA DOCUMENTO HISTÓRICO VALOR",
+                      "01/04/2024", "SALDO ANTERIOR", "100,00D",
+                      "01/04/2024", "123", "PIX RECEBIDO", "300,00C", "SALDO DO DIA ===== >", "200,00C",
+                      "02/04/2024", "Pix", "TARIFA", "250,00D", "SALDO DO DIA ===== >", saldo_segundo_dia])
+
+def test_bradesco_saldo_de_cada_lancamento_confere():
+    lote = bradesco.preprocess_text(_bradesco("1.400,00"))
+    assert len(lote) == 3
+    assert list(lote.saldo_centavos) == [100000, 150000, 149000, 140000]
+    assert list(lote.saldo_posicoes) == [0, 1, 2, 3]
+    assert conciliar(lote) == []
+
+def test_bradesco_saldo_divergente():
+    divergencias = conciliar(bradesco.preprocess_text(_bradesco("1.300,00")))
+    assert [(d["Data"], d["Diferença"].centavos) for d in divergencias] == [("02/04/2025", -10000)]
+    assert resumir(divergencias) == "Saldos não conferem: 02/04/2025 (extrato 1.300, calculado 1.400)"
+
+def test_sicoob3_saldos_devedores_sao_negativos():
+    lote = sicoob3.preprocess_text(_sicoob3("50,00D"))
+    assert list(lote.saldo_centavos) == [-10000, 20000, -5000]
+    assert conciliar(lote) == []
+
+def test_sicoob3_saldo_devedor_divergente():
+    divergencias = conciliar(sicoob3.preprocess_text(_sicoob3("60,00D")))
+    assert len(divergencias) == 1
+    assert divergencias[0]["Data"] == "02/04/2024"
+    assert divergencias[0]["Informado"].centavos == -6000
+    assert divergencias[0]["Calculado"].centavos == -5000
+    assert "extrato -60, calculado -50" in resumir(divergencias)
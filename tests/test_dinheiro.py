@@ -0,0 +1,52 @@
+import pytest
+from auxiliares.dinheiro import Dinheiro
+from banco import safra
+
+@pytest.mark.parametrize("texto, estilo, saida", [
+    ("1.012,29", "padrao", "1.012,29"),
+    ("1.000,00", "padrao", "1.000"),
+    ("1000,00", "padrao", "1000"),
+    ("123,30", "padrao", "123,30"),
+    ("123,30", "sem_zero_final", "123,3"),
+    ("10,00", "sem_zero_final", "10"),
+    ("1.000,00", "inteiro_sem_milhar", "1000"),
+    ("1.232,77", "inteiro_sem_milhar", "1.232,77"),
+    ("5.616,10", "sem_milhar", "5616,10"),
+])
+def test_estilos_de_saida(texto, estilo, saida):
+    assert str(Dinheiro.ler(texto, estilo)) == saida
+
+@pytest.mark.parametrize("texto, centavos", [
+    ("-R$ 50,00", -5000),
+    ("R$ -1,90", -190),
+    ("1.000,00-", -100000),
+    ("+ R$ 1.234.567,89", 123456789),
+])
+def test_leitura_com_sinal(texto, centavos):
+    assert Dinheiro.ler(texto).centavos == centavos
+
+@pytest.mark.parametrize("texto", ["", "1,5", "1.23,45", "R$", "abc"])
+def test_valor_invalido(texto):
+    with pytest.raises(ValueError):
+        Dinheiro.ler(texto)
+
+def test_operacoes_usam_apenas_os_centavos():
+    assert Dinheiro.ler("1.000,00") == Dinheiro.ler("1000,00", "sem_milhar")
+    assert len({Dinheiro.ler("1,00"), Dinheiro.ler("1,00", "sem_zero_final")}) == 1
+    assert str(Dinheiro.ler("1.000,00") - Dinheiro.ler("0,01")) == "999,99"
+    assert (-Dinheiro.ler("2,00")).negativo
+
+def test_safra_centavos_com_um_digito():
+    # O parser original escrevia "1.250,5" quando o valor tinha ponto de milhar (e "250,50" sem ele);
+    # com Dinheiro os dois casos saem com dois dígitos de centavos
+    texto = "\n".join(["Período de 01/04/2025 a 30/04/2025", "Valor (R$)", "01/04", "PIX", "1.250,5", "02/04", "TED", "250,5"])
+    assert [str(transacao["Valor"]) for transacao in safra.preprocess_text(texto)] == ["1.250,50", "250,50"]
+
+def test_centavos_com_um_digito_so_quando_pedido():
+    assert Dinheiro.ler("1.250,5", centavos_um_digito=True).centavos == 125050
+    with pytest.raises(ValueError):
+        Dinheiro.ler("1.250,5")
+
+@pytest.mark.parametrize("texto, saida", [("1250,50", "1.250,50"), ("1250,00", "1250"), ("1.250,00", "1.250"), ("250,5", "250,50")])
+def test_milhar_com_centavos(texto, saida):
+    assert str(Dinheiro.ler(texto, "milhar_com_centavos", centavos_um_digito=True)) == saida
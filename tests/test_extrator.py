@@ -0,0 +1,51 @@
+from contextlib import nullcontext
+import pytest
+from auxiliares import cache, extrator
+from auxiliares.impressao_digital import IndiceLayouts
+
+IMPRESSAO = ("produtor", "", ("Arial",), (595, 842), ((30, 40),))
+
+@pytest.fixture
+def pdf(monkeypatch):
+    """Substitui os backends por páginas em memória e registra cada página extraída."""
+    extraidas = []
+
+    def instalar(paginas_fitz, paginas_pdfplumber):
+        def backend(nome, paginas):
+            def pagina(documento, indice, opcoes):
+                extraidas.append((nome, indice))
+                return paginas[indice]
+            return {**extrator.BACKENDS[nome], "versao": "teste", "abrir": lambda origem: nullcontext(object()),
+                    "total": lambda documento: len(paginas), "pagina": pagina}
+        monkeypatch.setattr(extrator, "BACKENDS", {"fitz": backend("fitz", paginas_fitz),
+                                                   "pdfplumber": backend("pdfplumber", paginas_pdfplumber)})
+        return extraidas
+
+    monkeypatch.setattr(cache, "CACHE_DIR", None)
+    monkeypatch.setattr(extrator, "verificar_documento", lambda documento: None)
+    monkeypatch.setattr(extrator, "impressao_digital", lambda documento: IMPRESSAO)
+    monkeypatch.setattr(extrator, "INDICE_LAYOUTS", IndiceLayouts())
+    return instalar
+
+def test_sem_assinatura_le_o_documento_uma_vez_pelo_pdfplumber(pdf):
+    extraidas = pdf(["sem assinatura"] * 8, ["sem assinatura"] * 8)
+    texto, banco = extrator.extrair_pdf(b"%PDF-1.4")
+    assert banco == "Banco não identificado"
+    assert extraidas == [("fitz", 0)] + [("pdfplumber", indice) for indice in range(8)]
+
+def test_regras_de_texto_prevalecem_sobre_a_impressao_digital(pdf):
+    pdf(["Extrato\nouvidoria@nubank.com.br"], ["Extrato\nouvidoria@nubank.com.br"])
+    extrator.INDICE_LAYOUTS.registrar(IMPRESSAO, "Cora")
+    texto, banco = extrator.extrair_pdf(b"%PDF-1.4")
+    assert banco == "Nubank" and not texto.pela_impressao
+    # A impressão que contradisse as regras de texto fica ambígua
+    assert extrator.INDICE_LAYOUTS.consultar(IMPRESSAO) is None
+
+def test_impressao_digital_so_decide_sem_assinatura(pdf):
+    pdf(["sem assinatura"] * 2, ["sem assinatura"] * 2)
+    extrator.INDICE_LAYOUTS.registrar(IMPRESSAO, "Cora")
+    texto, banco = extrator.extrair_pdf(b"%PDF-1.4")
+    assert banco == "Cora" and texto.pela_impressao
+
+    texto, banco = extrator.extrair_pdf(b"%PDF-1.4", usar_impressao=False)
+    assert banco == "Banco não identificado"
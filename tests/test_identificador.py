@@ -0,0 +1,24 @@
+from auxiliares.identificador import identificar_banco, identificar_bancos
+
+def test_santander2_com_e_sem_espacos():
+    # O título aparece com ou sem espaços conforme o backend que extraiu o texto
+    assert identificar_banco("EXTRATOCONSOLIDADOINTELIGENTE\nConta Corrente") == "Santander2"
+    assert identificar_banco("EXTRATO CONSOLIDADO INTELIGENTE\nConta Corrente") == "Santander2"
+
+def test_prioridade_entre_regras():
+    texto = "Extrato\nouvidoria@nubank.com.br\nMercado Pago"
+    assert [banco for _, banco in identificar_bancos(texto)] == ["Nubank", "Mercado Pago"]
+    assert identificar_banco(texto) == "Nubank"
+
+def test_regras_por_trecho_e_por_condicao():
+    texto = "Sicoob\n SICOOB CREDIMEPI\nSICOOB - Sistema de Cooperativas de Crédito do Brasil"
+    assert [banco for _, banco in identificar_bancos(texto)] == ["Sicoob3", "Sicoob1"]
+
+def test_condicoes_por_linha():
+    assert identificar_banco("Extrato\nPeríodo\nInstituição Stone Instituição de Pagamento") == "Stone"
+    assert identificar_banco("Extrato\nPeríodo\nBanco Inter S.A.") == "Banco Inter"
+    assert identificar_banco("Extrato mensal\n8119") == "Itaú3"
+
+def test_sem_assinatura():
+    assert identificar_banco("Extrato qualquer") == "Banco não identificado"
+    assert identificar_banco("") == "Erro: Texto vazio ou ilegível"
@@ -0,0 +1,41 @@
+from auxiliares.moldura import remover_moldura
+from auxiliares.texto import TextoPaginado
+from banco import stone
+
+PAGINAS = 6
+POR_PAGINA = 5
+
+def _extrato_stone_de_um_dia():
+    """Extrato da Stone de várias páginas com todas as transações no mesmo dia (data e tipo repetidos no topo)."""
+    paginas = []
+    saldo = 1000
+    for numero in range(1, PAGINAS + 1):
+        linhas = ["Extrato de conta corrente", "Instituição Stone Instituição de Pagamento S.A.", "EMPRESA EXEMPLO LTDA"]
+        if numero == 1:
+            linhas.insert(1, "Período: 01/04/2024 a 01/04/2024")
+        linhas += ["DATA", "TIPO", "DESCRIÇÃO", "VALOR", "SALDO", "CONTRAPARTE"]
+        for _ in range(POR_PAGINA):
+            saldo += 10
+            linhas += ["01/04/2024", "Crédito", "Pix recebido", "10,00", f"{saldo},00", "FULANO DE TAL"]
+        linhas += ["Ouvidoria: 0800 000 0000", f"Página {numero} de {PAGINAS}"]
+        paginas.append("\n".join(linhas))
+    return TextoPaginado(paginas)
+
+def test_linhas_so_com_data_ou_valor_nao_sao_moldura():
+    texto = _extrato_stone_de_um_dia()
+    sem_moldura = remover_moldura(texto, **stone.EXTRACAO["moldura"])
+
+    assert len(stone.preprocess_text(texto)) == PAGINAS * POR_PAGINA
+    assert stone.preprocess_text(sem_moldura) == stone.preprocess_text(texto)
+    linhas = sem_moldura.linhas_por_pagina()
+    assert linhas[1][0] == "01/04/2024"
+    assert not any("Ouvidoria" in linha or "Página" in linha for pagina in linhas for linha in pagina)
+
+def test_remove_so_ate_o_cabecalho_da_tabela():
+    paginas = ["Banco X\nDATA HISTÓRICO VALOR\nTarifa\n01/04/2024\n5,00\nRodapé"] * 3
+    sem_moldura = remover_moldura(TextoPaginado(paginas), cabecalho_tabela="HISTÓRICO")
+    assert sem_moldura.linhas_por_pagina() == [["Tarifa", "01/04/2024", "5,00"]] * 3
+
+def test_uma_pagina_fica_como_esta():
+    texto = TextoPaginado(["Cabeçalho\n01/04/2024\n5,00"])
+    assert remover_moldura(texto) is texto
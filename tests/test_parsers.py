@@ -0,0 +1,25 @@
+"""
+Saída dos parsers sobre extratos representativos (tests/dados/<banco>[-<caso>].txt) comparada com a saída
+registrada em <mesmo nome>.json, gerada pelos parsers originais, de antes da migração para os componentes
+compartilhados (layout, tokens, linhas, montador de registros e Dinheiro).
+"""
+import importlib
+import json
+from pathlib import Path
+import pytest
+from auxiliares.utils import extrair_dados
+
+DADOS = Path(__file__).parent / "dados"
+
+def transacoes(caso):
+    modulo = importlib.import_module(f"banco.{caso.split('-')[0]}")
+    texto = (DADOS / f"{caso}.txt").read_text(encoding="utf-8")
+    return [
+        [transacao["Data"], transacao["Descrição"], str(transacao["Valor"]), transacao["Tipo"]]
+        for transacao in extrair_dados(texto, modulo.preprocess_text, modulo.extract_transactions)
+    ]
+
+@pytest.mark.parametrize("caso", sorted(caminho.stem for caminho in DADOS.glob("*.txt")))
+def test_saida_igual_a_do_parser_original(caso):
+    esperado = json.loads((DADOS / f"{caso}.json").read_text(encoding="utf-8"))
+    assert transacoes(caso) == esperado
@@ -0,0 +1,64 @@
+from auxiliares.dinheiro import Dinheiro
+from auxiliares.lote import LoteTransacoes
+from auxiliares.razao import LivroRazao, PendentesPorGrupo, identificar_conta
+
+def _lote(*transacoes):
+    lote = LoteTransacoes()
+    for data, descricao, valor, tipo in transacoes:
+        lote.adicionar(data, descricao, Dinheiro.ler(valor), tipo)
+    return lote
+
+ABRIL = _lote(("01/04/2025", "PIX RECEBIDO", "100,00", "C"),
+              ("15/04/2025", "Tarifa", "5,00", "D"),
+              ("30/04/2025", "PIX ENVIADO", "20,00", "D"))
+ULTIMOS_DIAS = _lote(("15/04/2025", "TARIFA", "5,00", "D"),
+                     ("30/04/2025", "Pix enviado", "20,00", "D"))
+
+def test_remove_repetidas_da_mesma_conta_no_periodo_comum():
+    conta = ("Banco X", "123456")
+    mensal, parcial = LivroRazao().conferir([("abril.pdf", conta, ABRIL), ("parcial.pdf", conta, ULTIMOS_DIAS)])
+    assert mensal == (ABRIL, {}, {})
+    lote, removidas, sinalizadas = parcial
+    assert len(lote) == 0 and removidas == {"abril.pdf": 2} and sinalizadas == {}
+
+def test_conta_desconhecida_apenas_sinaliza():
+    conta = ("Banco X", None)
+    _, (lote, removidas, sinalizadas) = LivroRazao().conferir([("a.pdf", conta, ABRIL), ("b.pdf", conta, ULTIMOS_DIAS)])
+    assert lote is ULTIMOS_DIAS and removidas == {} and sinalizadas == {"a.pdf": 2}
+
+def test_contas_diferentes_nao_se_misturam():
+    conferidos = LivroRazao().conferir([("a.pdf", ("Banco X", "1"), ABRIL), ("b.pdf", ("Banco X", "2"), ULTIMOS_DIAS)])
+    assert [conferido[1:] for conferido in conferidos] == [({}, {}), ({}, {})]
+
+def test_datas_sem_ano_ficam_fora_do_periodo_comum():
+    sem_ano = _lote(("15/04", "Tarifa", "5,00", "D"), ("16/04", "PIX", "1,00", "C"))
+    conta = ("Banco X", "1")
+    _, (lote, removidas, sinalizadas) = LivroRazao().conferir([("a.pdf", conta, sem_ano), ("b.pdf", conta, _lote(("15/04", "Tarifa", "5,00", "D")))])
+    assert len(lote) == 1 and removidas == {} and sinalizadas == {"a.pdf": 1}
+
+def test_repetidas_no_mesmo_arquivo_sao_legitimas():
+    dois_pix = _lote(("01/04/2025", "PIX", "10,00", "C"), ("01/04/2025", "PIX", "10,00", "C"))
+    um_pix = _lote(("01/04/2025", "PIX", "10,00", "C"))
+    conta = ("Banco X", "1")
+    primeiro, segundo = LivroRazao().conferir([("a.pdf", conta, dois_pix), ("b.pdf", conta, um_pix)])
+    assert primeiro[1:] == ({}, {}) and segundo[1] == {"a.pdf": 1}
+
+def test_remover_false_apenas_sinaliza():
+    conta = ("Banco X", "1")
+    _, (lote, removidas, sinalizadas) = LivroRazao(remover=False).conferir([("a.pdf", conta, ABRIL), ("b.pdf", conta, ULTIMOS_DIAS)])
+    assert lote is ULTIMOS_DIAS and removidas == {} and sinalizadas == {"a.pdf": 2}
+
+def test_identificar_conta_no_cabecalho():
+    assert identificar_conta("Extrato\nConta Corrente Nº 0012345-x\n", "itau")[1] == "0012345X"
+    assert identificar_conta("Extrato sem número\n", "itau")[1] is None
+
+def test_pendentes_liberam_cada_conta_sem_esperar_as_outras():
+    grupos = [("Banco X", "1"), ("Banco X", "2"), ("Banco X", "1"), ("Banco X", None), None, ("Banco Y", None)]
+    pendentes = PendentesPorGrupo(grupos)
+    assert pendentes.concluir(2) == []
+    assert pendentes.concluir(4) == [[4]]
+    assert pendentes.concluir(0) == [[0, 2]]
+    assert pendentes.concluir(3) == []
+    assert pendentes.concluir(5) == [[5]]
+    # O arquivo sem número de conta espera toda a família
+    assert pendentes.concluir(1) == [[1], [3]]
@@ -0,0 +1,18 @@
+import copy
+import pickle
+import pytest
+from auxiliares.texto import TextoPaginado
+
+@pytest.mark.parametrize("copiar", [copy.copy, copy.deepcopy, lambda texto: pickle.loads(pickle.dumps(texto))])
+def test_copia_e_pickle(copiar):
+    texto = TextoPaginado(["Extrato\n01/04", "", "Saldo"])
+    texto.impressao = ("produtor",)
+    copia = copiar(texto)
+    assert copia.paginas == texto.paginas and copia.impressao == ("produtor",)
+    assert str(copia) == "Extrato\n01/04\nSaldo\n"
+
+def test_metodos_de_str_sao_repassados_e_privados_nao():
+    texto = TextoPaginado(["a\nb"])
+    assert texto.splitlines() == ["a", "b"]
+    with pytest.raises(AttributeError):
+        texto._inexistente
@@ -0,0 +1,46 @@
+from auxiliares.tokens import Tokenizador
+from banco import bradesco, sicoob
+
+TOKENIZADOR = Tokenizador()
+
+def test_formatos_de_valor():
+    token = TOKENIZADOR.token("-R$ 1.234,56")
+    assert (token.valor.centavos, token.sinal, token.so_valor) == (-123456, "-", True)
+    assert str(TOKENIZADOR.token("1234,56").valor) == "1234,56"
+    assert str(TOKENIZADOR.token("1.234.567,89").valor) == "1.234.567,89"
+    assert TOKENIZADOR.token("1.234,56C").cd == "C"
+    assert TOKENIZADOR.token("1.234,56 D").cd == "D"
+    assert TOKENIZADOR.token("1234.567,89").tipo == "texto"
+
+def test_formatos_de_data():
+    assert TOKENIZADOR.token("01/04/2025").data == ("01", "04", "2025")
+    assert TOKENIZADOR.token("05/dez TED").data == ("05", "12", None)
+    assert TOKENIZADOR.token("1 de Abril de 2024").data == ("01", "04", "2024")
+    assert TOKENIZADOR.token("01/04 PIX").formato_data == "dd/mm"
+
+def _linhas(lote):
+    return [[transacao["Data"], transacao["Descrição"], str(transacao["Valor"]), transacao["Tipo"]] for transacao in lote]
+
+def test_bradesco_le_valores_na_casa_dos_milhoes():
+    # O parser original tratava "1.234.567,89" como descrição e perdia esta transação e as seguintes
+    texto = "\n".join([
+        "SALDO ANTERIOR", "1.000,00", "01/04/2025",
+        "TED RECEBIDA", "1", "1.234.567,89", "1.235.567,89",
+        "TARIFA", "2", "-10,00", "1.235.557,89",
+    ])
+    assert _linhas(bradesco.preprocess_text(texto)) == [
+        ["01/04/2025", "TED RECEBIDA 1", "1.234.567,89", "C"],
+        ["01/04/2025", "TARIFA 2", "10", "D"],
+    ]
+
+def test_sicoob_le_valor_sem_ponto_de_milhar_e_tipo_separado():
+    # O parser original descartava estas duas transações
+    texto = "\n".join([
+        "PERÍODO: 01/04/2024 - 30/04/2024", "DATA  HISTÓRICO  VALOR",
+        "01/04", "PIX RECEBIDO", "1234,56C", "DOC.: 1",
+        "02/04", "TARIFA", "1.234,56 D", "DOC.: 2",
+    ])
+    assert _linhas(sicoob.preprocess_text(texto)) == [
+        ["01/04/2024", "PIX RECEBIDO DOC.: 1", "1234,56", "C"],
+        ["02/04/2024", "TARIFA DOC.: 2", "1.234,56", "D"],
+    ]
@@ -0,0 +1,29 @@
+from auxiliares import variantes
+from auxiliares.dinheiro import Dinheiro
+from auxiliares.lote import LoteTransacoes
+
+def _transacao(valor, tipo="C"):
+    return {"Data": "02/01/2024", "Descrição": "PIX", "Valor": Dinheiro.ler(valor), "Tipo": tipo}
+
+def test_divergencias_pesam_contra_o_resultado():
+    assert variantes.pontuar([_transacao("1,00")] * 3, [{}]) < variantes.pontuar([_transacao("1,00")] * 2)
+
+def test_vence_a_variante_que_fecha_os_saldos(monkeypatch):
+    # "Itaú2" lê uma transação a mais, mas o saldo do dia não confere; "Itaú3" fecha
+    def executar(banco, text):
+        lote = LoteTransacoes()
+        lote.registrar_saldo("01/01/2024", Dinheiro.ler("10,00"), "anterior")
+        for transacao in [_transacao("5,00"), _transacao("1,00", "D")] + ([_transacao("7,00")] if banco == "Itaú2" else []):
+            lote.adicionar(transacao["Data"], transacao["Descrição"], transacao["Valor"], transacao["Tipo"])
+        lote.registrar_saldo("02/01/2024", Dinheiro.ler("14,00"))
+        return list(lote), variantes.ResultadoExtrato(lote)
+
+    monkeypatch.setattr(variantes, "_executar_variante", executar)
+    banco, resultado = variantes.tentar_variantes("Itaú", "texto")
+    assert banco == "Itaú3"
+    assert len(resultado.lote) == 2 and not resultado.divergencias
+
+def test_sem_transacoes_em_nenhuma_variante(monkeypatch):
+    monkeypatch.setattr(variantes, "_executar_variante", lambda banco, text: (None, None))
+    assert variantes.tentar_variantes("Itaú", "texto") is None
+    assert variantes.tentar_variantes("Nubank", "texto") is None